@@ -1,5 +1,7 @@
 from django.utils.translation import pgettext_lazy
 
+default_app_config = "saleor.account.apps.AccountAppConfig"
+
 
 class CustomerEvents:
     """The different customer event types."""
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class AccountAppConfig(AppConfig):
+    name = "saleor.account"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
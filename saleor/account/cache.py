@@ -0,0 +1,177 @@
+from hashlib import sha256
+from typing import Callable, FrozenSet, Iterable, Optional, Type, TypeVar, Union
+
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils.functional import SimpleLazyObject, empty
+
+from ..core.cache import CacheVersion, get_cache_timeout
+from .models import ServiceAccount, User
+
+AUTH_CACHE_KEY = "auth_"
+AUTH_VERSION_CACHE_KEY = "auth_version_"
+# Principals expire quickly, so the changes made without sending signals, e.g.
+# by updates of querysets, are picked up soon anyway
+AUTH_CACHE_TIMEOUT = 60
+
+USER_PRINCIPAL = "user"
+SERVICE_ACCOUNT_PRINCIPAL = "service_account"
+
+Principal = TypeVar("Principal", User, ServiceAccount)
+
+# Attributes holding the permissions resolved by the principals
+PERMISSIONS_CACHE_NAMES = {User: "_perm_cache", ServiceAccount: "_service_perm_cache"}
+
+
+def _get_version(kind: str, pk: int) -> CacheVersion:
+    return CacheVersion(AUTH_VERSION_CACHE_KEY + f"{kind}_{pk}", AUTH_CACHE_TIMEOUT)
+
+
+def _get_lookup_key(kind: str, lookup: str) -> str:
+    # Credentials are hashed to keep them out of the cache and within the
+    # length and characters allowed for keys
+    return AUTH_CACHE_KEY + f"{kind}_" + sha256(lookup.encode()).hexdigest()
+
+
+def invalidate_users_auth(user_ids: Iterable[int]):
+    """Make all the processes fetch the users with their permissions again."""
+    for pk in user_ids:
+        _get_version(USER_PRINCIPAL, pk).invalidate()
+
+
+def invalidate_service_accounts_auth(service_account_ids: Iterable[int]):
+    """Make all the processes fetch the service accounts by their tokens again."""
+    for pk in service_account_ids:
+        _get_version(SERVICE_ACCOUNT_PRINCIPAL, pk).invalidate()
+
+
+class CachedPrincipal(SimpleLazyObject):
+    """Principal authenticated by the cache, fetched from the database lazily.
+
+    Only the ID, the active flag and the resolved permissions of the principal
+    are cached, which is enough to authenticate it and check its permissions.
+    Accessing any other attribute fetches the full instance, once.
+    """
+
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(
+        self, model: Type[Model], pk: int, is_active: bool, permissions: FrozenSet[str]
+    ):
+        super().__init__(self._fetch)
+        self.__dict__.update(
+            _model=model, _pk=pk, _is_active=is_active, _permissions=permissions
+        )
+        # Attributes set before the instance is fetched, e.g. the backend set
+        # by the authentication
+        self.__dict__["_pending"] = {}
+
+    def _fetch(self) -> Model:
+        principal = self._model.objects.get(pk=self._pk)
+        permissions_cache_name = PERMISSIONS_CACHE_NAMES[self._model]
+        setattr(principal, permissions_cache_name, set(self._permissions))
+        for name, value in self._pending.items():
+            del self.__dict__[name]
+            setattr(principal, name, value)
+        return principal
+
+    def __setattr__(self, name, value):
+        if name == "_wrapped" or self._wrapped is not empty:
+            super().__setattr__(name, value)
+        else:
+            self._pending[name] = value
+            self.__dict__[name] = value
+
+    @property  # type: ignore
+    def __class__(self):
+        return self._model
+
+    @property
+    def _meta(self):
+        return self._model._meta
+
+    @property
+    def pk(self) -> int:
+        return self._pk
+
+    id = pk
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return other._meta.concrete_model is self._model and other.pk == self._pk
+
+    def __hash__(self):
+        return hash(self._pk)
+
+    def get_all_permissions(self, obj=None) -> set:
+        if not self._is_active or obj is not None:
+            return set()
+        return set(self._permissions)
+
+    def _get_permissions(self) -> set:
+        return self.get_all_permissions()
+
+    def has_perm(self, perm: str, obj=None) -> bool:
+        return perm in self.get_all_permissions(obj)
+
+    def has_perms(self, perm_list: Iterable[str], obj=None) -> bool:
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+
+def _get_principal(
+    kind: str, lookup: str, fetch: Callable[[], Optional[Principal]]
+) -> Optional[Union[Principal, CachedPrincipal]]:
+    key = _get_lookup_key(kind, lookup)
+    cached = cache.get(key)
+    if cached is not None:
+        pk, is_active, permissions, version = cached
+        if cache.get(_get_version(kind, pk).key) == version:
+            model = User if kind == USER_PRINCIPAL else ServiceAccount
+            return CachedPrincipal(model, pk, is_active, permissions)
+    principal = fetch()
+    # Unknown credentials aren't cached, as there is no version to drop them by
+    if principal is not None:
+        version = _get_version(kind, principal.pk).get()
+        permissions_cache_name = PERMISSIONS_CACHE_NAMES[type(principal)]
+        permissions = frozenset(getattr(principal, permissions_cache_name, ()))
+        cache.set(
+            key,
+            (principal.pk, principal.is_active, permissions, version),
+            get_cache_timeout(AUTH_CACHE_TIMEOUT),
+        )
+    return principal
+
+
+def get_cached_user(
+    username: str, fetch_user: Callable[[], Optional[User]]
+) -> Optional[User]:
+    """Return the user authenticated by the username, fetching it on a miss.
+
+    Only the ID of the user, its active flag and the permissions resolved by
+    the fetch are kept in the Django cache, so authenticating the user and
+    checking its permissions doesn't query the database. On a hit the user is
+    a `CachedPrincipal`, which fetches the rest of the user when it's needed.
+    Saving or deleting the user, or changing its permissions or groups,
+    changes its version, which drops the cached data.
+    """
+    return _get_principal(USER_PRINCIPAL, username, fetch_user)
+
+
+def get_cached_service_account(
+    auth_token: str, fetch_service_account: Callable[[], Optional[ServiceAccount]]
+) -> Optional[ServiceAccount]:
+    """Return the service account authenticated by the token.
+
+    Works the same as `get_cached_user`. Saving or deleting any token of the
+    service account drops all of them, so revoked tokens stop working at once.
+    """
+    return _get_principal(SERVICE_ACCOUNT_PRINCIPAL, auth_token, fetch_service_account)
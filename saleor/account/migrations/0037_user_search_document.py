@@ -0,0 +1,44 @@
+# Generated by Django 2.2.8 on 2026-10-18 05:39
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+import saleor.account.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0036_auto_20191209_0407"),
+        # The trigram index requires the pg_trgm extension
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AlterField(
+            model_name="address",
+            name="phone",
+            field=saleor.account.models.PossiblePhoneNumberField(
+                blank=True, db_index=True, default="", max_length=128, region=None
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        # Index of the case insensitive lookup of emails, Django 2.2 can't declare
+        # indexes of expressions on models
+        migrations.RunSQL(
+            "CREATE INDEX user_email_upper ON account_user (UPPER(email::text));",
+            "DROP INDEX user_email_upper;",
+        ),
+    ]
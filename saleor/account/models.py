@@ -8,6 +8,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.db.models import Q, Value
 from django.forms.models import model_to_dict
@@ -61,7 +62,7 @@ class Address(models.Model):
     postal_code = models.CharField(max_length=20, blank=True)
     country = CountryField()
     country_area = models.CharField(max_length=128, blank=True)
-    phone = PossiblePhoneNumberField(blank=True, default="")
+    phone = PossiblePhoneNumberField(blank=True, default="", db_index=True)
 
     objects = AddressQueryset.as_manager()
 
@@ -131,6 +132,22 @@ class UserManager(BaseUserManager):
     def staff(self):
         return self.get_queryset().filter(is_staff=True)
 
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        """Insert each of the user instances into the database.
+
+        After the creation update the search documents of the users.
+        """
+        users = super().bulk_create(
+            objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+
+        from .search import update_users_search_document
+
+        update_users_search_document(
+            self.model.objects.filter(pk__in=[user.pk for user in users if user.pk])
+        )
+        return users
+
 
 class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     email = models.EmailField(unique=True)
@@ -150,6 +167,8 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
         Address, related_name="+", null=True, blank=True, on_delete=models.SET_NULL
     )
     avatar = VersatileImageField(upload_to="user-avatars", blank=True, null=True)
+    # Maintained by "account.search.update_users_search_document"
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     USERNAME_FIELD = "email"
 
@@ -163,6 +182,13 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
             ),
             ("manage_staff", pgettext_lazy("Permission description", "Manage staff.")),
         )
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                name="user_search_gin",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
 
     def get_full_name(self):
         if self.first_name or self.last_name:
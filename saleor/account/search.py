@@ -0,0 +1,45 @@
+from django.db import connection
+from django.db.models import QuerySet
+
+from .models import Address, User
+
+# Number of users which search documents are updated by a single query
+SEARCH_DOCUMENT_BATCH_SIZE = 1000
+
+
+def update_users_search_document(users: QuerySet):
+    """Update search documents of the users in a single query.
+
+    The document is the lowercase text of the user's name and email and the
+    names, city, country and phone of the default addresses, which dashboard
+    search matches with the trigram index.
+    """
+    users_query, params = users.order_by().values("pk").query.sql_with_params()
+    user_table = connection.ops.quote_name(User._meta.db_table)
+    address_table = connection.ops.quote_name(Address._meta.db_table)
+    query = f"""
+        UPDATE {user_table} AS target
+        SET search_document = lower(concat_ws(' ',
+            source.first_name,
+            source.last_name,
+            source.email,
+            shipping.first_name,
+            shipping.last_name,
+            shipping.city,
+            shipping.country,
+            shipping.phone,
+            billing.first_name,
+            billing.last_name,
+            billing.city,
+            billing.country,
+            billing.phone
+        ))
+        FROM {user_table} AS source
+        LEFT JOIN {address_table} AS shipping
+            ON shipping.id = source.default_shipping_address_id
+        LEFT JOIN {address_table} AS billing
+            ON billing.id = source.default_billing_address_id
+        WHERE target.id = source.id AND target.id IN ({users_query})
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
@@ -0,0 +1,111 @@
+from django.contrib.auth.models import Group
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from ..core.utils import are_fields_updated
+from .cache import invalidate_service_accounts_auth, invalidate_users_auth
+from .models import Address, ServiceAccount, ServiceAccountToken, User
+from .search import update_users_search_document
+
+USER_SEARCH_FIELDS = {
+    "email",
+    "first_name",
+    "last_name",
+    "default_shipping_address",
+    "default_billing_address",
+}
+
+
+def handle_user_saved(instance, update_fields=None, **_kwargs):
+    # Users are saved on every login, which doesn't change their document
+    if are_fields_updated(update_fields, USER_SEARCH_FIELDS):
+        update_users_search_document(User.objects.filter(pk=instance.pk))
+
+
+def handle_address_saved(instance, created, **_kwargs):
+    # A new address isn't the default one of any user yet
+    if not created:
+        update_users_search_document(
+            User.objects.filter(
+                Q(default_shipping_address=instance)
+                | Q(default_billing_address=instance)
+            )
+        )
+
+
+def _get_changed_ids(instance, action, reverse, pk_set, reverse_relation):
+    """Return ids of the objects whose relation was changed by the m2m signal.
+
+    The set of the changed objects isn't known when they are cleared from the
+    other side of the relation, so they are found before the clear.
+    """
+    if not reverse:
+        return [instance.pk]
+    if action == "pre_clear":
+        return getattr(instance, reverse_relation).values_list("pk", flat=True)
+    return pk_set or []
+
+
+def invalidate_user(instance, **_kwargs):
+    invalidate_users_auth([instance.pk])
+
+
+def handle_user_relation_changed(instance, action, reverse, pk_set, **_kwargs):
+    if action in ("post_add", "post_remove", "pre_clear"):
+        invalidate_users_auth(
+            _get_changed_ids(instance, action, reverse, pk_set, "user_set")
+        )
+
+
+def handle_group_permissions_changed(instance, action, reverse, pk_set, **_kwargs):
+    if action in ("post_add", "post_remove", "pre_clear"):
+        group_ids = _get_changed_ids(instance, action, reverse, pk_set, "group_set")
+        invalidate_users_auth(
+            User.objects.filter(groups__in=group_ids).values_list("pk", flat=True)
+        )
+
+
+def handle_group_deleted(instance, **_kwargs):
+    invalidate_users_auth(instance.user_set.values_list("pk", flat=True))
+
+
+def invalidate_service_account(instance, **_kwargs):
+    invalidate_service_accounts_auth([instance.pk])
+
+
+def handle_service_account_token_changed(instance, **_kwargs):
+    invalidate_service_accounts_auth([instance.service_account_id])
+
+
+def handle_service_account_permissions_changed(
+    instance, action, reverse, pk_set, **_kwargs
+):
+    if action in ("post_add", "post_remove", "pre_clear"):
+        invalidate_service_accounts_auth(
+            _get_changed_ids(instance, action, reverse, pk_set, "service_set")
+        )
+
+
+def connect_signals():
+    """Keep search documents of users up to date with their data.
+
+    Changes of users, service accounts with their tokens, and their
+    permissions or groups invalidate the cached principals authenticated by
+    the API.
+    """
+    post_save.connect(handle_user_saved, sender=User)
+    post_save.connect(handle_address_saved, sender=Address)
+    for signal in [post_save, post_delete]:
+        signal.connect(invalidate_user, sender=User)
+        signal.connect(invalidate_service_account, sender=ServiceAccount)
+        signal.connect(handle_service_account_token_changed, sender=ServiceAccountToken)
+    for relation in [User.user_permissions, User.groups]:
+        m2m_changed.connect(handle_user_relation_changed, sender=relation.through)
+    m2m_changed.connect(
+        handle_group_permissions_changed, sender=Group.permissions.through
+    )
+    pre_delete.connect(handle_group_deleted, sender=Group)
+    m2m_changed.connect(
+        handle_service_account_permissions_changed,
+        sender=ServiceAccount.permissions.through,
+    )
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from collections import namedtuple
+from typing import TYPE_CHECKING, Iterable
 
 from ..extensions.manager import get_extensions_manager
 
@@ -6,6 +7,13 @@ if TYPE_CHECKING:
     from prices import TaxedMoney
     from .models import Checkout, CheckoutLine
     from ..discount.types import DiscountsListType
+    from ..extensions.manager import ExtensionsManager
+
+# Prices of a checkout calculated at once, `line_totals` maps IDs of checkout
+# lines to their totals
+CheckoutPrices = namedtuple(
+    "CheckoutPrices", ["line_totals", "subtotal", "shipping_price", "total"]
+)
 
 
 def checkout_shipping_price(
@@ -49,3 +57,30 @@ def checkout_line_total(
     It takes in account all extensions.
     """
     return get_extensions_manager().calculate_checkout_line_total(line, discounts)
+
+
+def checkout_prices(
+    checkout: "Checkout",
+    lines: Iterable["CheckoutLine"],
+    discounts: "DiscountsListType" = None,
+    manager: "ExtensionsManager" = None,
+) -> CheckoutPrices:
+    """Return all the prices of the checkout calculated at once.
+
+    Unlike calling the functions above one by one, totals of the lines are
+    calculated only once and reused for the subtotal and the total.
+    """
+    if manager is None:
+        manager = get_extensions_manager()
+    line_totals = {
+        line.pk: manager.calculate_checkout_line_total(line, discounts)
+        for line in lines
+    }
+    subtotal = manager.calculate_checkout_subtotal(
+        checkout, discounts, line_totals=list(line_totals.values())
+    )
+    shipping_price = manager.calculate_checkout_shipping(checkout, discounts)
+    total = manager.calculate_checkout_total(
+        checkout, discounts, subtotal=subtotal, shipping_price=shipping_price
+    )
+    return CheckoutPrices(line_totals, subtotal, shipping_price, total)
@@ -600,13 +600,13 @@ def validate_gift_cards(checkout: Checkout):
 def create_line_for_order(checkout_line: "CheckoutLine", discounts) -> OrderLine:
     """Create a line for the given order.
 
-    :raises InsufficientStock: when there is not enough items in stock for this variant.
+    Stock of the variant isn't checked, it's checked when allocated for all the
+    lines at once.
     """
 
     quantity = checkout_line.quantity
     variant = checkout_line.variant
     product = variant.product
-    variant.check_quantity(quantity)
 
     product_name = str(product)
     variant_name = str(variant)
@@ -646,6 +646,8 @@ def prepare_order_data(*, checkout: Checkout, tracking_code: str, discounts) ->
 
     :raises NotApplicable InsufficientStock:
     """
+    from ..product.utils import allocate_stocks
+
     order_data = {}
 
     manager = get_extensions_manager()
@@ -687,10 +689,19 @@ def prepare_order_data(*, checkout: Checkout, tracking_code: str, discounts) ->
     ).gross
 
     manager.preprocess_order_creation(checkout, discounts)
+
+    # Reserve stock of the lines (last) so it's released by rolling back the
+    # transaction when any of the previous steps fails
+    allocate_stocks((line.variant, line.quantity) for line in order_data["lines"])
     return order_data
 
 
 def abort_order_data(order_data: dict):
+    from ..product.utils import deallocate_stocks
+
+    deallocate_stocks(
+        (line.variant, line.quantity) for line in order_data.get("lines", [])
+    )
     if "voucher" in order_data:
         voucher = order_data["voucher"]
         decrease_voucher_usage(voucher)
@@ -713,28 +724,30 @@ def create_order(
     Current user's language is saved in the order so we can later determine
     which language to use when sending email.
     """
-    from ..product.utils import allocate_stock
-    from ..order.utils import add_gift_card_to_order
+    from ..product.utils import deallocate_stocks
+    from ..order.utils import add_gift_cards_to_order
 
     order = Order.objects.filter(checkout_token=checkout.token).first()
     if order is not None:
+        # Stock reserved for the lines isn't needed, unless they were used by
+        # the existing order
+        deallocate_stocks(
+            (line.variant, line.quantity) for line in order_data.get("lines", [])
+        )
         return order
 
     total_price_left = order_data.pop("total_price_left")
     order_lines = order_data.pop("lines")
 
     order = Order.objects.create(**order_data, checkout_token=checkout.token)
-    order.lines.set(order_lines, bulk=False)
-
-    # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant.track_inventory:
-            allocate_stock(variant, line.quantity)
+    for line in order_lines:
+        line.order = order
+    OrderLine.objects.bulk_create(order_lines)
 
     # Add gift cards to the order
-    for gift_card in checkout.gift_cards.select_for_update():
-        total_price_left = add_gift_card_to_order(order, gift_card, total_price_left)
+    add_gift_cards_to_order(
+        order, checkout.gift_cards.select_for_update(), total_price_left
+    )
 
     # assign checkout payments to the order
     checkout.payments.update(order=order)
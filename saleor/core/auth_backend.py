@@ -0,0 +1,47 @@
+from typing import Optional
+
+from django.utils.translation import gettext as _
+from graphql_jwt import exceptions
+from graphql_jwt.backends import JSONWebTokenBackend as BaseJSONWebTokenBackend
+from graphql_jwt.settings import jwt_settings
+from graphql_jwt.utils import get_credentials, get_payload
+
+from ..account.cache import get_cached_user
+from ..account.models import User
+
+
+def fetch_user(username: str) -> Optional[User]:
+    try:
+        user = User.objects.get_by_natural_key(username)
+    except User.DoesNotExist:
+        return None
+    if user.is_active:
+        # Cache the permissions along with the user
+        user.get_all_permissions()
+    return user
+
+
+def get_user_by_payload(payload) -> Optional[User]:
+    username = jwt_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER(payload)
+    if not username:
+        raise exceptions.JSONWebTokenError(_("Invalid payload"))
+    user = get_cached_user(username, lambda: fetch_user(username))
+    if user is not None and not user.is_active:
+        raise exceptions.JSONWebTokenError(_("User is disabled"))
+    return user
+
+
+class JSONWebTokenBackend(BaseJSONWebTokenBackend):
+    """Authenticate users by JWT, getting them from the cache.
+
+    Tokens are verified on every request, only the users they were issued for
+    are cached.
+    """
+
+    def authenticate(self, request=None, skip_jwt_backend=False, **kwargs):
+        if request is None or skip_jwt_backend:
+            return None
+        token = get_credentials(request, **kwargs)
+        if token is None:
+            return None
+        return get_user_by_payload(get_payload(token, request))
@@ -0,0 +1,124 @@
+import pickle
+from typing import Callable, Generic, Optional, TypeVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+# Data of previous versions is left to expire
+VERSIONED_DATA_TIMEOUT = 60 * 60 * 24
+
+T = TypeVar("T")
+
+
+def get_cache_timeout(timeout: Optional[int]) -> Optional[int]:
+    """Return the timeout of cached data, shortened if the cache isn't shared.
+
+    Processes using their own memory as the cache never see the versions
+    changed by the others, so their data expires after `LOCAL_CACHE_TIMEOUT`
+    seconds instead.
+    """
+    if not isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return timeout
+    if timeout is None:
+        return settings.LOCAL_CACHE_TIMEOUT
+    return min(timeout, settings.LOCAL_CACHE_TIMEOUT)
+
+
+def copy_cached(data: T) -> T:
+    """Return a copy of cached data, which can be changed safely.
+
+    Data is copied the same way it's stored in the Django cache, as deep copies
+    of querysets drop their results, e.g. the ones set by `prefetch_related`.
+    """
+    return pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+
+class CacheVersion:
+    """Version of data cached by the processes, shared by the Django cache.
+
+    The data is kept along with the version it was built for and dropped once
+    the version is changed. Invalidation changes the version only when the
+    transaction making the change is committed, so nothing built from its
+    uncommitted state is ever cached under the new version, and a rolled back
+    transaction doesn't invalidate anything.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        timeout: Optional[int] = None,
+        on_change: Optional[Callable[[], None]] = None,
+    ):
+        self.key = key
+        self.timeout = timeout
+        # Called in the process which changed the version
+        self.on_change = on_change
+
+    def get(self) -> Optional[str]:
+        version = cache.get(self.key)
+        if version is None:
+            # A random version never matches data cached before the key was evicted
+            cache.add(self.key, uuid4().hex, get_cache_timeout(self.timeout))
+            version = cache.get(self.key)
+        return version
+
+    def change(self):
+        cache.set(self.key, uuid4().hex, get_cache_timeout(self.timeout))
+        if self.on_change:
+            self.on_change()
+
+    def invalidate(self):
+        """Change the version once the current transaction is committed."""
+        transaction.on_commit(self.change)
+
+
+class VersionedCache(Generic[T]):
+    """Data built from the database shared by the processes.
+
+    The data is kept in the process memory and in the Django cache under its
+    version, so it's built by the first process which asks for it and the
+    others only fetch it from the cache. Changing the version invalidates the
+    data of all the processes.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        version_key: str,
+        build: Callable[[], T],
+        timeout: int = VERSIONED_DATA_TIMEOUT,
+    ):
+        self.key = key
+        self.version = CacheVersion(version_key)
+        self.build = build
+        self.timeout = timeout
+        self._data: Optional[T] = None
+        self._version = None
+
+    def get_all(self) -> T:
+        version = self.version.get()
+        if self._data is None or self._version != version:
+            key = self.key + str(version)
+            data = cache.get(key)
+            if data is None:
+                data = self.build()
+                cache.set(key, data, get_cache_timeout(self.timeout))
+            self._data = data
+            self._version = version
+        return self._data
+
+    def refresh(self):
+        """Build the data of the current version ahead of the requests."""
+        key = self.key + str(self.version.get())
+        cache.set(key, self.build(), get_cache_timeout(self.timeout))
+
+    def invalidate(self):
+        self.version.invalidate()
+
+    def clear(self):
+        self._data = None
+        self._version = None
@@ -7,12 +7,11 @@ from django.contrib.sites.models import Site
 from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 from django.template.response import TemplateResponse
-from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language, ugettext_lazy as _
 from django_countries.fields import Country
 
-from ..discount.utils import fetch_discounts
+from ..discount.cache import fetch_cached_discounts
 from ..extensions.manager import get_extensions_manager
 from ..graphql.views import API_PATH, GraphQLView
 from . import analytics
@@ -48,7 +47,7 @@ def discounts(get_response):
     """Assign active discounts to `request.discounts`."""
 
     def _discounts_middleware(request):
-        request.discounts = SimpleLazyObject(lambda: fetch_discounts(timezone.now()))
+        request.discounts = SimpleLazyObject(fetch_cached_discounts)
         return get_response(request)
 
     return _discounts_middleware
@@ -82,20 +81,15 @@ def currency(get_response):
 
 
 def site(get_response):
-    """Clear the Sites cache and assign the current site to `request.site`.
+    """Assign the current site to `request.site`.
 
-    By default django.contrib.sites caches Site instances at the module
-    level. This leads to problems when updating Site instances, as it's
-    required to restart all application servers in order to invalidate
-    the cache. Using this middleware solves this problem.
+    The site with its settings is read from the cache of sites shared by the
+    processes, which is invalidated by changes of the site or its settings,
+    so the request doesn't query the database for it.
     """
 
-    def _get_site():
-        Site.objects.clear_cache()
-        return Site.objects.get_current()
-
     def _site_middleware(request):
-        request.site = SimpleLazyObject(_get_site)
+        request.site = SimpleLazyObject(Site.objects.get_current)
         return get_response(request)
 
     return _site_middleware
@@ -196,6 +190,7 @@ class ReadOnlyMiddleware:
             body = [body]
         for data in body:
             query, _, _ = GraphQLView.get_graphql_params(request, data)
+            query, _ = GraphQLView.get_persisted_query(query, data)
             document, _ = GraphQLView().parse_query(query)
             if not document:
                 return False
@@ -1,10 +1,12 @@
 import logging
 import socket
+from typing import Iterator, List, Optional
 from urllib.parse import urljoin
 
 from babel.numbers import get_territory_currencies
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.db.models import QuerySet
 from django.utils.encoding import iri_to_uri
 from django_countries import countries
 from django_countries.fields import Country
@@ -26,6 +28,34 @@ def build_absolute_uri(location):
     return iri_to_uri(location)
 
 
+def are_fields_updated(update_fields, fields) -> bool:
+    """Return whether a save with the given `update_fields` could change the fields.
+
+    Saves without `update_fields` update all the fields of the instance.
+    """
+    return update_fields is None or not set(fields).isdisjoint(update_fields)
+
+
+def get_ids_batches(
+    queryset: QuerySet, batch_size: int, start_after: Optional[int] = None
+) -> Iterator[List[int]]:
+    """Yield IDs of the objects in batches ordered by ID.
+
+    Batches are fetched by seeking past the last ID of the previous batch, so
+    processing can be resumed after any of them by passing its last ID as
+    `start_after`.
+    """
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    last_id = start_after
+    while True:
+        batch = ids if last_id is None else ids.filter(pk__gt=last_id)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
 def get_client_ip(request):
     """Retrieve the IP address from the request data.
 
@@ -1,23 +1,56 @@
 import csv
 import gzip
-from typing import Iterable
+import hashlib
+import io
+import json
+import shutil
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.sites.models import Site
 from django.contrib.syndication.views import add_domain
+from django.core.files.base import ContentFile, File
 from django.core.files.storage import default_storage
+from django.db.models import Case, CharField, F, Func, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django.utils.encoding import smart_text
 
 from ..core.taxes import zero_money
 from ..discount import DiscountInfo
 from ..discount.utils import fetch_discounts
-from ..product.models import Attribute, AttributeValue, Category, ProductVariant
+from ..product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    Attribute,
+    AttributeValue,
+    Category,
+    ProductVariant,
+)
 
 CATEGORY_SEPARATOR = " > "
 
 FILE_PATH = "google-feed.csv.gz"
 
+# Variants are written in parts covering this many consecutive IDs, so only
+# parts with changed variants have to be written again by incremental updates
+FEED_CHUNK_SIZE = 1000
+
+# Columns of variants and their products included in the feed, a change of any
+# of them changes the fingerprint of the part of the feed containing the variant
+FINGERPRINT_FIELDS = [
+    "pk",
+    "sku",
+    "name",
+    "price_override_amount",
+    "product_id",
+    "product__name",
+    "product__price_amount",
+    "product__category_id",
+    "product__updated_at",
+]
+
 ATTRIBUTES = [
     "id",
     "title",
@@ -50,6 +83,10 @@ def get_feed_items():
     items = items.select_related("product")
     items = items.prefetch_related(
         "images",
+        "attributes__assignment",
+        "attributes__values",
+        "product__attributes__assignment",
+        "product__attributes__values",
         "product__category",
         "product__images",
         "product__product_type__product_attributes",
@@ -92,6 +129,15 @@ def item_condition(item: ProductVariant):
     return "new"
 
 
+def _get_assigned_value_pk(assigned_attributes, attribute_pk) -> Optional[str]:
+    for assigned_attribute in assigned_attributes.all():
+        if assigned_attribute.assignment.attribute_id == attribute_pk:
+            values = list(assigned_attribute.values.all())
+            if values:
+                return smart_text(values[0].pk)
+    return None
+
+
 def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
     """Return an item brand.
 
@@ -99,25 +145,15 @@ def item_brand(item: ProductVariant, attributes_dict, attribute_values_dict):
     Read more:
     https://support.google.com/merchants/answer/6324351?hl=en&ref_topic=6324338
     """
-    brand = None
-    brand_attribute_pk = attributes_dict.get("brand")
-    publisher_attribute_pk = attributes_dict.get("publisher")
-
-    if brand_attribute_pk:
-        brand = item.attributes.get(str(brand_attribute_pk))
-        if brand is None:
-            brand = item.product.attributes.get(str(brand_attribute_pk))
-
-    if brand is None and publisher_attribute_pk is not None:
-        brand = item.attributes.get(str(publisher_attribute_pk))
-        if brand is None:
-            brand = item.product.attributes.get(str(publisher_attribute_pk))
-
-    if brand:
-        brand_name = attribute_values_dict.get(brand[0])
-        if brand_name is not None:
-            return brand_name
-    return brand
+    for attribute_slug in ["brand", "publisher"]:
+        attribute_pk = attributes_dict.get(attribute_slug)
+        if attribute_pk is None:
+            continue
+        for assigned_attributes in [item.attributes, item.product.attributes]:
+            value_pk = _get_assigned_value_pk(assigned_attributes, attribute_pk)
+            if value_pk is not None:
+                return attribute_values_dict.get(value_pk)
+    return None
 
 
 def item_tax(item: ProductVariant, discounts: Iterable[DiscountInfo]):
@@ -149,6 +185,25 @@ def item_availability(item: ProductVariant):
     return "out of stock"
 
 
+def get_category_paths() -> Dict[int, str]:
+    """Return paths of all the categories built from a single query."""
+    categories = {
+        pk: (name, parent_id)
+        for pk, name, parent_id in Category.objects.values_list(
+            "pk", "name", "parent_id"
+        )
+    }
+    category_paths = {}
+    for pk in categories:
+        names = []
+        category_id = pk
+        while category_id is not None:
+            name, category_id = categories[category_id]
+            names.append(name)
+        category_paths[pk] = CATEGORY_SEPARATOR.join(reversed(names))
+    return category_paths
+
+
 def item_google_product_category(item: ProductVariant, category_paths):
     """Return a canonical product category.
 
@@ -178,7 +233,6 @@ def item_sale_price(item: ProductVariant, discounts: Iterable[DiscountInfo]):
 
 def item_attributes(
     item: ProductVariant,
-    categories,
     category_paths,
     current_site,
     discounts: Iterable[DiscountInfo],
@@ -218,37 +272,254 @@ def item_attributes(
     return product_data
 
 
+class FeedContext:
+    """Data shared by all the items of the feed, fetched once per feed update."""
+
+    def __init__(self):
+        self.category_paths = get_category_paths()
+        self.current_site = Site.objects.get_current()
+        self.discounts = fetch_discounts(timezone.now())
+        self.attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
+        # Only values of attributes used as brands are included in the feed
+        self.brand_attribute_ids = [
+            self.attributes_dict[slug]
+            for slug in ["brand", "publisher"]
+            if slug in self.attributes_dict
+        ]
+        self.attribute_values_dict = {
+            smart_text(a.pk): smart_text(a)
+            for a in AttributeValue.objects.filter(
+                attribute_id__in=self.brand_attribute_ids
+            )
+        }
+
+    def get_fingerprint(self) -> str:
+        """Return a hash of the data which changes every item of the feed."""
+        discounts = sorted(
+            (
+                discount.sale.pk,
+                discount.sale.type,
+                str(discount.sale.value),
+                sorted(discount.category_ids),
+                sorted(discount.collection_ids),
+                sorted(discount.product_ids),
+            )
+            for discount in self.discounts
+        )
+        data = [
+            discounts,
+            sorted(self.category_paths.items()),
+            sorted(self.attribute_values_dict.items()),
+            self.current_site.domain,
+            settings.DEBUG,
+        ]
+        return hashlib.md5(json.dumps(data, default=str).encode()).hexdigest()
+
+    def get_item_data(self, item: ProductVariant):
+        return item_attributes(
+            item,
+            self.category_paths,
+            self.current_site,
+            self.discounts,
+            self.attributes_dict,
+            self.attribute_values_dict,
+        )
+
+
+def _assigned_values(model, item_field: str, outer_field: str, attribute_ids):
+    """Return IDs of the values of the attributes assigned to the outer item."""
+    values = (
+        model.objects.filter(
+            **{item_field: OuterRef(outer_field)},
+            assignment__attribute_id__in=attribute_ids,
+        )
+        .order_by()
+        .values(item_field)
+        .annotate(
+            ids=StringAgg(
+                Cast("values__pk", CharField()), delimiter=",", ordering="values__pk"
+            )
+        )
+        .values("ids")
+    )
+    return Subquery(values, output_field=CharField())
+
+
+def get_feed_chunks_fingerprints(
+    brand_attribute_ids: Iterable[int] = (),
+) -> Dict[int, str]:
+    """Return fingerprints of parts of the feed computed by the database.
+
+    Parts are numbered by `FEED_CHUNK_SIZE` ranges of variant IDs. Fingerprints
+    cover values of the brand attributes assigned to the variants and their
+    products, but not images and stock changes other than the availability.
+    """
+    in_stock = Case(
+        When(quantity__gt=F("quantity_allocated"), then=Value("1")),
+        default=Value("0"),
+        output_field=CharField(),
+    )
+    brand_attribute_ids = list(brand_attribute_ids)
+    brand_values = []
+    if brand_attribute_ids:
+        brand_values = [
+            _assigned_values(
+                AssignedVariantAttribute, "variant", "pk", brand_attribute_ids
+            ),
+            _assigned_values(
+                AssignedProductAttribute, "product", "product_id", brand_attribute_ids
+            ),
+        ]
+    row = Func(
+        *[Cast(field, CharField()) for field in FINGERPRINT_FIELDS],
+        in_stock,
+        *brand_values,
+        function="CONCAT_WS",
+        template="%(function)s('|', %(expressions)s)",
+        output_field=CharField(),
+    )
+    fingerprints = (
+        ProductVariant.objects.order_by()
+        .annotate(chunk=F("pk") / FEED_CHUNK_SIZE)
+        .values("chunk")
+        .annotate(
+            fingerprint=Func(
+                StringAgg(row, delimiter="\n", ordering="pk"),
+                function="MD5",
+                output_field=CharField(),
+            )
+        )
+        .values_list("chunk", "fingerprint")
+    )
+    return dict(fingerprints)
+
+
+def get_feed_chunk_items(chunk: int):
+    first_pk = chunk * FEED_CHUNK_SIZE
+    return (
+        get_feed_items()
+        .filter(pk__gte=first_pk, pk__lt=first_pk + FEED_CHUNK_SIZE)
+        .order_by("pk")
+    )
+
+
+def iterate_feed_items() -> Iterator[ProductVariant]:
+    """Yield all feed items fetching them in chunks of keyset-ordered variants.
+
+    Only a single chunk of variants along with its prefetched relations is kept
+    in memory at a time.
+    """
+    items = get_feed_items().order_by("pk")
+    last_pk = None
+    while True:
+        chunk = items if last_pk is None else items.filter(pk__gt=last_pk)
+        chunk = list(chunk[:FEED_CHUNK_SIZE])
+        if not chunk:
+            return
+        yield from chunk
+        last_pk = chunk[-1].pk
+
+
+def get_feed_writer(file_obj):
+    return csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
+
+
 def write_feed(file_obj):
     """Write feed contents info provided file object."""
-    writer = csv.DictWriter(file_obj, ATTRIBUTES, dialect=csv.excel_tab)
+    writer = get_feed_writer(file_obj)
     writer.writeheader()
-    categories = Category.objects.all()
-    discounts = fetch_discounts(timezone.now())
-    attributes_dict = {a.slug: a.pk for a in Attribute.objects.all()}
-    attribute_values_dict = {
-        smart_text(a.pk): smart_text(a) for a in AttributeValue.objects.all()
-    }
-    category_paths = {}
-    current_site = Site.objects.get_current()
-    for item in get_feed_items():
-        item_data = item_attributes(
-            item,
-            categories,
-            category_paths,
-            current_site,
-            discounts,
-            attributes_dict,
-            attribute_values_dict,
-        )
-        writer.writerow(item_data)
+    context = FeedContext()
+    for item in iterate_feed_items():
+        writer.writerow(context.get_item_data(item))
+
 
+def get_chunk_path(file_path: str, chunk: int) -> str:
+    return "%s.parts/%d.csv.gz" % (file_path, chunk)
 
-def update_feed(file_path=FILE_PATH):
+
+def get_manifest_path(file_path: str) -> str:
+    return "%s.parts/manifest.json" % (file_path,)
+
+
+def _load_manifest(file_path: str) -> Optional[dict]:
+    manifest_path = get_manifest_path(file_path)
+    if not default_storage.exists(manifest_path):
+        return None
+    with default_storage.open(manifest_path, "rb") as manifest_file:
+        return json.loads(manifest_file.read().decode())
+
+
+def _save_file(path: str, content):
+    # Storages pick another name when a file exists instead of overwriting it
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, content)
+
+
+def _save_manifest(file_path: str, manifest: dict):
+    manifest_content = ContentFile(json.dumps(manifest).encode())
+    _save_file(get_manifest_path(file_path), manifest_content)
+
+
+def _write_chunk(file_path: str, chunk: int, context: FeedContext):
+    # A single part is small enough to be compressed in memory
+    buffer = io.BytesIO()
+    with gzip.open(buffer, "wt") as output:
+        writer = get_feed_writer(output)
+        for item in get_feed_chunk_items(chunk):
+            writer.writerow(context.get_item_data(item))
+    _save_file(get_chunk_path(file_path, chunk), File(buffer))
+
+
+def _write_header(output_file):
+    header = io.StringIO()
+    get_feed_writer(header).writeheader()
+    output_file.write(gzip.compress(header.getvalue().encode()))
+
+
+def update_feed(file_path=FILE_PATH, incremental=False) -> List[int]:
     """Save updated feed into path provided as argument.
 
-    Default path is defined in module as FILE_PATH.
+    Default path is defined in module as FILE_PATH. Each range of variant IDs
+    is stored as a separate gzip file next to the feed, and the feed is made by
+    concatenating them, which results in a valid multi-member gzip file. With
+    `incremental`, only parts whose fingerprint changed since the last update
+    are generated again, unless data shared by all the items changed.
+    Return numbers of the generated parts.
     """
+    context = FeedContext()
+    context_fingerprint = context.get_fingerprint()
+    fingerprints = get_feed_chunks_fingerprints(context.brand_attribute_ids)
+    manifest = _load_manifest(file_path) or {"context": None, "chunks": {}}
+    previous_fingerprints = {
+        int(chunk): fingerprint for chunk, fingerprint in manifest["chunks"].items()
+    }
+    # Parts are reused only if they were made with the same shared data
+    reused_fingerprints = {}
+    if incremental and manifest["context"] == context_fingerprint:
+        reused_fingerprints = previous_fingerprints
+
+    updated_chunks = []
+    for chunk, fingerprint in sorted(fingerprints.items()):
+        chunk_path = get_chunk_path(file_path, chunk)
+        is_reused = reused_fingerprints.get(chunk) == fingerprint
+        if not is_reused or not default_storage.exists(chunk_path):
+            _write_chunk(file_path, chunk, context)
+            updated_chunks.append(chunk)
+    for chunk in set(previous_fingerprints) - set(fingerprints):
+        default_storage.delete(get_chunk_path(file_path, chunk))
+
     with default_storage.open(file_path, "wb") as output_file:
-        output = gzip.open(output_file, "wt")
-        write_feed(output)
-        output.close()
+        _write_header(output_file)
+        for chunk in sorted(fingerprints):
+            with default_storage.open(get_chunk_path(file_path, chunk)) as chunk_file:
+                shutil.copyfileobj(chunk_file, output_file)
+
+    _save_manifest(
+        file_path,
+        {
+            "context": context_fingerprint,
+            "chunks": {str(chunk): fp for chunk, fp in fingerprints.items()},
+        },
+    )
+    return updated_chunks
@@ -6,5 +6,12 @@ from ...google_merchant import update_feed
 class Command(BaseCommand):
     help = "Update Google merchant feed"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Regenerate only parts of the feed with changed variants.",
+        )
+
     def handle(self, *args, **options):
-        update_feed()
+        update_feed(incremental=options["incremental"])
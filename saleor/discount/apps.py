@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,118 @@
+import datetime
+from collections import namedtuple
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from ..core.cache import CacheVersion, get_cache_timeout
+from . import DiscountInfo
+from .models import Sale
+from .utils import fetch_discounts
+
+DISCOUNTS_CACHE_KEY = "discounts_snapshot_"
+DISCOUNTS_VERSION_CACHE_KEY = "discounts_version"
+
+DiscountsSnapshot = namedtuple(
+    "DiscountsSnapshot", ["discounts", "version", "created_at", "expires_at"]
+)
+DiscountsCacheInfo = namedtuple(
+    "DiscountsCacheInfo", ["hits", "misses", "version", "age"]
+)
+
+
+def fetch_discounts_snapshot(version: Optional[str]) -> DiscountsSnapshot:
+    """Fetch active discounts along with the time they stop being up to date.
+
+    The snapshot expires when the next sale starts or an active one ends, so
+    scheduled sales roll over on time, but not later than after
+    `DISCOUNTS_CACHE_TIMEOUT` seconds.
+    """
+    now = timezone.now()
+    discounts = fetch_discounts(now)
+    expires_at = now + datetime.timedelta(seconds=settings.DISCOUNTS_CACHE_TIMEOUT)
+    next_start_date = Sale.objects.filter(start_date__gt=now).aggregate(
+        Min("start_date")
+    )["start_date__min"]
+    end_dates = [
+        # Sales are still active at their end date
+        discount.sale.end_date + datetime.timedelta(microseconds=1)
+        for discount in discounts
+        if discount.sale.end_date
+    ]
+    expires_at = min([expires_at, *end_dates, next_start_date or expires_at])
+    return DiscountsSnapshot(discounts, version, now, expires_at)
+
+
+class DiscountsCache:
+    """Snapshot of active discounts shared by requests.
+
+    Snapshots are kept in the process memory and in the Django cache, so
+    processes serving the same shop rarely fetch discounts from the database.
+    Any change of sales, categories or collections changes the shared version,
+    which invalidates snapshots of all the processes.
+    """
+
+    def __init__(self):
+        self.version = CacheVersion(DISCOUNTS_VERSION_CACHE_KEY)
+        self._snapshot = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _is_valid(snapshot, version, now):
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and snapshot.created_at <= now < snapshot.expires_at
+        )
+
+    def get(self) -> List[DiscountInfo]:
+        if settings.DISCOUNTS_CACHE_TIMEOUT <= 0:
+            return fetch_discounts(timezone.now())
+
+        version = self.version.get()
+        now = timezone.now()
+        snapshot = self._snapshot
+        if self._is_valid(snapshot, version, now):
+            self.hits += 1
+            return snapshot.discounts
+
+        key = DISCOUNTS_CACHE_KEY + str(version)
+        snapshot = cache.get(key)
+        if self._is_valid(snapshot, version, now):
+            self.hits += 1
+        else:
+            self.misses += 1
+            snapshot = fetch_discounts_snapshot(version)
+            timeout = (snapshot.expires_at - snapshot.created_at).total_seconds()
+            cache.set(key, snapshot, get_cache_timeout(timeout))
+        self._snapshot = snapshot
+        return snapshot.discounts
+
+    def invalidate(self):
+        self.version.invalidate()
+
+    def clear(self):
+        self._snapshot = None
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> DiscountsCacheInfo:
+        """Return cache statistics along with the age of the snapshot in seconds."""
+        snapshot = self._snapshot
+        age = None
+        if snapshot is not None:
+            age = (timezone.now() - snapshot.created_at).total_seconds()
+        return DiscountsCacheInfo(
+            self.hits, self.misses, snapshot.version if snapshot else None, age
+        )
+
+
+discounts_cache = DiscountsCache()
+
+
+def fetch_cached_discounts() -> List[DiscountInfo]:
+    return discounts_cache.get()
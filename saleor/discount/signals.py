@@ -0,0 +1,17 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from ..product.models import Category, Collection
+from .cache import discounts_cache
+from .models import Sale
+
+
+def invalidate_discounts(**_kwargs):
+    discounts_cache.invalidate()
+
+
+def connect_signals():
+    for model in [Sale, Category, Collection]:
+        post_save.connect(invalidate_discounts, sender=model)
+        post_delete.connect(invalidate_discounts, sender=model)
+    for relation in [Sale.categories, Sale.collections, Sale.products]:
+        m2m_changed.connect(invalidate_discounts, sender=relation.through)
@@ -72,7 +72,7 @@ def get_product_discount_on_sale(
 
 def get_product_discounts(product: "Product", discounts: "DiscountsListType") -> Money:
     """Return discount values for all discounts applicable to a product."""
-    product_collections = set(product.collections.all().values_list("pk", flat=True))
+    product_collections = {collection.pk for collection in product.collections.all()}
     for discount in discounts:
         try:
             yield get_product_discount_on_sale(product, product_collections, discount)
@@ -126,7 +126,7 @@ def get_products_voucher_discount(voucher: "Voucher", prices: Iterable[Money]) -
 
 
 def _fetch_categories(sale_pks: Iterable[str]) -> Dict[str, Set[str]]:
-    from ..product.models import Category
+    from ..product.cache import categories_tree_cache
 
     categories = Sale.categories.through.objects.filter(
         sale_id__in=sale_pks
@@ -136,10 +136,8 @@ def _fetch_categories(sale_pks: Iterable[str]) -> Dict[str, Set[str]]:
         category_map[sale_pk].add(category_pk)
     subcategory_map = defaultdict(set)
     for sale_pk, category_pks in category_map.items():
-        subcategory_map[sale_pk] = set(
-            Category.tree.filter(pk__in=category_pks)
-            .get_descendants(include_self=True)
-            .values_list("pk", flat=True)
+        subcategory_map[sale_pk] = categories_tree_cache.get_descendant_ids(
+            category_pks
         )
     return subcategory_map
 
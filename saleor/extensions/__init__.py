@@ -5,6 +5,8 @@ from django.utils.translation import pgettext_lazy
 
 from .checks import check_extensions  # NOQA: F401
 
+default_app_config = "saleor.extensions.apps.ExtensionsAppConfig"
+
 
 def discover_plugins_modules(plugins: List[str]):
     plugins_modules = []
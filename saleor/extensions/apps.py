@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ExtensionsAppConfig(AppConfig):
+    name = "saleor.extensions"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
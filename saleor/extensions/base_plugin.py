@@ -7,6 +7,7 @@ from django_countries.fields import Country
 from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from . import ConfigurationTypeField
+from .cache import plugin_configurations_cache
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -40,8 +41,9 @@ class BasePlugin:
 
     def _initialize_plugin_configuration(self):
         """Initialize plugin by fetching configuration from internal cache or DB."""
-        plugin_config_qs = PluginConfiguration.objects.filter(name=self.PLUGIN_NAME)
-        plugin_config = self._cached_config or plugin_config_qs.first()
+        plugin_config = self._cached_config or plugin_configurations_cache.get(
+            self.PLUGIN_NAME
+        )
 
         if plugin_config:
             self._cached_config = plugin_config
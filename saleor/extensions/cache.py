@@ -0,0 +1,49 @@
+import threading
+from copy import deepcopy
+from typing import Dict, Optional
+
+from ..core.cache import CacheVersion
+from .models import PluginConfiguration
+
+PLUGIN_CONFIGURATIONS_VERSION_CACHE_KEY = "plugin_configurations_version"
+
+
+class PluginConfigurationsCache:
+    """Configurations of all the plugins kept in the process memory.
+
+    All the configurations are fetched with a single query and reused until the
+    shared version is changed by saving or deleting any of them.
+    """
+
+    def __init__(self):
+        self.version = CacheVersion(PLUGIN_CONFIGURATIONS_VERSION_CACHE_KEY)
+        self._lock = threading.Lock()
+        self._configurations: Optional[Dict[str, PluginConfiguration]] = None
+        self._version = None
+
+    def get_all(self) -> Dict[str, PluginConfiguration]:
+        version = self.version.get()
+        with self._lock:
+            if self._configurations is None or self._version != version:
+                self._configurations = {
+                    configuration.name: configuration
+                    for configuration in PluginConfiguration.objects.all()
+                }
+                self._version = version
+            return self._configurations
+
+    def get(self, plugin_name: str) -> Optional[PluginConfiguration]:
+        configuration = self.get_all().get(plugin_name)
+        # Plugins are free to modify their configuration
+        return deepcopy(configuration)
+
+    def invalidate(self):
+        self.version.invalidate()
+
+    def clear(self):
+        with self._lock:
+            self._configurations = None
+            self._version = None
+
+
+plugin_configurations_cache = PluginConfigurationsCache()
@@ -1,5 +1,7 @@
+import inspect
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 
 from django.conf import settings
 from django.utils.module_loading import import_string
@@ -9,11 +11,11 @@ from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 from ..checkout import base_calculations
 from ..core.payments import PaymentInterface
 from ..core.taxes import TaxType, quantize_price
+from .base_plugin import BasePlugin
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from .base_plugin import BasePlugin
     from ..checkout.models import Checkout, CheckoutLine
     from ..discount.types import DiscountsListType
     from ..product.models import Product, ProductType
@@ -27,6 +29,37 @@ if TYPE_CHECKING:
     )
 
 
+# Methods of plugins which are called with a value returned by previous plugins
+PLUGIN_HOOKS = [
+    name
+    for name, method in vars(BasePlugin).items()
+    if inspect.isfunction(method)
+    and "previous_value" in inspect.signature(method).parameters
+]
+
+
+def get_plugin_hooks(plugins: List["BasePlugin"]) -> Dict[str, List[Callable]]:
+    """Return methods of plugins which override each of the hooks.
+
+    Plugins which don't override a hook would return `NotImplemented` anyway,
+    so they are skipped when running the hook.
+    """
+    hooks = {}
+    for hook in PLUGIN_HOOKS:
+        base_method = getattr(BasePlugin, hook)
+        hooks[hook] = [
+            getattr(plugin, hook)
+            for plugin in plugins
+            if getattr(type(plugin), hook, base_method) is not base_method
+        ]
+    return hooks
+
+
+@lru_cache(maxsize=None)
+def get_plugin_class(plugin_path: str) -> type:
+    return import_string(plugin_path)
+
+
 class ExtensionsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -35,18 +68,19 @@ class ExtensionsManager(PaymentInterface):
     def __init__(self, plugins: List[str]):
         self.plugins = []
         for plugin_path in plugins:
-            plugin_class = import_string(plugin_path)
+            plugin_class = get_plugin_class(plugin_path)
             self.plugins.append(plugin_class())
+        self.hooks = get_plugin_hooks(self.plugins)
 
     def __run_method_on_plugins(
         self, method_name: str, default_value: Any, *args, **kwargs
     ):
         """Try to run a method with the given name on each declared plugin."""
         value = default_value
-        for plugin in self.plugins:
-            value = self.__run_method_on_single_plugin(
-                plugin, method_name, value, *args, **kwargs
-            )
+        for plugin_method in self.hooks[method_name]:
+            returned_value = plugin_method(*args, **kwargs, previous_value=value)
+            if returned_value != NotImplemented:
+                value = returned_value
         return value
 
     def __run_method_on_single_plugin(
@@ -81,12 +115,24 @@ class ExtensionsManager(PaymentInterface):
         )
 
     def calculate_checkout_total(
-        self, checkout: "Checkout", discounts: "DiscountsListType"
+        self,
+        checkout: "Checkout",
+        discounts: "DiscountsListType",
+        subtotal: Optional[TaxedMoney] = None,
+        shipping_price: Optional[TaxedMoney] = None,
     ) -> TaxedMoney:
+        """Calculate the checkout total.
 
+        Subtotal and shipping price which were already calculated for the
+        checkout can be passed to avoid calculating them again.
+        """
+        if subtotal is None:
+            subtotal = self.calculate_checkout_subtotal(checkout, discounts)
+        if shipping_price is None:
+            shipping_price = self.calculate_checkout_shipping(checkout, discounts)
         default_value = base_calculations.base_checkout_total(
-            subtotal=self.calculate_checkout_subtotal(checkout, discounts),
-            shipping_price=self.calculate_checkout_shipping(checkout, discounts),
+            subtotal=subtotal,
+            shipping_price=shipping_price,
             discount=checkout.discount,
             currency=checkout.currency,
         )
@@ -95,11 +141,20 @@ class ExtensionsManager(PaymentInterface):
         )
 
     def calculate_checkout_subtotal(
-        self, checkout: "Checkout", discounts: "DiscountsListType"
+        self,
+        checkout: "Checkout",
+        discounts: "DiscountsListType",
+        line_totals: Optional[List[TaxedMoney]] = None,
     ) -> TaxedMoney:
-        line_totals = [
-            self.calculate_checkout_line_total(line, discounts) for line in checkout
-        ]
+        """Calculate the checkout subtotal.
+
+        Totals of all the checkout lines can be passed if they were already
+        calculated.
+        """
+        if line_totals is None:
+            line_totals = [
+                self.calculate_checkout_line_total(line, discounts) for line in checkout
+            ]
         default_value = base_calculations.base_checkout_subtotal(
             line_totals, checkout.currency
         )
@@ -0,0 +1,121 @@
+import logging
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from . import create_webhook_headers
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TIMEOUT = 10
+
+WebhookDelivery = namedtuple(
+    "WebhookDelivery", ["webhook_id", "target_url", "secret", "event_type", "data"]
+)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_endpoint(target_url: str) -> str:
+    """Return the scheme and the host which deliveries to the URL are sent to."""
+    url = urlsplit(target_url)
+    return f"{url.scheme}://{url.netloc}".lower()
+
+
+def get_session(target_url: str) -> requests.Session:
+    """Return the process-wide session keeping connections to the URL's host.
+
+    Connections are kept alive and reused by following deliveries, so they
+    don't make a new TCP connection and TLS handshake each.
+    """
+    endpoint = get_endpoint(target_url)
+    session = _sessions.get(endpoint)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(endpoint)
+            if session is None:
+                pool_size = settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount(endpoint, adapter)
+                _sessions[endpoint] = session
+    return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def send_delivery(delivery: WebhookDelivery, headers=None):
+    if headers is None:
+        headers = create_webhook_headers(
+            delivery.event_type, delivery.data, delivery.secret
+        )
+    response = get_session(delivery.target_url).post(
+        delivery.target_url,
+        data=delivery.data,
+        headers=headers,
+        timeout=WEBHOOK_TIMEOUT,
+    )
+    response.raise_for_status()
+    logger.debug(
+        f"[Webhook ID:{delivery.webhook_id}] Payload sent to {delivery.target_url} "
+        f"for event {delivery.event_type}"
+    )
+
+
+def deliver_webhooks(deliveries: List[WebhookDelivery]) -> List[WebhookDelivery]:
+    """Send the deliveries to a single endpoint and return the ones which failed.
+
+    Deliveries are sent concurrently over at most
+    `WEBHOOK_MAX_CONNECTIONS_PER_HOST` kept-alive connections of the endpoint's
+    session.
+    """
+    # Headers are created upfront, as they are read from the database
+    queue = deque(
+        (
+            delivery,
+            create_webhook_headers(delivery.event_type, delivery.data, delivery.secret),
+        )
+        for delivery in deliveries
+    )
+    failed = []
+
+    def process_queue():
+        while True:
+            try:
+                delivery, headers = queue.popleft()
+            except IndexError:
+                return
+            try:
+                send_delivery(delivery, headers)
+            except RequestException:
+                logger.warning(
+                    f"[Webhook ID:{delivery.webhook_id}] Failed request to "
+                    f"{delivery.target_url} for event {delivery.event_type}",
+                    exc_info=True,
+                )
+                failed.append(delivery)
+
+    max_workers = min(len(queue), settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST)
+    if max_workers <= 1:
+        process_queue()
+        return failed
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="webhook-delivery"
+    ) as executor:
+        for future in [executor.submit(process_queue) for _ in range(max_workers)]:
+            future.result()
+    return failed
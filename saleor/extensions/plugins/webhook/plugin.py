@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, Any
 
 from ....webhook import WebhookEventType
+from ....webhook.cache import webhooks_index
 from ....webhook.payloads import (
     generate_customer_payload,
     generate_order_payload,
@@ -26,6 +27,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.ORDER_CREATED):
+            return previous_value
         order_data = generate_order_payload(order)
         trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
 
@@ -33,6 +36,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.ORDER_FULLY_PAID):
+            return previous_value
         order_data = generate_order_payload(order)
         trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
 
@@ -40,6 +45,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.ORDER_UPDATED):
+            return previous_value
         order_data = generate_order_payload(order)
         trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
 
@@ -47,6 +54,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.ORDER_CANCELLED):
+            return previous_value
         order_data = generate_order_payload(order)
         trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
 
@@ -54,6 +63,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.ORDER_FULFILLED):
+            return previous_value
         order_data = generate_order_payload(order)
         trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
 
@@ -61,7 +72,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
-
+        if not webhooks_index.get(WebhookEventType.CUSTOMER_CREATED):
+            return previous_value
         customer_data = generate_customer_payload(customer)
         trigger_webhooks_for_event.delay(
             WebhookEventType.CUSTOMER_CREATED, customer_data
@@ -71,6 +83,8 @@ class WebhookPlugin(BasePlugin):
         self._initialize_plugin_configuration()
         if not self.active:
             return previous_value
+        if not webhooks_index.get(WebhookEventType.PRODUCT_CREATED):
+            return previous_value
         product_data = generate_product_payload(product)
         trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
 
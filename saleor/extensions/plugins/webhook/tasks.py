@@ -1,41 +1,46 @@
-import logging
+from collections import defaultdict
 
-import requests
 from requests.exceptions import RequestException
 
 from ....celeryconf import app
-from ....webhook import WebhookEventType
+from ....webhook.cache import webhooks_index
 from ....webhook.models import Webhook
-from . import create_webhook_headers
+from .delivery import WebhookDelivery, deliver_webhooks, get_endpoint, send_delivery
 
-logger = logging.getLogger(__name__)
 
-WEBHOOK_TIMEOUT = 10
+@app.task
+def trigger_webhooks_for_event(event_type, data):
+    """Queue the deliveries of the event, one task per endpoint they're sent to.
+
+    A slow endpoint only holds back the task sending its own deliveries.
+    Secret keys of the webhooks are read by the tasks.
+    """
+    deliveries = defaultdict(list)
+    for webhook in webhooks_index.get(event_type):
+        deliveries[get_endpoint(webhook.target_url)].append(
+            WebhookDelivery(webhook.pk, webhook.target_url, None, event_type, data)
+        )
+    for endpoint_deliveries in deliveries.values():
+        send_webhooks_to_endpoint.delay(endpoint_deliveries)
 
 
 @app.task
-def trigger_webhooks_for_event(event_type, data):
-    permissions = {}
-    required_permission = WebhookEventType.PERMISSIONS[event_type]
-    if required_permission:
-        app_label, codename = required_permission.split(".")
-        permissions["service_account__permissions__content_type__app_label"] = app_label
-        permissions["service_account__permissions__codename"] = codename
-
-    webhooks = Webhook.objects.filter(
-        is_active=True,
-        service_account__is_active=True,
-        events__event_type__in=[event_type, WebhookEventType.ANY],
-        **permissions,
-    )
-    webhooks = webhooks.select_related("service_account").prefetch_related(
-        "service_account__permissions__content_type"
+def send_webhooks_to_endpoint(deliveries):
+    deliveries = [WebhookDelivery(*delivery) for delivery in deliveries]
+    secret_keys = dict(
+        Webhook.objects.filter(
+            pk__in=[delivery.webhook_id for delivery in deliveries]
+        ).values_list("pk", "secret_key")
     )
-
-    for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
-        )
+    # Deliveries of webhooks deleted in the meantime are dropped
+    deliveries = [
+        delivery._replace(secret=secret_keys[delivery.webhook_id])
+        for delivery in deliveries
+        if delivery.webhook_id in secret_keys
+    ]
+    # Failed deliveries are retried later by separate tasks
+    for delivery in deliver_webhooks(deliveries):
+        send_webhook_request.apply_async(args=delivery, countdown=60)
 
 
 @app.task(
@@ -44,11 +49,4 @@ def trigger_webhooks_for_event(event_type, data):
     retry_kwargs={"max_retries": 15},
 )
 def send_webhook_request(webhook_id, target_url, secret, event_type, data):
-    headers = create_webhook_headers(event_type, data, secret)
-    response = requests.post(
-        target_url, data=data, headers=headers, timeout=WEBHOOK_TIMEOUT
-    )
-    response.raise_for_status()
-    logger.debug(
-        f"[Webhook ID:{webhook_id}] Payload sent to {target_url} for event {event_type}"
-    )
+    send_delivery(WebhookDelivery(webhook_id, target_url, secret, event_type, data))
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .cache import plugin_configurations_cache
+from .models import PluginConfiguration
+
+
+def invalidate_configurations(**_kwargs):
+    plugin_configurations_cache.invalidate()
+
+
+def connect_signals():
+    post_save.connect(invalidate_configurations, sender=PluginConfiguration)
+    post_delete.connect(invalidate_configurations, sender=PluginConfiguration)
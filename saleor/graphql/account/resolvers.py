@@ -10,11 +10,13 @@ from i18naddress import get_validation_rules
 from ...account import models
 from ...payment import gateway
 from ...payment.utils import fetch_customer_id
-from ..utils import filter_by_query_param, sort_queryset
+from ...search.backends import picker
+from ..utils import sort_queryset
 from .sorters import ServiceAccountSortField, UserSortField, UserSortingInput
 from .types import AddressValidationData, ChoiceValue
 from .utils import get_allowed_fields_camel_case, get_required_fields_camel_case
 
+# Fields matched by the search of users, listed in the description of `query`
 USER_SEARCH_FIELDS = (
     "email",
     "first_name",
@@ -23,6 +25,12 @@ USER_SEARCH_FIELDS = (
     "default_shipping_address__last_name",
     "default_shipping_address__city",
     "default_shipping_address__country",
+    "default_shipping_address__phone",
+    "default_billing_address__first_name",
+    "default_billing_address__last_name",
+    "default_billing_address__city",
+    "default_billing_address__country",
+    "default_billing_address__phone",
 )
 
 
@@ -34,9 +42,9 @@ def sort_users(qs: QuerySet, sort_by: UserSortingInput) -> QuerySet:
 
 def resolve_customers(info, query, sort_by=None, **_kwargs):
     qs = models.User.objects.customers()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
+    if query:
+        search = picker.pick_user_search_backend()
+        qs = search(qs, query)
     qs = sort_users(qs, sort_by)
     qs = qs.distinct()
     return gql_optimizer.query(qs, info)
@@ -44,9 +52,9 @@ def resolve_customers(info, query, sort_by=None, **_kwargs):
 
 def resolve_staff_users(info, query, sort_by=None, **_kwargs):
     qs = models.User.objects.staff()
-    qs = filter_by_query_param(
-        queryset=qs, query=query, search_fields=USER_SEARCH_FIELDS
-    )
+    if query:
+        search = picker.pick_user_search_backend()
+        qs = search(qs, query)
     qs = sort_users(qs, sort_by)
     qs = qs.distinct()
     return gql_optimizer.query(qs, info)
@@ -0,0 +1,75 @@
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.http import HttpRequest
+from django.utils import translation
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Attributes set on `info.context` by resolvers of a single operation
+OPERATION_CONTEXT_ATTRIBUTES = ["dataloaders", "checkout_prices"]
+
+
+def get_batch_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the process-wide pool used to run batched operations.
+
+    Each thread of the pool uses its own database connection, so the pool size
+    bounds the number of extra connections opened by a process. Returns `None`
+    when concurrent execution of batched operations is disabled.
+    """
+    global _executor
+
+    max_workers = settings.GRAPHQL_BATCH_MAX_WORKERS
+    if max_workers <= 1:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="graphql-batch"
+                )
+    return _executor
+
+
+def shutdown_batch_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def get_operation_context(request: HttpRequest) -> HttpRequest:
+    """Return a copy of the request used as the context of a single operation.
+
+    Operations of a batch don't share the state their resolvers store on the
+    context, like data loaders and their caches, so the ones running
+    concurrently don't change the same objects and the ones following a
+    mutation don't see data loaded before it.
+    """
+    context = copy.copy(request)
+    for attr in OPERATION_CONTEXT_ATTRIBUTES:
+        context.__dict__.pop(attr, None)
+    return context
+
+
+def run_in_worker(func, language: Optional[str], *args, **kwargs):
+    """Call `func` in a pool thread the same way Django handles a request.
+
+    Active translation is thread-local so it's propagated from the request
+    thread. Database connections of the thread are closed after the call, as
+    the pool threads outlive requests and would keep them open until the
+    process exits.
+    """
+    close_old_connections()
+    try:
+        with translation.override(language):
+            return func(*args, **kwargs)
+    finally:
+        connections.close_all()
@@ -660,7 +660,9 @@ class CheckoutComplete(BaseMutation):
             field="checkout_id",
             qs=models.Checkout.objects.prefetch_related(
                 "gift_cards",
-                "lines",
+                "lines__variant__product__product_type",
+                "lines__variant__product__translations",
+                "lines__variant__translations",
                 Prefetch(
                     "payments",
                     queryset=payment_models.Payment.objects.prefetch_related(
@@ -698,45 +700,50 @@ class CheckoutComplete(BaseMutation):
                     code=CheckoutErrorCode.TAX_ERROR,
                 )
 
-        billing_address = order_data["billing_address"]
-        shipping_address = order_data.get("shipping_address", None)
+        # Stock and the voucher reserved for the order are released when
+        # anything fails until the order is created
+        try:
+            billing_address = order_data["billing_address"]
+            shipping_address = order_data.get("shipping_address", None)
 
-        billing_address = AddressData(**billing_address.as_data())
+            billing_address = AddressData(**billing_address.as_data())
 
-        if shipping_address is not None:
-            shipping_address = AddressData(**shipping_address.as_data())
+            if shipping_address is not None:
+                shipping_address = AddressData(**shipping_address.as_data())
 
-        try:
-            txn = gateway.process_payment(
-                payment=payment, token=payment.token, store_source=store_source
-            )
+            try:
+                txn = gateway.process_payment(
+                    payment=payment, token=payment.token, store_source=store_source
+                )
 
-            if not txn.is_success:
-                raise PaymentError(txn.error)
+                if not txn.is_success:
+                    raise PaymentError(txn.error)
 
-        except PaymentError as e:
-            abort_order_data(order_data)
-            raise ValidationError(str(e), code=CheckoutErrorCode.PAYMENT_ERROR)
+            except PaymentError as e:
+                raise ValidationError(str(e), code=CheckoutErrorCode.PAYMENT_ERROR)
 
-        if txn.customer_id and user.is_authenticated:
-            store_customer_id(user, payment.gateway, txn.customer_id)
+            if txn.customer_id and user.is_authenticated:
+                store_customer_id(user, payment.gateway, txn.customer_id)
 
-        redirect_url = data.get("redirect_url", "")
-        if redirect_url:
-            try:
-                validate_storefront_url(redirect_url)
-            except ValidationError as error:
-                raise ValidationError(
-                    {"redirect_url": error}, code=AccountErrorCode.INVALID
-                )
+            redirect_url = data.get("redirect_url", "")
+            if redirect_url:
+                try:
+                    validate_storefront_url(redirect_url)
+                except ValidationError as error:
+                    raise ValidationError(
+                        {"redirect_url": error}, code=AccountErrorCode.INVALID
+                    )
 
-        # create the order into the database
-        order = create_order(
-            checkout=checkout,
-            order_data=order_data,
-            user=user,
-            redirect_url=redirect_url,
-        )
+            # create the order into the database
+            order = create_order(
+                checkout=checkout,
+                order_data=order_data,
+                user=user,
+                redirect_url=redirect_url,
+            )
+        except Exception:
+            abort_order_data(order_data)
+            raise
 
         # remove checkout after order is successfully paid
         checkout.delete()
@@ -1,7 +1,7 @@
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
-from ...checkout import calculations, models
+from ...checkout import models
 from ...checkout.utils import get_valid_shipping_methods_for_checkout
 from ...core.taxes import display_gross_prices, zero_taxed_money
 from ...extensions.manager import get_extensions_manager
@@ -12,6 +12,7 @@ from ..core.types.money import Money, TaxedMoney
 from ..decorators import permission_required
 from ..giftcard.types import GiftCard
 from ..shipping.types import ShippingMethod
+from .utils import get_checkout_prices
 
 
 class GatewayConfigLine(graphene.ObjectType):
@@ -55,6 +56,11 @@ class CheckoutLine(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_total_price(self, info):
+        # Reuse prices of the whole checkout when resolved as one of its lines
+        if models.CheckoutLine.checkout.is_cached(self):
+            prices = get_checkout_prices(info, self.checkout)
+            if self.pk in prices.line_totals:
+                return prices.line_totals[self.pk]
         return info.context.extensions.calculate_checkout_line_total(
             checkout_line=self, discounts=info.context.discounts
         )
@@ -146,22 +152,17 @@ class Checkout(MetadataObjectType, CountableDjangoObjectType):
     @staticmethod
     def resolve_total_price(root: models.Checkout, info):
         taxed_total = (
-            calculations.checkout_total(checkout=root, discounts=info.context.discounts)
-            - root.get_total_gift_cards_balance()
+            get_checkout_prices(info, root).total - root.get_total_gift_cards_balance()
         )
         return max(taxed_total, zero_taxed_money())
 
     @staticmethod
     def resolve_subtotal_price(root: models.Checkout, info):
-        return calculations.checkout_subtotal(
-            checkout=root, discounts=info.context.discounts
-        )
+        return get_checkout_prices(info, root).subtotal
 
     @staticmethod
     def resolve_shipping_price(root: models.Checkout, info):
-        return calculations.checkout_shipping_price(
-            checkout=root, discounts=info.context.discounts
-        )
+        return get_checkout_prices(info, root).shipping_price
 
     @staticmethod
     def resolve_lines(root: models.Checkout, *_args):
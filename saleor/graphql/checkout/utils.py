@@ -0,0 +1,43 @@
+from django.db.models import prefetch_related_objects
+
+from ...checkout import calculations
+from ...discount.cache import discounts_cache
+
+
+def get_checkout_prices_key(checkout, lines, discounts_version):
+    """Return a key which changes with any input of the checkout prices."""
+    return (
+        checkout.pk,
+        tuple((line.pk, line.variant_id, line.quantity) for line in lines),
+        checkout.shipping_address_id,
+        checkout.billing_address_id,
+        checkout.shipping_method_id,
+        checkout.voucher_code,
+        checkout.discount_amount,
+        checkout.currency,
+        discounts_version,
+    )
+
+
+def get_checkout_prices(info, checkout) -> calculations.CheckoutPrices:
+    """Return prices of the checkout shared by all resolvers of the request.
+
+    Prices are calculated once for every state of the checkout, so resolving
+    the total, subtotal, shipping price and totals of lines doesn't repeat
+    calculations, which may involve requests to tax services.
+    """
+    prefetch_related_objects([checkout], "lines__variant")
+    lines = checkout.lines.all()
+    key = get_checkout_prices_key(checkout, lines, discounts_cache.version.get())
+    if not hasattr(info.context, "checkout_prices"):
+        info.context.checkout_prices = {}
+    prices = info.context.checkout_prices.get(key)
+    if prices is None:
+        prices = calculations.checkout_prices(
+            checkout,
+            lines,
+            discounts=info.context.discounts,
+            manager=info.context.extensions,
+        )
+        info.context.checkout_prices[key] = prices
+    return prices
@@ -42,6 +42,8 @@ class CountableConnection(NonNullConnection):
 
     @staticmethod
     def resolve_total_count(root, *_args, **_kwargs):
+        if root.length is None:
+            root.length = root.iterable.count()
         return root.length
 
 
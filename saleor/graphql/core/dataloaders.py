@@ -0,0 +1,42 @@
+from promise import Promise
+from promise.dataloader import DataLoader as BaseLoader
+
+
+class DataLoader(BaseLoader):
+    """Base class for data loaders scoped to a single request.
+
+    Loaders are stored on the request (`info.context`) under their
+    `context_key`, so every resolver executed within the same request shares
+    one instance and its cache, while nothing leaks between requests.
+    Subclasses implement `batch_load`, which receives a list of keys and
+    returns results in the same order.
+    """
+
+    context_key = None
+    context = None
+
+    def __new__(cls, context):
+        key = cls.context_key
+        if key is None:
+            raise TypeError("Data loader %r does not define a context key" % (cls,))
+        if not hasattr(context, "dataloaders"):
+            context.dataloaders = {}
+        if key not in context.dataloaders:
+            context.dataloaders[key] = super().__new__(cls, context)
+        loader = context.dataloaders[key]
+        assert isinstance(loader, cls)
+        return loader
+
+    def __init__(self, context):
+        if self.context != context:
+            self.context = context
+            super().__init__()
+
+    def batch_load_fn(self, keys):
+        results = self.batch_load(keys)
+        if not isinstance(results, Promise):
+            return Promise.resolve(results)
+        return results
+
+    def batch_load(self, keys):
+        raise NotImplementedError()
@@ -7,9 +7,11 @@ from django_prices.models import MoneyField, TaxedMoneyField
 from graphene.relay import PageInfo
 from graphene_django.converter import convert_django_field
 from graphene_django.fields import DjangoConnectionField
+from graphene_django.utils import maybe_queryset
 from graphql_relay.connection.arrayconnection import connection_from_list_slice
 from promise import Promise
 
+from .pagination import connection_from_queryset_keyset
 from .types.common import Weight
 from .types.money import Money, TaxedMoney
 
@@ -34,6 +36,41 @@ def patch_pagination_args(field: DjangoConnectionField):
     )
 
 
+def connection_from_iterable(connection, args, iterable):
+    """Return a page of a connection from a queryset or a list.
+
+    Querysets are paginated with keyset cursors when their ordering allows it,
+    otherwise cursors hold offsets within the whole list.
+    """
+    if isinstance(iterable, QuerySet):
+        keyset_connection = connection_from_queryset_keyset(
+            iterable,
+            args,
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        if keyset_connection is not None:
+            return keyset_connection
+        _len = iterable.count()
+    else:
+        _len = len(iterable)
+
+    connection = connection_from_list_slice(
+        iterable,
+        args,
+        slice_start=0,
+        list_length=_len,
+        list_slice_length=_len,
+        connection_type=connection,
+        edge_type=connection.Edge,
+        pageinfo_type=PageInfo,
+    )
+    connection.iterable = iterable
+    connection.length = _len
+    return connection
+
+
 class BaseConnectionField(graphene.ConnectionField):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -97,25 +134,7 @@ class PrefetchingConnectionField(BaseDjangoConnectionField):
     def resolve_connection(cls, connection, default_manager, args, iterable):
         if iterable is None:
             iterable = default_manager
-
-        if isinstance(iterable, QuerySet):
-            _len = iterable.count()
-        else:
-            _len = len(iterable)
-
-        connection = connection_from_list_slice(
-            iterable,
-            args,
-            slice_start=0,
-            list_length=_len,
-            list_slice_length=_len,
-            connection_type=connection,
-            edge_type=connection.Edge,
-            pageinfo_type=PageInfo,
-        )
-        connection.iterable = iterable
-        connection.length = _len
-        return connection
+        return connection_from_iterable(connection, args, maybe_queryset(iterable))
 
 
 class FilterInputConnectionField(BaseDjangoConnectionField):
@@ -187,6 +206,20 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
             return Promise.resolve(iterable).then(on_resolve)
         return on_resolve(iterable)
 
+    @classmethod
+    def resolve_connection(cls, connection, default_manager, args, iterable):
+        if iterable is None:
+            iterable = default_manager
+        iterable = maybe_queryset(iterable)
+
+        if (
+            isinstance(iterable, QuerySet)
+            and iterable.model.objects is not default_manager
+        ):
+            default_queryset = maybe_queryset(default_manager)
+            iterable = cls.merge_querysets(default_queryset, iterable)
+        return connection_from_iterable(connection, args, iterable)
+
     def get_resolver(self, parent_resolver):
         return partial(
             super().get_resolver(parent_resolver),
@@ -0,0 +1,224 @@
+import json
+from collections import namedtuple
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, List, Optional
+from uuid import UUID
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import OrderBy
+from graphql.error import GraphQLError
+from graphql_relay.utils import base64, unbase64
+
+KEYSET_CURSOR_PREFIX = "keyset:"
+OFFSET_CURSOR_PREFIX = "arrayconnection:"
+
+# A single component of a keyset: the lookup used in `ORDER BY` and filters and
+# the attribute of a fetched instance which holds the value of the lookup.
+OrderingKey = namedtuple("OrderingKey", ["lookup", "descending", "nullable", "attr"])
+
+
+def _get_ordering_key(
+    queryset: QuerySet, lookup: str, descending: bool, index: int
+) -> Optional[OrderingKey]:
+    query = queryset.query
+    if lookup in query.annotations:
+        return OrderingKey(lookup, descending, True, lookup)
+
+    opts = query.get_meta()
+    parts = lookup.split(LOOKUP_SEP)
+    nullable = False
+    try:
+        for part in parts[:-1]:
+            field = opts.get_field(part)
+            # Following a multi-valued relation would duplicate rows
+            if not (field.many_to_one or field.one_to_one):
+                return None
+            nullable |= field.null
+            opts = field.related_model._meta
+        field = opts.pk if parts[-1] == "pk" else opts.get_field(parts[-1])
+    except FieldDoesNotExist:
+        return None
+
+    # Ordering by a relation uses the ordering of the related model instead
+    if field.is_relation:
+        return None
+    if field.primary_key and len(parts) == 1:
+        return OrderingKey("pk", descending, False, "pk")
+    # The value is annotated as the optimizer may defer the field
+    return OrderingKey(lookup, descending, nullable or field.null, f"_cursor_{index}")
+
+
+def get_keyset_ordering(queryset: QuerySet) -> Optional[List[OrderingKey]]:
+    """Return the keys the queryset is ordered by, ending with the primary key.
+
+    Returns `None` if the queryset can't be paginated by seeking to the values
+    of its ordering, e.g. when it is ordered by a raw SQL or a random order.
+    """
+    query = queryset.query
+    if (
+        query.combinator
+        or query.distinct_fields
+        or query.extra_order_by
+        or not query.can_filter()
+        or not query.standard_ordering
+    ):
+        return None
+
+    ordering = query.order_by
+    if not ordering and query.default_ordering:
+        ordering = query.get_meta().ordering
+
+    keys = []
+    for item in ordering:
+        if isinstance(item, str) and item != "?":
+            lookup, descending = item.lstrip("-"), item.startswith("-")
+        elif (
+            isinstance(item, OrderBy)
+            and isinstance(item.expression, F)
+            and not (item.nulls_first or item.nulls_last)
+        ):
+            lookup, descending = item.expression.name, item.descending
+        else:
+            return None
+        key = _get_ordering_key(queryset, lookup, descending, len(keys))
+        if key is None:
+            return None
+        keys.append(key)
+        if key.lookup == "pk":
+            # Following keys can't change the order of unique rows
+            return keys
+
+    # Rows with equal values of the ordering are returned in creation order
+    keys.append(OrderingKey("pk", False, False, "pk"))
+    return keys
+
+
+def _serialize_cursor_value(value: Any):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError("Unsupported cursor value: %r" % (value,))
+
+
+def encode_keyset_cursor(instance, keys: List[OrderingKey]) -> str:
+    values = [getattr(instance, key.attr) for key in keys]
+    return base64(
+        KEYSET_CURSOR_PREFIX + json.dumps(values, default=_serialize_cursor_value)
+    )
+
+
+def decode_keyset_cursor(cursor: str, keys: List[OrderingKey]) -> List[Any]:
+    try:
+        value = unbase64(cursor)
+        if not value.startswith(KEYSET_CURSOR_PREFIX):
+            raise ValueError(value)
+        start = len(KEYSET_CURSOR_PREFIX)
+        values = json.loads(value[start:])
+    except (TypeError, ValueError):
+        values = None
+    # Cursors returned for a different sorting of the list are invalid too
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise GraphQLError(f"Invalid cursor: {cursor}.")
+    return values
+
+
+def is_offset_cursor(cursor: Optional[str]) -> bool:
+    try:
+        return bool(cursor) and unbase64(cursor).startswith(OFFSET_CURSOR_PREFIX)
+    except (TypeError, ValueError):
+        return False
+
+
+def get_seek_filter(keys: List[OrderingKey], values: List[Any], forward=True) -> Q:
+    """Return a filter selecting rows placed after the given values of the keys.
+
+    It's an equivalent of the `(key_1, ..., pk) > (value_1, ..., value_pk)` row
+    comparison which handles descending keys and Postgres' placement of nulls,
+    which are last in ascending order. Rows placed before the values are
+    selected when `forward` is false.
+    """
+    condition = None
+    for key, value in reversed(list(zip(keys, values))):
+        ascending = key.descending != forward
+        if value is None:
+            after = None if ascending else Q(**{f"{key.lookup}__isnull": False})
+            equal = Q(**{f"{key.lookup}__isnull": True})
+        else:
+            lookup_type = "gt" if ascending else "lt"
+            after = Q(**{f"{key.lookup}__{lookup_type}": value})
+            if ascending and key.nullable:
+                after |= Q(**{f"{key.lookup}__isnull": True})
+            equal = Q(**{key.lookup: value})
+        if condition is not None:
+            after = equal & condition if after is None else after | equal & condition
+        condition = after
+    return condition
+
+
+def connection_from_queryset_keyset(
+    queryset: QuerySet, args, connection_type, edge_type, pageinfo_type
+):
+    """Paginate a queryset by seeking to the ordering values encoded in cursors.
+
+    Unlike offset pagination, the database doesn't have to scan all the rows
+    before the requested page and the total count of rows is only computed when
+    `totalCount` of the connection is resolved. Returns `None` if the queryset
+    can't be paginated this way or if offset cursors were provided.
+    """
+    keys = get_keyset_ordering(queryset)
+    after = args.get("after")
+    before = args.get("before")
+    if keys is None or is_offset_cursor(after) or is_offset_cursor(before):
+        return None
+
+    page = queryset.order_by(
+        *["-" + key.lookup if key.descending else key.lookup for key in keys]
+    ).annotate(
+        **{key.attr: F(key.lookup) for key in keys if key.attr.startswith("_cursor_")}
+    )
+    if after:
+        values = decode_keyset_cursor(after, keys)
+        page = page.filter(get_seek_filter(keys, values, forward=True))
+    if before:
+        values = decode_keyset_cursor(before, keys)
+        page = page.filter(get_seek_filter(keys, values, forward=False))
+
+    first = args.get("first")
+    last = args.get("last")
+    has_previous_page = False
+    has_next_page = False
+    if isinstance(first, int):
+        rows = list(page[: first + 1])
+        has_next_page = len(rows) > first
+        rows = rows[:first]
+        if isinstance(last, int):
+            has_previous_page = len(rows) > last
+            start = max(len(rows) - last, 0)
+            rows = rows[start:]
+    elif isinstance(last, int):
+        rows = list(page.reverse()[: last + 1])
+        has_previous_page = len(rows) > last
+        rows = rows[:last][::-1]
+    else:
+        rows = list(page)
+
+    edges = [
+        edge_type(node=row, cursor=encode_keyset_cursor(row, keys)) for row in rows
+    ]
+    connection = connection_type(
+        edges=edges,
+        page_info=pageinfo_type(
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+            has_previous_page=has_previous_page,
+            has_next_page=has_next_page,
+        ),
+    )
+    connection.iterable = queryset
+    # Counted lazily when the total count is requested
+    connection.length = None
+    return connection
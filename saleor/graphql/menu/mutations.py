@@ -18,6 +18,7 @@ from ..core.utils import from_global_id_strict_type
 from ..core.utils.reordering import perform_reordering
 from ..page.types import Page
 from ..product.types import Category, Collection
+from ..shop.mutations import get_site_settings_for_update
 from .enums import NavigationType
 from .types import Menu, MenuItem, MenuItemMoveInput
 
@@ -413,7 +414,7 @@ class AssignNavigation(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, navigation_type, menu=None):
-        site_settings = info.context.site.settings
+        site_settings = get_site_settings_for_update(info)
         if menu is not None:
             menu = cls.get_node_or_error(info, menu, field="menu")
 
@@ -423,5 +424,6 @@ class AssignNavigation(BaseMutation):
         elif navigation_type == NavigationType.SECONDARY:
             site_settings.bottom_menu = menu
             site_settings.save(update_fields=["bottom_menu"])
+        info.context.site.settings = site_settings
 
         return AssignNavigation(menu=menu)
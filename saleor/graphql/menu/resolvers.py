@@ -1,8 +1,8 @@
-import graphene
 import graphene_django_optimizer as gql_optimizer
 
 from ...menu import models
-from ..utils import filter_by_query_param, sort_queryset
+from ...menu.cache import menus_cache
+from ..utils import filter_by_query_param, get_database_id, sort_queryset
 from .sorters import MenuItemsSortField, MenuSortField
 from .types import Menu
 
@@ -13,10 +13,9 @@ MENU_ITEM_SEARCH_FIELDS = ("name",)
 def resolve_menu(info, menu_id=None, name=None):
     assert menu_id or name, "No ID or name provided."
     if name is not None:
-        qs = models.Menu.objects.filter(name=name)
-        qs = gql_optimizer.query(qs, info)
-        return qs[0] if qs else None
-    return graphene.Node.get_node_from_global_id(info, menu_id, Menu)
+        return menus_cache.get_by_name(name)
+    menu_pk = get_database_id(info, menu_id, Menu)
+    return menus_cache.get(int(menu_pk)) if menu_pk.isdigit() else None
 
 
 def resolve_menus(info, query, sort_by=None, **_kwargs):
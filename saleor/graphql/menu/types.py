@@ -6,9 +6,24 @@ from graphene import relay
 from ...menu import models
 from ..core.connection import CountableDjangoObjectType
 from ..translations.fields import TranslationField
+from ..translations.resolvers import resolve_translation
 from ..translations.types import MenuItemTranslation
 
 
+def resolve_menu_item_translation(root: models.MenuItem, info, language_code):
+    # Translations are prefetched by the cached menus
+    if "translations" in getattr(root, "_prefetched_objects_cache", {}):
+        return next(
+            (
+                translation
+                for translation in root.translations.all()
+                if translation.language_code == language_code
+            ),
+            None,
+        )
+    return resolve_translation(root, info, language_code)
+
+
 def prefetch_menus(info, *_args, **_kwargs):
     qs = models.MenuItem.objects.filter(level=0)
     return Prefetch(
@@ -42,7 +57,11 @@ class MenuItem(CountableDjangoObjectType):
         graphene.List(lambda: MenuItem), model_field="children"
     )
     url = graphene.String(description="URL to the menu item.")
-    translation = TranslationField(MenuItemTranslation, type_name="menu item")
+    translation = TranslationField(
+        MenuItemTranslation,
+        type_name="menu item",
+        resolver=resolve_menu_item_translation,
+    )
 
     sort_order = graphene.Field(
         graphene.Int,
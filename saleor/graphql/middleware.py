@@ -6,6 +6,7 @@ from django.utils.functional import SimpleLazyObject
 from graphene_django.settings import graphene_settings
 from graphql_jwt.middleware import JSONWebTokenMiddleware
 
+from ..account.cache import get_cached_service_account
 from ..account.models import ServiceAccount
 from .views import API_PATH, GraphQLView
 
@@ -35,9 +36,19 @@ def jwt_middleware(get_response):
     return _jwt_middleware
 
 
-def get_service_account(auth_token) -> Optional[ServiceAccount]:
+def fetch_service_account(auth_token) -> Optional[ServiceAccount]:
     qs = ServiceAccount.objects.filter(tokens__auth_token=auth_token, is_active=True)
-    return qs.first()
+    service_account = qs.first()
+    if service_account is not None:
+        # Cache the permissions along with the service account
+        service_account._get_permissions()
+    return service_account
+
+
+def get_service_account(auth_token) -> Optional[ServiceAccount]:
+    return get_cached_service_account(
+        auth_token, lambda: fetch_service_account(auth_token)
+    )
 
 
 def service_account_middleware(get_response):
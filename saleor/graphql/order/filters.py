@@ -2,10 +2,10 @@ import django_filters
 from django.db.models import Sum
 
 from ...order.models import Order
+from ...search.backends import picker
 from ..core.filters import ListObjectTypeFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput
 from ..payment.enums import PaymentChargeStatusEnum
-from ..utils import filter_by_query_param
 from .enums import OrderStatusFilter
 
 
@@ -36,13 +36,9 @@ def filter_status(qs, _, value):
 
 
 def filter_customer(qs, _, value):
-    customer_fields = [
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-        "user__email",
-    ]
-    qs = filter_by_query_param(qs, value, customer_fields)
+    if value:
+        search = picker.pick_order_search_backend()
+        qs = search(qs, value)
     return qs
 
 
@@ -56,15 +52,9 @@ def filter_created_range(qs, _, value):
 
 
 def filter_order_search(qs, _, value):
-    order_fields = [
-        "pk",
-        "discount_name",
-        "translated_discount_name",
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-    ]
-    qs = filter_by_query_param(qs, value, order_fields)
+    if value:
+        search = picker.pick_order_search_backend()
+        qs = search(qs, value)
     return qs
 
 
@@ -1,20 +1,39 @@
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
-from ...order import OrderStatus, models
+from ...order import models
 from ...order.events import OrderEvents
 from ...order.models import OrderEvent
-from ...order.utils import sum_order_totals
-from ..utils import filter_by_period, filter_by_query_param, sort_queryset
+from ...order.sales import get_orders_total, get_sales_date
+from ...search.backends import picker
+from ..utils import filter_by_period, reporting_period_to_date, sort_queryset
 from .enums import OrderStatusFilter
 from .sorters import OrderSortField
 from .types import Order
 
-ORDER_SEARCH_FIELDS = ("id", "discount_name", "token", "user_email", "user__email")
+# Fields matched by the search of orders, listed in the description of `query`
+ORDER_SEARCH_FIELDS = (
+    "id",
+    "user_email",
+    "user__email",
+    "user__first_name",
+    "user__last_name",
+    "billing_address__first_name",
+    "billing_address__last_name",
+    "billing_address__phone",
+    "shipping_address__first_name",
+    "shipping_address__last_name",
+    "shipping_address__phone",
+    "discount_name",
+    "translated_discount_name",
+    "token",
+)
 
 
 def filter_orders(qs, info, created, status, query):
-    qs = filter_by_query_param(qs, query, ORDER_SEARCH_FIELDS)
+    if query:
+        search = picker.pick_order_search_backend()
+        qs = search(qs, query)
 
     # filter orders by status
     if status is not None:
@@ -43,9 +62,8 @@ def resolve_draft_orders(info, created, query, sort_by=None):
 
 
 def resolve_orders_total(_info, period):
-    qs = models.Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
-    qs = filter_by_period(qs, period, "created")
-    return sum_order_totals(qs)
+    start_date = get_sales_date(reporting_period_to_date(period))
+    return get_orders_total(start_date)
 
 
 def resolve_order(info, order_id):
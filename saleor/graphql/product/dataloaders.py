@@ -0,0 +1,183 @@
+from collections import defaultdict
+
+from django.db.models import F, prefetch_related_objects
+
+from ...product.models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    AttributeProduct,
+    AttributeVariant,
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductImage,
+    ProductVariant,
+)
+from ..core.dataloaders import DataLoader
+
+
+class ProductByIdLoader(DataLoader):
+    context_key = "product_by_id"
+
+    def batch_load(self, keys):
+        products = Product.objects.in_bulk(keys)
+        return [products.get(product_id) for product_id in keys]
+
+
+class ProductVariantsByProductIdLoader(DataLoader):
+    context_key = "productvariants_by_product"
+
+    def batch_load(self, keys):
+        variants = ProductVariant.objects.filter(product_id__in=keys).order_by("pk")
+        variant_map = defaultdict(list)
+        for variant in variants.iterator():
+            variant_map[variant.product_id].append(variant)
+        return [variant_map[product_id] for product_id in keys]
+
+
+class ImagesByProductIdLoader(DataLoader):
+    context_key = "images_by_product"
+
+    def batch_load(self, keys):
+        images = ProductImage.objects.filter(product_id__in=keys)
+        image_map = defaultdict(list)
+        for image in images.iterator():
+            image_map[image.product_id].append(image)
+        return [image_map[product_id] for product_id in keys]
+
+
+class ImagesByProductVariantIdLoader(DataLoader):
+    context_key = "images_by_productvariant"
+
+    def batch_load(self, keys):
+        images = ProductImage.objects.filter(variant_images__variant_id__in=keys)
+        images = images.annotate(variant_id=F("variant_images__variant_id"))
+        image_map = defaultdict(list)
+        for image in images.iterator():
+            image_map[image.variant_id].append(image)
+        return [image_map[variant_id] for variant_id in keys]
+
+
+class CollectionsByProductIdLoader(DataLoader):
+    context_key = "collections_by_product"
+
+    def batch_load(self, keys):
+        product_collection_pairs = list(
+            CollectionProduct.objects.filter(product_id__in=keys).values_list(
+                "product_id", "collection_id"
+            )
+        )
+        collection_ids = {
+            collection_id for _, collection_id in product_collection_pairs
+        }
+        product_collections = defaultdict(set)
+        for product_id, collection_id in product_collection_pairs:
+            product_collections[product_id].add(collection_id)
+
+        # Keep the default ordering of collections for each of the products
+        collections = list(Collection.objects.filter(pk__in=collection_ids))
+        return [
+            [
+                collection
+                for collection in collections
+                if collection.pk in product_collections[product_id]
+            ]
+            for product_id in keys
+        ]
+
+
+class AttributeProductsByProductTypeIdLoader(DataLoader):
+    """Load product attributes of product types visible to the requesting user."""
+
+    context_key = "attributeproducts_by_producttype"
+
+    def batch_load(self, keys):
+        user = self.context.user
+        attribute_products = (
+            AttributeProduct.objects.get_visible_to_user(user)
+            .filter(product_type_id__in=keys)
+            .select_related("attribute")
+        )
+        attribute_product_map = defaultdict(list)
+        for attribute_product in attribute_products.iterator():
+            attribute_product_map[attribute_product.product_type_id].append(
+                attribute_product
+            )
+        return [attribute_product_map[product_type_id] for product_type_id in keys]
+
+
+class AttributeVariantsByProductTypeIdLoader(DataLoader):
+    """Load variant attributes of product types visible to the requesting user."""
+
+    context_key = "attributevariants_by_producttype"
+
+    def batch_load(self, keys):
+        user = self.context.user
+        attribute_variants = (
+            AttributeVariant.objects.get_visible_to_user(user)
+            .filter(product_type_id__in=keys)
+            .select_related("attribute")
+        )
+        attribute_variant_map = defaultdict(list)
+        for attribute_variant in attribute_variants.iterator():
+            attribute_variant_map[attribute_variant.product_type_id].append(
+                attribute_variant
+            )
+        return [attribute_variant_map[product_type_id] for product_type_id in keys]
+
+
+class AssignedProductAttributesByProductIdLoader(DataLoader):
+    context_key = "assignedproductattributes_by_product"
+
+    def batch_load(self, keys):
+        assigned_attributes = AssignedProductAttribute.objects.filter(
+            product_id__in=keys
+        ).prefetch_related("values")
+        assigned_attribute_map = defaultdict(list)
+        for assigned_attribute in assigned_attributes:
+            assigned_attribute_map[assigned_attribute.product_id].append(
+                assigned_attribute
+            )
+        return [assigned_attribute_map[product_id] for product_id in keys]
+
+
+class AssignedVariantAttributesByProductVariantIdLoader(DataLoader):
+    context_key = "assignedvariantattributes_by_productvariant"
+
+    def batch_load(self, keys):
+        assigned_attributes = AssignedVariantAttribute.objects.filter(
+            variant_id__in=keys
+        ).prefetch_related("values")
+        assigned_attribute_map = defaultdict(list)
+        for assigned_attribute in assigned_attributes:
+            assigned_attribute_map[assigned_attribute.variant_id].append(
+                assigned_attribute
+            )
+        return [assigned_attribute_map[variant_id] for variant_id in keys]
+
+
+class PrefetchRelatedObjectsLoader(DataLoader):
+    """Prefetch `lookups` on a batch of model instances.
+
+    Used for model methods which read related managers directly, e.g. product
+    pricing. Keys are the instances themselves and loading resolves them with
+    the relations prefetched. Caching is disabled as different objects of the
+    same row may be passed to the loader and each of them has to be populated.
+    """
+
+    cache = False
+    lookups = ()
+
+    def batch_load(self, keys):
+        prefetch_related_objects(keys, *self.lookups)
+        return keys
+
+
+class ProductWithPricingRelationsLoader(PrefetchRelatedObjectsLoader):
+    context_key = "product_with_pricing_relations"
+    lookups = ("variants", "collections")
+
+
+class ProductVariantWithPricingRelationsLoader(PrefetchRelatedObjectsLoader):
+    context_key = "productvariant_with_pricing_relations"
+    lookups = ("product__collections",)
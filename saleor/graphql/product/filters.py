@@ -1,9 +1,10 @@
 from collections import defaultdict
 
 import django_filters
-from django.db.models import Q, Sum
+from django.db.models import Q
 from graphene_django.filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
 
+from ...product.cache import attributes_index, categories_tree_cache
 from ...product.filters import (
     T_PRODUCT_FILTER_QUERIES,
     filter_products_by_attributes_values,
@@ -37,22 +38,16 @@ def filter_fields_containing_value(*search_fields: str):
 
 
 def _clean_product_attributes_filter_input(filter_value) -> T_PRODUCT_FILTER_QUERIES:
-    attributes = Attribute.objects.prefetch_related("values")
-    attributes_map = {attribute.slug: attribute.pk for attribute in attributes}
-    values_map = {
-        attr.slug: {value.slug: value.pk for value in attr.values.all()}
-        for attr in attributes
-    }
     queries = defaultdict(list)
 
     # Convert attribute:value pairs into a dictionary where
     # attributes are keys and values are grouped in lists
     for attr_name, val_slug in filter_value:
-        if attr_name not in attributes_map:
+        attribute = attributes_index.get(attr_name)
+        if attribute is None:
             raise ValueError("Unknown attribute name: %r" % (attr_name,))
-        attr_pk = attributes_map[attr_name]
-        attr_val_pk = values_map[attr_name].get(val_slug)
-        queries[attr_pk].append(attr_val_pk)
+        attr_val_pk = attribute.values.get(val_slug)
+        queries[attribute.pk].append(attr_val_pk)
 
     return queries
 
@@ -81,10 +76,9 @@ def filter_products_by_minimal_price(
 
 
 def filter_products_by_categories(qs, categories):
-    categories = [
-        category.get_descendants(include_self=True) for category in categories
-    ]
-    ids = {category.id for tree in categories for category in tree}
+    ids = categories_tree_cache.get_descendant_ids(
+        category.pk for category in categories
+    )
     return qs.filter(category__in=ids)
 
 
@@ -93,13 +87,10 @@ def filter_products_by_collections(qs, collections):
 
 
 def filter_products_by_stock_availability(qs, stock_availability):
-    qs = qs.annotate(
-        total_available=Sum("variants__quantity") - Sum("variants__quantity_allocated")
-    )
     if stock_availability == StockAvailability.IN_STOCK:
-        qs = qs.filter(total_available__gt=0)
+        qs = qs.filter(quantity_available__gt=0)
     elif stock_availability == StockAvailability.OUT_OF_STOCK:
-        qs = qs.filter(total_available__lte=0)
+        qs = qs.filter(quantity_available__lte=0)
     return qs
 
 
@@ -151,7 +142,8 @@ def filter_stock_availability(qs, _, value):
 def filter_search(qs, _, value):
     if value:
         search = picker.pick_backend()
-        qs &= search(value).distinct()
+        # Keep the ordering requested by the client instead of the ranking
+        qs &= search(value).order_by().distinct()
     return qs
 
 
@@ -187,12 +179,11 @@ def filter_attributes_by_product_types(qs, field, value):
         category_id = from_global_id_strict_type(
             value, only_type="Category", field=field
         )
-        category = Category.objects.filter(pk=category_id).first()
+        tree = categories_tree_cache.get_descendant_ids([category_id])
 
-        if category is None:
+        if not tree:
             return qs.none()
 
-        tree = category.get_descendants(include_self=True)
         product_qs = Product.objects.filter(category__in=tree)
 
     elif field == "in_collection":
@@ -3,15 +3,15 @@ from django.db.models import Sum
 from graphql import GraphQLError
 from graphql_relay import from_global_id
 
-from ...order import OrderStatus
+from ...order.sales import get_sales_date
 from ...product import models
 from ...search.backends import picker
 from ..core.enums import OrderDirection
 from ..utils import (
-    filter_by_period,
     filter_by_query_param,
     get_database_id,
     get_nodes,
+    reporting_period_to_date,
     sort_queryset,
 )
 from .filters import (
@@ -143,11 +143,12 @@ def resolve_products(
 
     user = info.context.user
     qs = models.Product.objects.visible_to_user(user)
-    qs = sort_products(qs, sort_by)
 
     if query:
         search = picker.pick_backend()
+        # Found products are ordered by their rank unless sorted otherwise
         qs &= search(query)
+    qs = sort_products(qs, sort_by)
 
     if attributes:
         qs = filter_products_by_attributes(qs, attributes)
@@ -194,16 +195,12 @@ def resolve_product_variants(info, ids=None):
 
 def resolve_report_product_sales(period):
     qs = models.ProductVariant.objects.prefetch_related(
-        "product", "product__images", "order_lines__order"
+        "product", "product__images"
     ).all()
 
-    # exclude draft and canceled orders
-    exclude_status = [OrderStatus.DRAFT, OrderStatus.CANCELED]
-    qs = qs.exclude(order_lines__order__status__in=exclude_status)
-
-    # filter by period
-    qs = filter_by_period(qs, period, "order_lines__order__created")
+    # filter by period, daily sales don't include draft and canceled orders
+    start_date = get_sales_date(reporting_period_to_date(period))
+    qs = qs.filter(daily_sales__date__gte=start_date)
 
-    qs = qs.annotate(quantity_ordered=Sum("order_lines__quantity"))
-    qs = qs.filter(quantity_ordered__isnull=False)
+    qs = qs.annotate(quantity_ordered=Sum("daily_sales__quantity"))
     return qs.order_by("-quantity_ordered")
@@ -8,8 +8,10 @@ from django.db.models import Prefetch
 from graphene import relay
 from graphene_federation import key
 from graphql.error import GraphQLError
+from promise import Promise
 
 from ....product import models
+from ....product.cache import categories_tree_cache
 from ....product.templatetags.product_images import (
     get_product_image_thumbnail,
     get_thumbnail,
@@ -34,7 +36,14 @@ from ...core.types import (
     TaxType,
 )
 from ...decorators import permission_required
+from ...translations.dataloaders import (
+    CategoryTranslationByIdAndLanguageCodeLoader,
+    CollectionTranslationByIdAndLanguageCodeLoader,
+    ProductTranslationByIdAndLanguageCodeLoader,
+    ProductVariantTranslationByIdAndLanguageCodeLoader,
+)
 from ...translations.fields import TranslationField
+from ...translations.resolvers import get_translation_resolver
 from ...translations.types import (
     CategoryTranslation,
     CollectionTranslation,
@@ -42,6 +51,19 @@ from ...translations.types import (
     ProductVariantTranslation,
 )
 from ...utils import get_database_id, reporting_period_to_date
+from ..dataloaders import (
+    AssignedProductAttributesByProductIdLoader,
+    AssignedVariantAttributesByProductVariantIdLoader,
+    AttributeProductsByProductTypeIdLoader,
+    AttributeVariantsByProductTypeIdLoader,
+    CollectionsByProductIdLoader,
+    ImagesByProductIdLoader,
+    ImagesByProductVariantIdLoader,
+    ProductByIdLoader,
+    ProductVariantsByProductIdLoader,
+    ProductVariantWithPricingRelationsLoader,
+    ProductWithPricingRelationsLoader,
+)
 from ..filters import AttributeFilterInput
 from ..resolvers import resolve_attributes
 from .attributes import Attribute, SelectedAttribute
@@ -75,57 +97,32 @@ def prefetch_products_collection_sorted(info, *_args, **_kwargs):
     )
 
 
-def resolve_attribute_list(
-    instance: Union[models.Product, models.ProductVariant], *, user
+def resolve_selected_attributes(
+    attribute_assignments: List[
+        Union[models.AttributeProduct, models.AttributeVariant]
+    ],
+    assigned_attributes: List[
+        Union[models.AssignedProductAttribute, models.AssignedVariantAttribute]
+    ],
 ) -> List[SelectedAttribute]:
-    """Resolve attributes from a product into a list of `SelectedAttribute`s.
+    """Resolve attributes of a product type into a list of `SelectedAttribute`s.
 
-    Note: you have to prefetch the below M2M fields.
-        - product_type -> attribute[rel] -> [rel]assignments -> values
-        - product_type -> attribute[rel] -> attribute
+    Values are taken from the attributes assigned to a product or a variant, an
+    attribute without an assignment is resolved with an empty QuerySet.
     """
-    resolved_attributes = []
-    attributes_qs = None
-
-    # Retrieve the product type
-    if isinstance(instance, models.Product):
-        product_type = instance.product_type
-        product_type_attributes_assoc_field = "attributeproduct"
-        assigned_attribute_instance_field = "productassignments"
-        assigned_attribute_instance_filters = {"product_id": instance.pk}
-        if hasattr(product_type, "storefront_attributes"):
-            attributes_qs = product_type.storefront_attributes
-    elif isinstance(instance, models.ProductVariant):
-        product_type = instance.product.product_type
-        product_type_attributes_assoc_field = "attributevariant"
-        assigned_attribute_instance_field = "variantassignments"
-        assigned_attribute_instance_filters = {"variant_id": instance.pk}
-    else:
-        raise AssertionError(f"{instance.__class__.__name__} is unsupported")
-
-    # Retrieve all the product attributes assigned to this product type
-    if not attributes_qs:
-        attributes_qs = getattr(product_type, product_type_attributes_assoc_field)
-        attributes_qs = attributes_qs.get_visible_to_user(user)
-
+    assigned_attribute_map = {
+        assigned_attribute.assignment_id: assigned_attribute
+        for assigned_attribute in assigned_attributes
+    }
     # An empty QuerySet for unresolved values
     empty_qs = models.AttributeValue.objects.none()
 
-    # Goes through all the attributes assigned to the product type
-    # The assigned values are returned as a QuerySet, but will assign a
-    # dummy empty QuerySet if no values are assigned to the given instance.
-    for attr_data_rel in attributes_qs:
-        attr_instance_data = getattr(attr_data_rel, assigned_attribute_instance_field)
-
-        # Retrieve the instance's associated data
-        attr_data = attr_instance_data.filter(**assigned_attribute_instance_filters)
-        attr_data = attr_data.first()
-
-        # Return the instance's attribute values if the assignment was found,
-        # otherwise it sets the values as an empty QuerySet
-        values = attr_data.values.all() if attr_data is not None else empty_qs
+    resolved_attributes = []
+    for attribute_assignment in attribute_assignments:
+        assigned_attribute = assigned_attribute_map.get(attribute_assignment.pk)
+        values = assigned_attribute.values.all() if assigned_attribute else empty_qs
         resolved_attributes.append(
-            SelectedAttribute(attribute=attr_data_rel.attribute, values=values)
+            SelectedAttribute(attribute=attribute_assignment.attribute, values=values)
         )
     return resolved_attributes
 
@@ -236,12 +233,10 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
     is_available = graphene.Boolean(
         description="Whether the variant is in stock and visible or not."
     )
-    attributes = gql_optimizer.field(
-        graphene.List(
-            graphene.NonNull(SelectedAttribute),
-            required=True,
-            description="List of attributes assigned to this variant.",
-        )
+    attributes = graphene.List(
+        graphene.NonNull(SelectedAttribute),
+        required=True,
+        description="List of attributes assigned to this variant.",
     )
     cost_price = graphene.Field(Money, description="Cost price of the variant.")
     margin = graphene.Int(description="Gross margin percentage value.")
@@ -255,14 +250,15 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
             "optimizations suitable for such calculations."
         ),
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product variant."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product variant."
     )
     translation = TranslationField(
-        ProductVariantTranslation, type_name="product variant"
+        ProductVariantTranslation,
+        type_name="product variant",
+        resolver=get_translation_resolver(
+            ProductVariantTranslationByIdAndLanguageCodeLoader
+        ),
     )
     digital_content = gql_optimizer.field(
         graphene.Field(
@@ -298,11 +294,19 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
         return min(exact_quantity_available, settings.MAX_CHECKOUT_LINE_QUANTITY)
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=["attributes__values", "attributes__assignment__attribute"]
-    )
     def resolve_attributes(root: models.ProductVariant, info):
-        return resolve_attribute_list(root, user=info.context.user)
+        def with_product(product):
+            attribute_variants = AttributeVariantsByProductTypeIdLoader(
+                info.context
+            ).load(product.product_type_id)
+            assigned_attributes = AssignedVariantAttributesByProductVariantIdLoader(
+                info.context
+            ).load(root.id)
+            return Promise.all([attribute_variants, assigned_attributes]).then(
+                lambda data: resolve_selected_attributes(*data)
+            )
+
+        return ProductByIdLoader(info.context).load(root.product_id).then(with_product)
 
     @staticmethod
     @permission_required("product.manage_products")
@@ -319,25 +323,34 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
         return root.base_price
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("product",), only=["price_override_amount", "currency"]
-    )
     def resolve_pricing(root: models.ProductVariant, info):
         context = info.context
-        availability = get_variant_availability(
-            root,
-            context.discounts,
-            context.country,
-            context.currency,
-            extensions=context.extensions,
+
+        def calculate_pricing(variant):
+            availability = get_variant_availability(
+                variant,
+                context.discounts,
+                context.country,
+                context.currency,
+                extensions=context.extensions,
+            )
+            return VariantPricingInfo(**asdict(availability))
+
+        return (
+            ProductVariantWithPricingRelationsLoader(context)
+            .load(root)
+            .then(calculate_pricing)
         )
-        return VariantPricingInfo(**asdict(availability))
 
     resolve_availability = resolve_pricing
 
     @staticmethod
-    def resolve_is_available(root: models.ProductVariant, _info):
-        return root.is_available
+    def resolve_is_available(root: models.ProductVariant, info):
+        return (
+            ProductVariantWithPricingRelationsLoader(info.context)
+            .load(root)
+            .then(lambda variant: variant.is_available)
+        )
 
     @staticmethod
     @permission_required("product.manage_products")
@@ -368,8 +381,8 @@ class ProductVariant(CountableDjangoObjectType, MetadataObjectType):
         return calculate_revenue_for_variant(root, start_date)
 
     @staticmethod
-    def resolve_images(root: models.ProductVariant, *_args):
-        return root.images.all()
+    def resolve_images(root: models.ProductVariant, info, *_args):
+        return ImagesByProductVariantIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, id):
@@ -451,23 +464,20 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         id=graphene.Argument(graphene.ID, description="ID of a product image."),
         description="Get a single product image by ID.",
     )
-    variants = gql_optimizer.field(
-        graphene.List(ProductVariant, description="List of variants for the product."),
-        model_field="variants",
+    variants = graphene.List(
+        ProductVariant, description="List of variants for the product."
     )
-    images = gql_optimizer.field(
-        graphene.List(
-            lambda: ProductImage, description="List of images for the product."
-        ),
-        model_field="images",
+    images = graphene.List(
+        lambda: ProductImage, description="List of images for the product."
     )
-    collections = gql_optimizer.field(
-        graphene.List(
-            lambda: Collection, description="List of collections for the product."
-        ),
-        model_field="collections",
+    collections = graphene.List(
+        lambda: Collection, description="List of collections for the product."
+    )
+    translation = TranslationField(
+        ProductTranslation,
+        type_name="product",
+        resolver=get_translation_resolver(ProductTranslationByIdAndLanguageCodeLoader),
     )
-    translation = TranslationField(ProductTranslation, type_name="product")
 
     slug = graphene.String(required=True, description="The slug of a product.")
 
@@ -497,41 +507,54 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         return TaxType(tax_code=tax_data.code, description=tax_data.description)
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related="images")
     def resolve_thumbnail(root: models.Product, info, *, size=255):
-        image = root.get_first_image()
-        if image:
-            url = get_product_image_thumbnail(image, size, method="thumbnail")
-            alt = image.alt
-            return Image(alt=alt, url=info.context.build_absolute_uri(url))
-        return None
+        def return_first_thumbnail(images):
+            if images:
+                image = images[0]
+                url = get_product_image_thumbnail(image, size, method="thumbnail")
+                alt = image.alt
+                return Image(alt=alt, url=info.context.build_absolute_uri(url))
+            return None
+
+        return (
+            ImagesByProductIdLoader(info.context)
+            .load(root.id)
+            .then(return_first_thumbnail)
+        )
 
     @staticmethod
     def resolve_url(root: models.Product, *_args):
         return root.get_absolute_url()
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("variants", "collections"),
-        only=["publication_date", "charge_taxes", "price_amount", "currency", "meta"],
-    )
     def resolve_pricing(root: models.Product, info):
         context = info.context
-        availability = get_product_availability(
-            root,
-            context.discounts,
-            context.country,
-            context.currency,
-            context.extensions,
+
+        def calculate_pricing(product):
+            availability = get_product_availability(
+                product,
+                context.discounts,
+                context.country,
+                context.currency,
+                context.extensions,
+            )
+            return ProductPricingInfo(**asdict(availability))
+
+        return (
+            ProductWithPricingRelationsLoader(context)
+            .load(root)
+            .then(calculate_pricing)
         )
-        return ProductPricingInfo(**asdict(availability))
 
     resolve_availability = resolve_pricing
 
     @staticmethod
-    @gql_optimizer.resolver_hints(prefetch_related=("variants"))
-    def resolve_is_available(root: models.Product, _info):
-        return root.is_available
+    def resolve_is_available(root: models.Product, info):
+        return (
+            ProductWithPricingRelationsLoader(info.context)
+            .load(root)
+            .then(lambda product: product.is_available)
+        )
 
     @staticmethod
     @permission_required("product.manage_products")
@@ -539,31 +562,31 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
         return root.price
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=("variants", "collections"),
-        only=["publication_date", "charge_taxes", "price_amount", "currency", "meta"],
-    )
     def resolve_price(root: models.Product, info):
-        price_range = root.get_price_range(info.context.discounts)
-        price = info.context.extensions.apply_taxes_to_product(
-            root, price_range.start, info.context.country
+        context = info.context
+
+        def calculate_price(product):
+            price_range = product.get_price_range(context.discounts)
+            price = context.extensions.apply_taxes_to_product(
+                product, price_range.start, context.country
+            )
+            return price.net
+
+        return (
+            ProductWithPricingRelationsLoader(context).load(root).then(calculate_price)
         )
-        return price.net
 
     @staticmethod
-    @gql_optimizer.resolver_hints(
-        prefetch_related=[
-            Prefetch(
-                "product_type__attributeproduct",
-                queryset=models.AttributeProduct.objects.filter(
-                    attribute__visible_in_storefront=True
-                ).prefetch_related("productassignments__values", "attribute"),
-                to_attr="storefront_attributes",
-            )
-        ]
-    )
     def resolve_attributes(root: models.Product, info):
-        return resolve_attribute_list(root, user=info.context.user)
+        attribute_products = AttributeProductsByProductTypeIdLoader(info.context).load(
+            root.product_type_id
+        )
+        assigned_attributes = AssignedProductAttributesByProductIdLoader(
+            info.context
+        ).load(root.id)
+        return Promise.all([attribute_products, assigned_attributes]).then(
+            lambda data: resolve_selected_attributes(*data)
+        )
 
     @staticmethod
     @permission_required("product.manage_products")
@@ -586,17 +609,16 @@ class Product(CountableDjangoObjectType, MetadataObjectType):
             raise GraphQLError("Product image not found.")
 
     @staticmethod
-    @gql_optimizer.resolver_hints(model_field="images")
-    def resolve_images(root: models.Product, *_args, **_kwargs):
-        return root.images.all()
+    def resolve_images(root: models.Product, info, *_args, **_kwargs):
+        return ImagesByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_variants(root: models.Product, *_args, **_kwargs):
-        return root.variants.all()
+    def resolve_variants(root: models.Product, info, *_args, **_kwargs):
+        return ProductVariantsByProductIdLoader(info.context).load(root.id)
 
     @staticmethod
-    def resolve_collections(root: models.Product, *_args):
-        return root.collections.all()
+    def resolve_collections(root: models.Product, info, *_args):
+        return CollectionsByProductIdLoader(info.context).load(root.id)
 
     @classmethod
     def get_node(cls, info, pk):
@@ -727,7 +749,13 @@ class Collection(CountableDjangoObjectType, MetadataObjectType):
     background_image = graphene.Field(
         Image, size=graphene.Int(description="Size of the image.")
     )
-    translation = TranslationField(CollectionTranslation, type_name="collection")
+    translation = TranslationField(
+        CollectionTranslation,
+        type_name="collection",
+        resolver=get_translation_resolver(
+            CollectionTranslationByIdAndLanguageCodeLoader
+        ),
+    )
 
     class Meta:
         description = "Represents a collection of products."
@@ -804,7 +832,11 @@ class Category(CountableDjangoObjectType, MetadataObjectType):
     background_image = graphene.Field(
         Image, size=graphene.Int(description="Size of the image.")
     )
-    translation = TranslationField(CategoryTranslation, type_name="category")
+    translation = TranslationField(
+        CategoryTranslation,
+        type_name="category",
+        resolver=get_translation_resolver(CategoryTranslationByIdAndLanguageCodeLoader),
+    )
 
     class Meta:
         description = (
@@ -861,7 +893,7 @@ class Category(CountableDjangoObjectType, MetadataObjectType):
 
         # Otherwise we want to include products from child categories which
         # requires performing additional logic.
-        tree = root.get_descendants(include_self=True)
+        tree = categories_tree_cache.get_descendant_ids([root.pk])
         qs = models.Product.objects.published()
         qs = qs.filter(category__in=tree)
         return gql_optimizer.query(qs, info)
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument
+
+PERSISTED_QUERY_CACHE_KEY = "graphql_persisted_query_"
+PERSISTED_QUERY_VERSION = 1
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class PersistedQueryNotFound(Exception):
+    """Raised when a client sends a hash of a query unknown to the server.
+
+    The message is part of the automatic persisted queries protocol; clients
+    react to it by sending the full query along with its hash.
+    """
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryError(Exception):
+    """Raised when a persisted query request is malformed."""
+
+
+class DocumentCache:
+    """Bounded, thread-safe LRU cache of parsed and validated documents.
+
+    Documents are immutable once validated, so they can be shared between
+    requests and threads. A `maxsize` of zero disables the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[Hashable, GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, key: Hashable) -> Optional[GraphQLDocument]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, key: Hashable, document: GraphQLDocument):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._documents))
+
+
+document_cache = DocumentCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_hash(extensions) -> Optional[str]:
+    """Return the SHA-256 hash of a persisted query sent in request extensions.
+
+    Follows the Apollo automatic persisted queries protocol, where clients
+    send `{"persistedQuery": {"version": 1, "sha256Hash": "..."}}`.
+    """
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise PersistedQueryError("Persisted query hash is missing.")
+    return query_hash
+
+
+def get_persisted_query(query_hash: str) -> Optional[str]:
+    return cache.get(PERSISTED_QUERY_CACHE_KEY + query_hash)
+
+
+def persist_query(query_hash: str, query: str):
+    if get_query_hash(query) != query_hash:
+        raise PersistedQueryError("Provided sha256 hash does not match the query.")
+    cache.set(
+        PERSISTED_QUERY_CACHE_KEY + query_hash,
+        query,
+        settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT,
+    )
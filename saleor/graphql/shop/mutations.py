@@ -16,6 +16,17 @@ from ..product.types import Collection
 from .types import AuthorizationKey, AuthorizationKeyType, Shop
 
 
+def get_site_settings_for_update(info) -> site_models.SiteSettings:
+    """Return the settings of the current site read from the database.
+
+    The site of the request is a copy kept by the cache of sites, mutations
+    change a fresh instance and set it on the request once it's saved.
+    """
+    return site_models.SiteSettings.objects.select_related("company_address").get(
+        pk=info.context.site.settings.pk
+    )
+
+
 class ShopSettingsInput(graphene.InputObjectType):
     header_text = graphene.String(description="Header text.")
     description = graphene.String(description="SEO description.")
@@ -88,12 +99,13 @@ class ShopSettingsUpdate(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        instance = info.context.site.settings
+        instance = get_site_settings_for_update(info)
         data = data.get("input")
         cleaned_input = cls.clean_input(info, instance, data)
         instance = cls.construct_instance(instance, cleaned_input)
         cls.clean_instance(instance)
         instance.save()
+        info.context.site.settings = instance
         return ShopSettingsUpdate(shop=Shop())
 
 
@@ -114,7 +126,7 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        site_settings = info.context.site.settings
+        site_settings = get_site_settings_for_update(info)
         data = data.get("input")
 
         if data:
@@ -129,6 +141,8 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
         else:
             if site_settings.company_address:
                 site_settings.company_address.delete()
+                site_settings.company_address = None
+        info.context.site.settings = site_settings
         return ShopAddressUpdate(shop=Shop())
 
 
@@ -197,10 +211,11 @@ class HomepageCollectionUpdate(BaseMutation):
         new_collection = cls.get_node_or_error(
             info, collection, field="collection", only_type=Collection
         )
-        site_settings = info.context.site.settings
+        site_settings = get_site_settings_for_update(info)
         site_settings.homepage_collection = new_collection
         cls.clean_instance(site_settings)
         site_settings.save(update_fields=["homepage_collection"])
+        info.context.site.settings = site_settings
         return HomepageCollectionUpdate(shop=Shop())
 
 
@@ -8,7 +8,7 @@ from phonenumbers import COUNTRY_CODE_TO_REGION_CODE
 from ...account import models as account_models
 from ...core.permissions import get_permissions
 from ...core.utils import get_client_ip, get_country_by_ip
-from ...menu import models as menu_models
+from ...menu.cache import menus_cache
 from ...product import models as product_models
 from ...site import models as site_models
 from ..account.types import Address, StaffNotificationRecipient
@@ -227,9 +227,8 @@ class Shop(graphene.ObjectType):
     @staticmethod
     def resolve_navigation(_, info):
         site_settings = info.context.site.settings
-        qs = menu_models.Menu.objects.all()
-        top_menu = get_node_optimized(qs, {"pk": site_settings.top_menu_id}, info)
-        bottom_menu = get_node_optimized(qs, {"pk": site_settings.bottom_menu_id}, info)
+        top_menu = menus_cache.get(site_settings.top_menu_id)
+        bottom_menu = menus_cache.get(site_settings.bottom_menu_id)
         return Navigation(main=top_menu, secondary=bottom_menu)
 
     @staticmethod
@@ -0,0 +1,65 @@
+from ...product.models import (
+    CategoryTranslation,
+    CollectionTranslation,
+    ProductTranslation,
+    ProductVariantTranslation,
+)
+from ..core.dataloaders import DataLoader
+
+
+class BaseTranslationByIdAndLanguageCodeLoader(DataLoader):
+    """Load translations by pairs of a translated object's ID and a language code.
+
+    Subclasses define the translation `model` and the name of its foreign key to
+    the translated object.
+    """
+
+    model = None
+    relation_name = None
+
+    def batch_load(self, keys):
+        object_ids = {object_id for object_id, _ in keys}
+        language_codes = {language_code for _, language_code in keys}
+        translations = self.model.objects.filter(
+            **{
+                f"{self.relation_name}_id__in": object_ids,
+                "language_code__in": language_codes,
+            }
+        )
+        translation_map = {}
+        for translation in translations.iterator():
+            object_id = getattr(translation, f"{self.relation_name}_id")
+            translation_map[(object_id, translation.language_code)] = translation
+        return [translation_map.get(key) for key in keys]
+
+
+class CategoryTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "category_translation_by_id_and_language_code"
+    model = CategoryTranslation
+    relation_name = "category"
+
+
+class CollectionTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "collection_translation_by_id_and_language_code"
+    model = CollectionTranslation
+    relation_name = "collection"
+
+
+class ProductTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "product_translation_by_id_and_language_code"
+    model = ProductTranslation
+    relation_name = "product"
+
+
+class ProductVariantTranslationByIdAndLanguageCodeLoader(
+    BaseTranslationByIdAndLanguageCodeLoader
+):
+    context_key = "productvariant_translation_by_id_and_language_code"
+    model = ProductVariantTranslation
+    relation_name = "product_variant"
@@ -9,6 +9,15 @@ def resolve_translation(instance, _info, language_code):
     return instance.translations.filter(language_code=language_code).first()
 
 
+def get_translation_resolver(loader_class):
+    """Return a translation resolver which loads translations in bulk."""
+
+    def _resolve_translation(instance, info, language_code):
+        return loader_class(info.context).load((instance.pk, language_code))
+
+    return _resolve_translation
+
+
 def resolve_shipping_methods(info):
     qs = shipping_models.ShippingMethod.objects.all()
     return gql_optimizer.query(qs, info)
@@ -1,12 +1,14 @@
 import json
 import logging
 import traceback
+from typing import Optional
 
 from django.conf import settings
 from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render_to_response
 from django.urls import reverse
 from django.utils.functional import SimpleLazyObject
+from django.utils.translation import get_language
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
@@ -17,8 +19,20 @@ from graphql.error import (
     format_error as format_graphql_error,
 )
 from graphql.execution import ExecutionResult
+from graphql.validation import validate
 from graphql_jwt.exceptions import PermissionDenied
 
+from .batch import get_batch_executor, get_operation_context, run_in_worker
+from .query_cache import (
+    PersistedQueryError,
+    PersistedQueryNotFound,
+    document_cache,
+    get_persisted_query,
+    get_persisted_query_hash,
+    get_query_hash,
+    persist_query,
+)
+
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
@@ -33,6 +47,8 @@ class GraphQLView(View):
     # - file upload (https://github.com/lmcgartland/graphene-file-upload)
     # - query batching
     # - CORS
+    # - caching of parsed documents and automatic persisted queries (see
+    # https://github.com/apollographql/apollo-link-persisted-queries)
 
     schema = None
     executor = None
@@ -40,7 +56,12 @@ class GraphQLView(View):
     middleware = None
     root_value = None
 
-    HANDLED_EXCEPTIONS = (GraphQLError, PermissionDenied)
+    HANDLED_EXCEPTIONS = (
+        GraphQLError,
+        PermissionDenied,
+        PersistedQueryError,
+        PersistedQueryNotFound,
+    )
 
     def __init__(
         self, schema=None, executor=None, middleware=None, root_value=None, backend=None
@@ -90,15 +111,68 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            responses = self.get_batch_responses(request, data)
             result = [response for response, code in responses]
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
         return JsonResponse(data=result, status=status_code, safe=False)
 
-    def get_response(self, request: HttpRequest, data: dict):
-        execution_result = self.execute_graphql_request(request, data)
+    def get_batch_responses(self, request: HttpRequest, data: list):
+        """Execute a batch of operations and return responses in request order.
+
+        When enabled with `GRAPHQL_BATCH_MAX_WORKERS`, consecutive read-only
+        operations run concurrently in a thread pool. Any other operation acts
+        as a barrier: it runs in the request thread only after all preceding
+        operations have finished, so mutations keep their order and their
+        effects are visible to the operations that follow them.
+        """
+        executor = get_batch_executor()
+        if executor is None or len(data) < 2:
+            return [
+                self.get_response(get_operation_context(request), entry)
+                for entry in data
+            ]
+
+        language = get_language()
+        responses = [None] * len(data)
+        pending = []
+        for index, entry in enumerate(data):
+            context = get_operation_context(request)
+            document = self.get_read_only_document(request, entry)
+            if document is not None:
+                future = executor.submit(
+                    run_in_worker, self.get_response, language, context, entry, document
+                )
+                pending.append((index, future))
+                continue
+            for pending_index, future in pending:
+                responses[pending_index] = future.result()
+            pending = []
+            responses[index] = self.get_response(context, entry)
+        for pending_index, future in pending:
+            responses[pending_index] = future.result()
+        return responses
+
+    def get_read_only_document(
+        self, request: HttpRequest, data: dict
+    ) -> Optional[GraphQLDocument]:
+        """Return the parsed document of the operation if it's a query."""
+        if not isinstance(data, dict):
+            return None
+        _, _, operation_name = self.get_graphql_params(request, data)
+        document, error = self.get_document(request, data)
+        if error or document.get_operation_type(operation_name) != "query":
+            return None
+        return document
+
+    def get_response(
+        self,
+        request: HttpRequest,
+        data: dict,
+        document: Optional[GraphQLDocument] = None,
+    ):
+        execution_result = self.execute_graphql_request(request, data, document)
         status_code = 200
         if execution_result:
             response = {}
@@ -124,6 +198,9 @@ class GraphQLView(View):
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
         Otherwise, it returns the parsed gql document.
+
+        Valid documents are cached by the hash of the query, so repeated
+        queries skip both parsing and validation.
         """
         if not query or not isinstance(query, str):
             return (
@@ -133,18 +210,75 @@ class GraphQLView(View):
                 ),
             )
 
+        cache_key = (self.schema, get_query_hash(query))
+        document = document_cache.get(cache_key)
+        if document is not None:
+            return document, None
+
         # Attempt to parse the query, if it fails, return the error
         try:
-            return self.backend.document_from_string(self.schema, query), None
+            document = self.backend.document_from_string(self.schema, query)
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
-    def execute_graphql_request(self, request: HttpRequest, data: dict):
-        query, variables, operation_name = self.get_graphql_params(request, data)
+        validation_errors = validate(self.schema, document.document_ast)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+
+        document_cache.set(cache_key, document)
+        return document, None
+
+    @staticmethod
+    def get_persisted_query(query: str, data: dict) -> (str, ExecutionResult):
+        """Resolve the query text of an automatic persisted query.
+
+        Clients may send only the SHA-256 hash of a query they have already
+        registered. Sending both the query and its hash registers the query.
+        """
+        extensions = data.get("extensions")
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                extensions = None
+
+        try:
+            query_hash = get_persisted_query_hash(extensions)
+            if not query_hash:
+                return query, None
+            if query:
+                persist_query(query_hash, query)
+                return query, None
+        except PersistedQueryError as e:
+            return None, ExecutionResult(errors=[e], invalid=True)
+
+        query = get_persisted_query(query_hash)
+        if query is None:
+            return None, ExecutionResult(errors=[PersistedQueryNotFound()])
+        return query, None
 
-        document, error = self.parse_query(query)
+    def get_document(
+        self, request: HttpRequest, data: dict
+    ) -> (GraphQLDocument, ExecutionResult):
+        query, _, _ = self.get_graphql_params(request, data)
+        query, error = self.get_persisted_query(query, data)
         if error:
-            return error
+            return None, error
+        return self.parse_query(query)
+
+    def execute_graphql_request(
+        self,
+        request: HttpRequest,
+        data: dict,
+        document: Optional[GraphQLDocument] = None,
+    ):
+        """Execute the operation, using the document if it was already parsed."""
+        _, variables, operation_name = self.get_graphql_params(request, data)
+
+        if document is None:
+            document, error = self.get_document(request, data)
+            if error:
+                return error
 
         extra_options = {}
         if self.executor:
@@ -158,6 +292,7 @@ class GraphQLView(View):
                 operation_name=operation_name,
                 context=request,
                 middleware=self.middleware,
+                validate=False,
                 **extra_options,
             )
         except Exception as e:
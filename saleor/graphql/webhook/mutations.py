@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
+from ...webhook.signals import invalidate_webhooks
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
 from .enums import WebhookEventTypeEnum
@@ -91,6 +92,8 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        # Bulk creation doesn't send signals
+        invalidate_webhooks()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -143,6 +146,8 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+            # Bulk creation doesn't send signals
+            invalidate_webhooks()
 
 
 class WebhookDelete(ModelDeleteMutation):
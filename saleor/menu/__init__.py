@@ -0,0 +1 @@
+default_app_config = "saleor.menu.apps.MenuAppConfig"
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MenuAppConfig(AppConfig):
+    name = "saleor.menu"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,45 @@
+from typing import Dict, Optional
+
+from ..core.cache import VersionedCache, copy_cached
+from .models import Menu
+from .utils import build_menu_items_tree
+
+MENUS_CACHE_KEY = "menus_"
+MENUS_VERSION_CACHE_KEY = "menus_version"
+
+
+def build_menus() -> Dict[int, Menu]:
+    """Return menus by pks with the trees of their items.
+
+    Top level items are set as `prefetched_items` of the menus, the same as
+    the ones prefetched by the GraphQL `Menu` type.
+    """
+    menus = list(Menu.objects.order_by("pk"))
+    top_items = build_menu_items_tree(menus)
+    for menu in menus:
+        menu.prefetched_items = top_items.get(menu.pk, [])
+    return {menu.pk: menu for menu in menus}
+
+
+class MenusCache(VersionedCache[Dict[int, Menu]]):
+    """Menus with the trees of their items shared by the processes.
+
+    The storefront's navigation doesn't query the database. Any change of
+    menus, their items with translations, or the categories, collections and
+    pages they link to invalidates the menus of all the processes. Every call
+    returns a separate copy of the menu, which can be changed safely.
+    """
+
+    def get(self, menu_id: Optional[int]) -> Optional[Menu]:
+        if menu_id is None:
+            return None
+        return copy_cached(self.get_all().get(menu_id))
+
+    def get_by_name(self, name: str) -> Optional[Menu]:
+        menu = next(
+            (menu for menu in self.get_all().values() if menu.name == name), None
+        )
+        return copy_cached(menu)
+
+
+menus_cache = MenusCache(MENUS_CACHE_KEY, MENUS_VERSION_CACHE_KEY, build_menus)
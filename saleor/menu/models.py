@@ -27,6 +27,15 @@ class Menu(models.Model):
         return self.name
 
 
+class MenuItemQueryset(models.QuerySet):
+    def bulk_update(self, objs, fields, batch_size=None):
+        super().bulk_update(objs, fields, batch_size=batch_size)
+
+        from .signals import invalidate_menus
+
+        invalidate_menus()
+
+
 class MenuItem(MPTTModel, SortableModel):
     menu = models.ForeignKey(Menu, related_name="items", on_delete=models.CASCADE)
     name = models.CharField(max_length=128)
@@ -44,7 +53,7 @@ class MenuItem(MPTTModel, SortableModel):
     )
     page = models.ForeignKey(Page, blank=True, null=True, on_delete=models.CASCADE)
 
-    objects = models.Manager()
+    objects = MenuItemQueryset.as_manager()
     tree = TreeManager()
     translated = TranslationProxy()
 
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from ..page.models import Page
+from ..product.models import Category, Collection
+from .cache import menus_cache
+from .models import Menu, MenuItem, MenuItemTranslation
+
+
+def update_menus_cache():
+    from .tasks import update_menus_cache_task
+
+    update_menus_cache_task.delay()
+
+
+def invalidate_menus(**_kwargs):
+    menus_cache.invalidate()
+    # Build the menus of the new version before they are requested
+    transaction.on_commit(update_menus_cache)
+
+
+def connect_signals():
+    """Keep the cached menus up to date with their items and linked objects."""
+    for model in [Menu, MenuItem, MenuItemTranslation, Category, Collection, Page]:
+        post_save.connect(invalidate_menus, sender=model)
+        post_delete.connect(invalidate_menus, sender=model)
@@ -0,0 +1,7 @@
+from ..celeryconf import app
+from .cache import menus_cache
+
+
+@app.task
+def update_menus_cache_task():
+    menus_cache.refresh()
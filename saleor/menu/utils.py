@@ -1,6 +1,9 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
 from django.db import transaction
 
-from ..menu.models import Menu
+from ..menu.models import Menu, MenuItem
 
 
 def get_menu_item_as_dict(menu_item):
@@ -18,22 +21,48 @@ def get_menu_item_as_dict(menu_item):
     return data
 
 
+def _set_prefetched_objects(instance, related_name, objs):
+    # The same as the cache set by "prefetch_related"
+    qs = getattr(instance, related_name).all()
+    qs._result_cache = objs
+    qs._prefetch_done = True
+    if not hasattr(instance, "_prefetched_objects_cache"):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[related_name] = qs
+
+
+def build_menu_items_tree(menus: Iterable[Menu]) -> Dict[int, List[MenuItem]]:
+    """Return top level items of the menus with all their descendants.
+
+    Items of all the menus are fetched with a single query, along with their
+    linked objects, and their translations with another one. Children, parents
+    and menus of the items are linked in memory, so reading them doesn't query
+    the database.
+    """
+    menus = {menu.pk: menu for menu in menus}
+    items = list(
+        MenuItem.objects.filter(menu_id__in=menus)
+        .select_related("category", "collection", "page")
+        .prefetch_related("translations")
+        .order_by("sort_order", "pk")
+    )
+    items_by_pk = {item.pk: item for item in items}
+    children: Dict[Optional[int], List[MenuItem]] = defaultdict(list)
+    for item in items:
+        children[item.parent_id].append(item)
+    top_items: Dict[int, List[MenuItem]] = defaultdict(list)
+    for item in items:
+        item.menu = menus[item.menu_id]
+        item.parent = items_by_pk.get(item.parent_id)
+        _set_prefetched_objects(item, "children", children[item.pk])
+        if item.parent_id is None:
+            top_items[item.menu_id].append(item)
+    return dict(top_items)
+
+
 def get_menu_as_json(menu):
     """Build a tree structure from top menu items, its children and grandchildren."""
-    top_items = menu.items.filter(parent=None).prefetch_related(
-        "category",
-        "page",
-        "collection",
-        "children__category",
-        "children__page",
-        "children__collection",
-        "children__children__category",
-        "children__children__page",
-        "children__children__collection",
-        "translations",
-        "children__translations",
-        "children__children__translations",
-    )
+    top_items = build_menu_items_tree([menu]).get(menu.pk, [])
     menu_data = []
     for item in top_items:
         top_item_data = get_menu_item_as_dict(item)
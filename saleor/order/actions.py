@@ -35,12 +35,10 @@ def order_created(order: "Order", user: "User", from_draft: bool = False):
 
 
 def handle_fully_paid_order(order: "Order"):
-    events.order_fully_paid_event(order=order)
+    customer_email = order.get_customer_email()
+    events.order_fully_paid_event(order=order, email_sent=bool(customer_email))
 
-    if order.get_customer_email():
-        events.email_sent_event(
-            order=order, user=None, email_type=events.OrderEventsEmails.PAYMENT
-        )
+    if customer_email:
         send_payment_confirmation.delay(order.pk)
 
         if utils.order_needs_automatic_fullfilment(order):
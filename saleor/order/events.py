@@ -28,14 +28,13 @@ def _get_payment_data(amount: Optional[Decimal], payment: Payment) -> Dict:
     }
 
 
-def email_sent_event(
+def _get_email_sent_event(
     *,
     order: Order,
     user: Optional[UserType],
     email_type: OrderEventsEmails,
     user_pk: int = None,
 ) -> OrderEvent:
-
     if user is not None and not user.is_anonymous:
         kwargs = {"user": user}
     elif user_pk:
@@ -43,7 +42,7 @@ def email_sent_event(
     else:
         kwargs = {}
 
-    return OrderEvent.objects.create(
+    return OrderEvent(
         order=order,
         type=OrderEvents.EMAIL_SENT,
         parameters={"email": order.get_customer_email(), "email_type": email_type},
@@ -51,6 +50,20 @@ def email_sent_event(
     )
 
 
+def email_sent_event(
+    *,
+    order: Order,
+    user: Optional[UserType],
+    email_type: OrderEventsEmails,
+    user_pk: int = None,
+) -> OrderEvent:
+    event = _get_email_sent_event(
+        order=order, user=user, email_type=email_type, user_pk=user_pk
+    )
+    event.save()
+    return event
+
+
 def email_resent_event(
     *, order: Order, user: UserType, email_type: OrderEventsEmails
 ) -> OrderEvent:
@@ -123,8 +136,22 @@ def order_manually_marked_as_paid_event(*, order: Order, user: UserType) -> Orde
     )
 
 
-def order_fully_paid_event(*, order: Order) -> OrderEvent:
-    return OrderEvent.objects.create(order=order, type=OrderEvents.ORDER_FULLY_PAID)
+def order_fully_paid_event(*, order: Order, email_sent: bool = False) -> OrderEvent:
+    """Create the event of the order being fully paid.
+
+    With `email_sent`, the event of the payment confirmation email sent to the
+    customer is created along with it, with a single query.
+    """
+    event = OrderEvent(order=order, type=OrderEvents.ORDER_FULLY_PAID)
+    order_events = [event]
+    if email_sent:
+        order_events.append(
+            _get_email_sent_event(
+                order=order, user=None, email_type=OrderEventsEmails.PAYMENT
+            )
+        )
+    OrderEvent.objects.bulk_create(order_events)
+    return event
 
 
 def payment_captured_event(
@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from tqdm import tqdm
+
+from ...models import Order
+from ...sales import DAILY_SALES_BATCH_DAYS, get_sales_date, update_daily_sales
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily sales of orders and variants from the orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            help="Rebuild the sales from the given day (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--batch-days",
+            type=int,
+            default=DAILY_SALES_BATCH_DAYS,
+            help="Number of days which sales are updated by a single query.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Updating daily sales of all the orders.")
+        created = Order.objects.aggregate(first=Min("created"), last=Max("created"))
+        if created["first"] is None:
+            return
+        start = get_sales_date(created["first"])
+        if options.get("start_date"):
+            start = max(start, options["start_date"])
+        end = get_sales_date(created["last"])
+        batch_days = options["batch_days"]
+        with tqdm(total=max((end - start).days + 1, 0)) as progress:
+            while start <= end:
+                dates = [
+                    start + timedelta(days=day)
+                    for day in range(min(batch_days, (end - start).days + 1))
+                ]
+                update_daily_sales(dates)
+                progress.update(len(dates))
+                progress.set_postfix(last_date=dates[-1].isoformat())
+                start = dates[-1] + timedelta(days=1)
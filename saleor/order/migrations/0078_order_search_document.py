@@ -0,0 +1,36 @@
+# Generated by Django 2.2.8 on 2026-10-18 05:39
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0077_auto_20191118_0606"),
+        # The trigram index requires the pg_trgm extension
+        ("product", "0037_auto_20171124_0847"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        # Index of the case insensitive lookup of emails, Django 2.2 can't declare
+        # indexes of expressions on models
+        migrations.RunSQL(
+            "CREATE INDEX order_user_email_upper "
+            "ON order_order (UPPER(user_email::text));",
+            "DROP INDEX order_user_email_upper;",
+        ),
+    ]
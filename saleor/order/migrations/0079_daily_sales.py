@@ -0,0 +1,89 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0113_product_attribute_sort_key"),
+        ("order", "0078_order_search_document"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="order",
+            name="created",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("currency", models.CharField(max_length=3)),
+                ("orders_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+            ],
+            options={
+                "ordering": ("date", "currency"),
+                "unique_together": {("date", "currency")},
+            },
+        ),
+        migrations.CreateModel(
+            name="VariantDailySales",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(db_index=True)),
+                ("currency", models.CharField(max_length=3)),
+                ("quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue_net_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "revenue_gross_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_sales",
+                        to="product.ProductVariant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date", "pk"),
+                "unique_together": {("variant", "currency", "date")},
+            },
+        ),
+    ]
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -59,9 +60,25 @@ class OrderQueryset(models.QuerySet):
         qs = qs.exclude(status={OrderStatus.DRAFT, OrderStatus.CANCELED})
         return qs.distinct()
 
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        """Insert each of the order instances into the database.
+
+        After the creation update the search documents of the orders.
+        """
+        orders = super().bulk_create(
+            objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+
+        from .search import update_orders_search_document
+
+        update_orders_search_document(
+            self.model.objects.filter(pk__in=[order.pk for order in orders if order.pk])
+        )
+        return orders
+
 
 class Order(ModelWithMetadata):
-    created = models.DateTimeField(default=now, editable=False)
+    created = models.DateTimeField(default=now, editable=False, db_index=True)
     status = models.CharField(
         max_length=32, default=OrderStatus.UNFULFILLED, choices=OrderStatus.CHOICES
     )
@@ -167,6 +184,8 @@ class Order(ModelWithMetadata):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    # Maintained by "order.search.update_orders_search_document"
+    search_document = models.TextField(blank=True, default="", editable=False)
     objects = OrderQueryset.as_manager()
 
     class Meta:
@@ -177,6 +196,13 @@ class Order(ModelWithMetadata):
                 pgettext_lazy("Permission description", "Manage orders."),
             ),
         )
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                name="order_search_gin",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
@@ -328,6 +354,35 @@ class Order(ModelWithMetadata):
 
 
 class OrderLineQueryset(models.QuerySet):
+    SALES_FIELDS = {
+        "variant",
+        "quantity",
+        "currency",
+        "unit_price_net_amount",
+        "unit_price_gross_amount",
+    }
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        """Insert each of the order line instances into the database.
+
+        After the creation update the daily sales of the orders.
+        """
+        lines = super().bulk_create(
+            objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
+        )
+
+        from .sales import update_daily_sales_of_lines
+
+        update_daily_sales_of_lines(lines)
+        return lines
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        super().bulk_update(objs, fields, batch_size=batch_size)
+        if self.SALES_FIELDS.intersection(fields):
+            from .sales import update_daily_sales_of_lines
+
+            update_daily_sales_of_lines(objs)
+
     def digital(self):
         """Return lines with digital products."""
         for line in self.all():
@@ -502,3 +557,67 @@ class OrderEvent(models.Model):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class DailySales(models.Model):
+    """Totals of the orders placed on a day, in one currency.
+
+    Draft and canceled orders aren't included. Days are in UTC, like the
+    reporting periods.
+    """
+
+    date = models.DateField()
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    orders_count = models.PositiveIntegerField(default=0)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total = TaxedMoneyField(
+        net_amount_field="total_net_amount",
+        gross_amount_field="total_gross_amount",
+        currency_field="currency",
+    )
+
+    class Meta:
+        ordering = ("date", "currency")
+        unique_together = (("date", "currency"),)
+
+
+class VariantDailySales(models.Model):
+    """Quantity and revenue of a variant sold on a day, in one currency.
+
+    Built from the lines of the same orders as `DailySales`.
+    """
+
+    date = models.DateField(db_index=True)
+    variant = models.ForeignKey(
+        "product.ProductVariant", related_name="daily_sales", on_delete=models.CASCADE
+    )
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    revenue_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    revenue = TaxedMoneyField(
+        net_amount_field="revenue_net_amount",
+        gross_amount_field="revenue_gross_amount",
+        currency_field="currency",
+    )
+
+    class Meta:
+        ordering = ("date", "pk")
+        unique_together = (("variant", "currency", "date"),)
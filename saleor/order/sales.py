@@ -0,0 +1,245 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from prices import Money, TaxedMoney
+
+from . import OrderStatus
+from .models import DailySales, Order, OrderLine, VariantDailySales
+
+# Orders which aren't included in the sales
+EXCLUDED_STATUSES = [OrderStatus.DRAFT, OrderStatus.CANCELED]
+
+# Number of days which sales are updated by a single query of the backfill
+DAILY_SALES_BATCH_DAYS = 30
+
+# First key of the advisory locks of the days, the second one is the day
+DAILY_SALES_LOCK_KEY = 22
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def get_sales_date(value: datetime) -> date:
+    """Return the day of the sales which the order created at the time is in."""
+    return value.astimezone(timezone.utc).date()
+
+
+def _sales_date(alias: str) -> str:
+    return f"({alias}.created AT TIME ZONE 'UTC')::date"
+
+
+def _sales_dates_filter(alias: str) -> str:
+    # The range of the creation times lets the database use the index
+    return f"""
+        {alias}.created >= %(start)s AND {alias}.created < %(end)s
+        AND {_sales_date(alias)} = ANY(%(dates)s::date[])
+    """
+
+
+def _get_dates_params(dates: List[date]) -> Dict[str, Any]:
+    start = datetime.combine(min(dates), time.min, tzinfo=timezone.utc)
+    end = datetime.combine(max(dates), time.min, tzinfo=timezone.utc)
+    return {
+        "dates": dates,
+        "start": start,
+        "end": end + timedelta(days=1),
+        "excluded_statuses": EXCLUDED_STATUSES,
+    }
+
+
+def update_orders_daily_sales(dates: Iterable[date]):
+    """Update the order totals of the days in a single query."""
+    dates = list(dates)
+    if not dates:
+        return
+    query = f"""
+        WITH sales AS (
+            SELECT
+                {_sales_date("o")} AS date,
+                o.currency,
+                COUNT(*) AS orders_count,
+                SUM(o.total_net_amount) AS total_net_amount,
+                SUM(o.total_gross_amount) AS total_gross_amount
+            FROM {_table(Order)} AS o
+            WHERE {_sales_dates_filter("o")}
+                AND NOT o.status = ANY(%(excluded_statuses)s)
+            GROUP BY 1, 2
+        ),
+        deleted AS (
+            DELETE FROM {_table(DailySales)} AS stale
+            WHERE stale.date = ANY(%(dates)s::date[])
+                AND NOT EXISTS (
+                    SELECT 1 FROM sales
+                    WHERE sales.date = stale.date AND sales.currency = stale.currency
+                )
+        )
+        INSERT INTO {_table(DailySales)} AS target (
+            date, currency, orders_count, total_net_amount, total_gross_amount
+        )
+        SELECT * FROM sales
+        ON CONFLICT (date, currency) DO UPDATE SET
+            orders_count = EXCLUDED.orders_count,
+            total_net_amount = EXCLUDED.total_net_amount,
+            total_gross_amount = EXCLUDED.total_gross_amount
+        WHERE (
+            target.orders_count, target.total_net_amount, target.total_gross_amount
+        ) IS DISTINCT FROM (
+            EXCLUDED.orders_count,
+            EXCLUDED.total_net_amount,
+            EXCLUDED.total_gross_amount
+        )
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, _get_dates_params(dates))
+
+
+def update_variants_daily_sales(
+    dates: Iterable[date], variant_ids: Optional[Iterable[int]] = None
+):
+    """Update the sales of the variants on the days in a single query.
+
+    Sales of all the variants sold on the days are updated when no variants
+    are given.
+    """
+    dates = list(dates)
+    if not dates:
+        return
+    params = _get_dates_params(dates)
+    variants_filter = ""
+    if variant_ids is not None:
+        params["variant_ids"] = [pk for pk in variant_ids if pk is not None]
+        if not params["variant_ids"]:
+            return
+        variants_filter = "AND {alias}.variant_id = ANY(%(variant_ids)s)"
+    query = f"""
+        WITH sales AS (
+            SELECT
+                {_sales_date("o")} AS date,
+                line.variant_id,
+                line.currency,
+                SUM(line.quantity) AS quantity,
+                SUM(line.unit_price_net_amount * line.quantity) AS revenue_net_amount,
+                SUM(line.unit_price_gross_amount * line.quantity)
+                    AS revenue_gross_amount
+            FROM {_table(OrderLine)} AS line
+            JOIN {_table(Order)} AS o ON o.id = line.order_id
+            WHERE {_sales_dates_filter("o")}
+                AND NOT o.status = ANY(%(excluded_statuses)s)
+                AND line.variant_id IS NOT NULL
+                {variants_filter.format(alias="line")}
+            GROUP BY 1, 2, 3
+        ),
+        deleted AS (
+            DELETE FROM {_table(VariantDailySales)} AS stale
+            WHERE stale.date = ANY(%(dates)s::date[])
+                {variants_filter.format(alias="stale")}
+                AND NOT EXISTS (
+                    SELECT 1 FROM sales
+                    WHERE sales.date = stale.date
+                        AND sales.variant_id = stale.variant_id
+                        AND sales.currency = stale.currency
+                )
+        )
+        INSERT INTO {_table(VariantDailySales)} AS target (
+            date,
+            variant_id,
+            currency,
+            quantity,
+            revenue_net_amount,
+            revenue_gross_amount
+        )
+        SELECT * FROM sales
+        ON CONFLICT (variant_id, currency, date) DO UPDATE SET
+            quantity = EXCLUDED.quantity,
+            revenue_net_amount = EXCLUDED.revenue_net_amount,
+            revenue_gross_amount = EXCLUDED.revenue_gross_amount
+        WHERE (
+            target.quantity, target.revenue_net_amount, target.revenue_gross_amount
+        ) IS DISTINCT FROM (
+            EXCLUDED.quantity,
+            EXCLUDED.revenue_net_amount,
+            EXCLUDED.revenue_gross_amount
+        )
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+
+
+def update_daily_sales(
+    dates: Iterable[date], variant_ids: Optional[Iterable[int]] = None
+):
+    """Update the order totals and the sales of the variants on the days.
+
+    Updates of a day are serialized by a lock of the day held until the
+    transaction is committed, so each one reads the orders committed before
+    it and none of them overwrites the sales with older totals.
+    """
+    dates = sorted(set(dates))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Days are locked in order, so updates don't deadlock
+            for day in dates:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, %s)",
+                    [DAILY_SALES_LOCK_KEY, day.toordinal()],
+                )
+        update_orders_daily_sales(dates)
+        update_variants_daily_sales(dates, variant_ids)
+
+
+def schedule_daily_sales_update(
+    dates: Iterable[date], variant_ids: Iterable[Optional[int]] = ()
+):
+    """Update the sales of the days once the current transaction is committed.
+
+    Sales are updated by a task, so the transactions changing the orders don't
+    wait for the locks of the days and the task sees the committed changes.
+    """
+    from .tasks import update_daily_sales_task
+
+    dates = sorted({day.isoformat() for day in dates})
+    variant_ids = sorted({pk for pk in variant_ids if pk is not None})
+    if dates:
+        transaction.on_commit(lambda: update_daily_sales_task.delay(dates, variant_ids))
+
+
+def update_daily_sales_of_orders(order_ids: Iterable[int]):
+    """Update the totals of the orders' days and the sales of their variants."""
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+    dates = {
+        get_sales_date(created)
+        for created in Order.objects.filter(pk__in=order_ids).values_list(
+            "created", flat=True
+        )
+    }
+    variant_ids = set(
+        OrderLine.objects.filter(order_id__in=order_ids, variant__isnull=False)
+        .values_list("variant_id", flat=True)
+        .distinct()
+    )
+    schedule_daily_sales_update(dates, variant_ids)
+
+
+def update_daily_sales_of_lines(lines: Iterable[OrderLine]):
+    """Update the sales of the lines' variants on the days of their orders."""
+    lines = list(lines)
+    dates = {get_sales_date(line.order.created) for line in lines}
+    schedule_daily_sales_update(dates, {line.variant_id for line in lines})
+
+
+def get_orders_total(start_date: date) -> TaxedMoney:
+    """Return the total of the orders in the default currency since the day."""
+    total = DailySales.objects.filter(
+        date__gte=start_date, currency=settings.DEFAULT_CURRENCY
+    ).aggregate(net=Sum("total_net_amount"), gross=Sum("total_gross_amount"))
+    return TaxedMoney(
+        net=Money(total["net"] or 0, settings.DEFAULT_CURRENCY),
+        gross=Money(total["gross"] or 0, settings.DEFAULT_CURRENCY),
+    )
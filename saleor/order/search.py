@@ -0,0 +1,49 @@
+from django.db import connection
+from django.db.models import QuerySet
+
+from ..account.models import Address, User
+from .models import Order
+
+# Number of orders which search documents are updated by a single query
+SEARCH_DOCUMENT_BATCH_SIZE = 1000
+
+
+def update_orders_search_document(orders: QuerySet):
+    """Update search documents of the orders in a single query.
+
+    The document is the lowercase text of the customer's name and emails, the
+    names and phones of the addresses, the discount and the token, which
+    dashboard search matches with the trigram index.
+    """
+    orders_query, params = orders.order_by().values("pk").query.sql_with_params()
+    order_table = connection.ops.quote_name(Order._meta.db_table)
+    user_table = connection.ops.quote_name(User._meta.db_table)
+    address_table = connection.ops.quote_name(Address._meta.db_table)
+    query = f"""
+        UPDATE {order_table} AS target
+        SET search_document = lower(concat_ws(' ',
+            customer.first_name,
+            customer.last_name,
+            customer.email,
+            source.user_email,
+            billing.first_name,
+            billing.last_name,
+            billing.phone,
+            shipping.first_name,
+            shipping.last_name,
+            shipping.phone,
+            source.discount_name,
+            source.translated_discount_name,
+            source.token
+        ))
+        FROM {order_table} AS source
+        LEFT JOIN {user_table} AS customer
+            ON customer.id = source.user_id
+        LEFT JOIN {address_table} AS billing
+            ON billing.id = source.billing_address_id
+        LEFT JOIN {address_table} AS shipping
+            ON shipping.id = source.shipping_address_id
+        WHERE target.id = source.id AND target.id IN ({orders_query})
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
@@ -0,0 +1,78 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+from ..account.models import Address, User
+from ..core.utils import are_fields_updated
+from .models import Order, OrderLine, OrderLineQueryset
+from .sales import (
+    get_sales_date,
+    schedule_daily_sales_update,
+    update_daily_sales_of_orders,
+)
+from .search import update_orders_search_document
+
+ORDER_SEARCH_FIELDS = {
+    "user",
+    "user_email",
+    "billing_address",
+    "shipping_address",
+    "discount_name",
+    "translated_discount_name",
+    "token",
+}
+
+ORDER_SALES_FIELDS = {"status", "currency", "total_net_amount", "total_gross_amount"}
+
+
+def handle_order_saved(instance, created, update_fields=None, **_kwargs):
+    # Orders are saved with every change of their status and totals
+    if are_fields_updated(update_fields, ORDER_SEARCH_FIELDS):
+        update_orders_search_document(Order.objects.filter(pk=instance.pk))
+    if created:
+        # Sales of the variants are updated with the lines of the new order
+        schedule_daily_sales_update([get_sales_date(instance.created)])
+    elif are_fields_updated(update_fields, ORDER_SALES_FIELDS):
+        update_daily_sales_of_orders([instance.pk])
+
+
+def handle_order_deleted(instance, **_kwargs):
+    # Sales of the variants are updated by the deletes of the lines
+    schedule_daily_sales_update([get_sales_date(instance.created)])
+
+
+def handle_order_line_changed(instance, update_fields=None, **_kwargs):
+    if are_fields_updated(update_fields, OrderLineQueryset.SALES_FIELDS):
+        schedule_daily_sales_update(
+            [get_sales_date(instance.order.created)], [instance.variant_id]
+        )
+
+
+def handle_user_saved(instance, created, update_fields=None, **_kwargs):
+    if not created and are_fields_updated(
+        update_fields, {"email", "first_name", "last_name"}
+    ):
+        update_orders_search_document(Order.objects.filter(user_id=instance.pk))
+
+
+def handle_address_saved(instance, created, **_kwargs):
+    # A new address isn't assigned to any order yet
+    if not created:
+        update_orders_search_document(
+            Order.objects.filter(
+                Q(billing_address=instance) | Q(shipping_address=instance)
+            )
+        )
+
+
+def connect_signals():
+    """Keep search documents of orders up to date with their customers.
+
+    Daily sales are updated with the orders and their lines, for the days of
+    the changed orders only, once the changes are committed.
+    """
+    post_save.connect(handle_order_saved, sender=Order)
+    post_delete.connect(handle_order_deleted, sender=Order)
+    for signal in [post_save, post_delete]:
+        signal.connect(handle_order_line_changed, sender=OrderLine)
+    post_save.connect(handle_user_saved, sender=User)
+    post_save.connect(handle_address_saved, sender=Address)
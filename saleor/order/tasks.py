@@ -0,0 +1,12 @@
+from datetime import date
+from typing import List
+
+from ..celeryconf import app
+from .sales import update_daily_sales
+
+
+@app.task
+def update_daily_sales_task(dates: List[str], variant_ids: List[int]):
+    update_daily_sales(
+        [date.fromisoformat(value) for value in dates], variant_ids=variant_ids
+    )
@@ -11,6 +11,7 @@ from ..core.weight import zero_weight
 from ..discount.models import NotApplicable, Voucher, VoucherType
 from ..discount.utils import get_products_voucher_discount, validate_voucher_in_order
 from ..extensions.manager import get_extensions_manager
+from ..giftcard.models import GiftCard
 from ..order import OrderStatus
 from ..order.models import Order, OrderLine
 from ..product.utils import allocate_stock, deallocate_stock, increase_stock
@@ -213,13 +214,16 @@ def add_variant_to_order(
     return line
 
 
-def add_gift_card_to_order(order, gift_card, total_price_left):
-    """Add gift card to order.
+def add_gift_cards_to_order(order, gift_cards, total_price_left):
+    """Add gift cards to order.
 
-    Return a total price left after applying the gift cards.
+    Return a total price left after applying the gift cards. Gift cards which
+    aren't needed to pay for the order are left intact.
     """
-    if total_price_left > zero_money(total_price_left.currency):
-        order.gift_cards.add(gift_card)
+    used_gift_cards = []
+    for gift_card in gift_cards:
+        if total_price_left <= zero_money(total_price_left.currency):
+            break
         if total_price_left < gift_card.current_balance:
             gift_card.current_balance = gift_card.current_balance - total_price_left
             total_price_left = zero_money(total_price_left.currency)
@@ -227,7 +231,12 @@ def add_gift_card_to_order(order, gift_card, total_price_left):
             total_price_left = total_price_left - gift_card.current_balance
             gift_card.current_balance_amount = 0
         gift_card.last_used_on = timezone.now()
-        gift_card.save(update_fields=["current_balance_amount", "last_used_on"])
+        used_gift_cards.append(gift_card)
+    if used_gift_cards:
+        order.gift_cards.add(*used_gift_cards)
+        GiftCard.objects.bulk_update(
+            used_gift_cards, ["current_balance_amount", "last_used_on"]
+        )
     return total_price_left
 
 
@@ -2,6 +2,8 @@ from enum import Enum
 
 from django.utils.translation import pgettext_lazy
 
+default_app_config = "saleor.product.apps.ProductAppConfig"
+
 
 class ProductAvailabilityStatus(str, Enum):
     NOT_PUBLISHED = "not-published"
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ProductAppConfig(AppConfig):
+    name = "saleor.product"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,94 @@
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from ..core.cache import VersionedCache
+from .models import Attribute, AttributeValue, Category
+
+ATTRIBUTES_INDEX_CACHE_KEY = "attributes_index_"
+ATTRIBUTES_VERSION_CACHE_KEY = "attributes_version"
+
+CATEGORIES_TREE_CACHE_KEY = "categories_tree_"
+CATEGORIES_VERSION_CACHE_KEY = "categories_version"
+
+AttributeInfo = namedtuple("AttributeInfo", ["pk", "values"])
+
+
+def build_attributes_index() -> Dict[str, AttributeInfo]:
+    """Return pks of attributes and their values by slugs.
+
+    Values are fetched as plain rows, without creating model instances.
+    """
+    index = {
+        slug: AttributeInfo(pk, {})
+        for pk, slug in Attribute.objects.values_list("pk", "slug")
+    }
+    attribute_slugs = {info.pk: slug for slug, info in index.items()}
+    values = AttributeValue.objects.values_list("pk", "slug", "attribute_id")
+    for pk, slug, attribute_id in values.order_by():
+        index[attribute_slugs[attribute_id]].values[slug] = pk
+    return index
+
+
+class AttributesIndexCache(VersionedCache[Dict[str, AttributeInfo]]):
+    """Index of attribute and value slugs shared by the processes.
+
+    Filtering products by attribute slugs doesn't load all the attributes with
+    their values. Saving or deleting any attribute or value invalidates the
+    index of all the processes.
+    """
+
+    def get(self, attribute_slug: str) -> Optional[AttributeInfo]:
+        return self.get_all().get(attribute_slug)
+
+
+attributes_index = AttributesIndexCache(
+    ATTRIBUTES_INDEX_CACHE_KEY, ATTRIBUTES_VERSION_CACHE_KEY, build_attributes_index
+)
+
+
+def build_categories_tree() -> Dict[int, Tuple[int, ...]]:
+    """Return pks of each category and all of its descendants.
+
+    The whole tree is fetched with a single query. Categories are visited from
+    the deepest level up, so descendants of children are known before their
+    parents.
+    """
+    categories = Category.objects.values_list("pk", "parent_id").order_by("-level")
+    children = defaultdict(list)
+    tree: Dict[int, Tuple[int, ...]] = {}
+    for pk, parent_id in categories:
+        descendant_ids = [pk]
+        for child_id in children.pop(pk, []):
+            descendant_ids.extend(tree[child_id])
+        tree[pk] = tuple(descendant_ids)
+        if parent_id is not None:
+            children[parent_id].append(pk)
+    return tree
+
+
+class CategoriesTreeCache(VersionedCache[Dict[int, Tuple[int, ...]]]):
+    """Descendants of categories shared by the processes.
+
+    Filtering products and discounts by categories doesn't query their
+    subtrees. Saving, moving or deleting any category invalidates the tree of
+    all the processes.
+    """
+
+    def get_descendant_ids(
+        self, category_ids: Iterable[int], include_self: bool = True
+    ) -> Set[int]:
+        """Return pks of all the descendants of the categories.
+
+        Categories which don't exist are skipped.
+        """
+        tree = self.get_all()
+        descendant_ids = set()
+        for category_id in category_ids:
+            subtree = tree.get(int(category_id), ())
+            descendant_ids.update(subtree if include_self else subtree[1:])
+        return descendant_ids
+
+
+categories_tree_cache = CategoriesTreeCache(
+    CATEGORIES_TREE_CACHE_KEY, CATEGORIES_VERSION_CACHE_KEY, build_categories_tree
+)
@@ -5,7 +5,11 @@ from tqdm import tqdm
 
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_minimal_variant_price
+from ...utils.variant_prices import (
+    MINIMAL_VARIANT_PRICES_BATCH_SIZE,
+    get_product_ids_batches,
+    update_products_minimal_variant_prices_batch,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +17,25 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = "Generate thumbnails for all images"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume the update after the product with the given ID.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Updating "minimal_variant_price" field of all the products.')
         # Fetching the discounts just once and reusing them
         discounts = fetch_active_discounts()
-        # Run the update on all the products with "progress bar" (tqdm)
+        start_after = options.get("start_after")
         qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_minimal_variant_price(product, discounts=discounts)
+        total = qs.filter(pk__gt=start_after).count() if start_after else qs.count()
+        # Run the update in batches with "progress bar" (tqdm)
+        with tqdm(total=total) as progress:
+            for product_ids in get_product_ids_batches(
+                qs, MINIMAL_VARIANT_PRICES_BATCH_SIZE, start_after
+            ):
+                update_products_minimal_variant_prices_batch(product_ids, discounts)
+                progress.update(len(product_ids))
+                progress.set_postfix(last_id=product_ids[-1])
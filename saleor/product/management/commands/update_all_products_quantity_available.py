@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ...models import Product
+from ...utils.stock import (
+    QUANTITY_AVAILABLE_BATCH_SIZE,
+    update_products_quantity_available,
+)
+from ...utils.variant_prices import get_product_ids_batches
+
+
+class Command(BaseCommand):
+    help = "Fix available quantities of products which differ from their stock."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume the update after the product with the given ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=QUANTITY_AVAILABLE_BATCH_SIZE,
+            help="Number of products updated by a single query.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "quantity_available" field of all the products.')
+        start_after = options.get("start_after")
+        qs = Product.objects.all()
+        total = qs.filter(pk__gt=start_after).count() if start_after else qs.count()
+        fixed = 0
+        with tqdm(total=total) as progress:
+            for product_ids in get_product_ids_batches(
+                qs, options["batch_size"], start_after
+            ):
+                fixed += update_products_quantity_available(product_ids)
+                progress.update(len(product_ids))
+                progress.set_postfix(last_id=product_ids[-1])
+        self.stdout.write(f"Fixed available quantities of {fixed} products.")
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.8 on 2026-10-18 05:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0110_auto_20191108_0340")]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_document",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"], name="product_search_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="product_name_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0111_product_search_document")]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="quantity_available",
+            field=models.IntegerField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE product_product AS product
+            SET quantity_available = (
+                SELECT SUM(variant.quantity) - SUM(variant.quantity_allocated)
+                FROM product_productvariant AS variant
+                WHERE variant.product_id = product.id
+            );
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
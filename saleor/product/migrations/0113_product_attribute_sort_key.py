@@ -0,0 +1,88 @@
+# Generated by Django 2.2.8 on 2026-10-18 06:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("product", "0112_product_quantity_available")]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAttributeSortKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.TextField()),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="product.Attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attribute_sort_keys",
+                        to="product.Product",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productattributesortkey",
+            index=models.Index(
+                fields=["attribute", "value"], name="product_attr_sort_key_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="productattributesortkey", unique_together={("product", "attribute")}
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO product_productattributesortkey
+                (product_id, attribute_id, value)
+            SELECT pair.product_id, pair.attribute_id, assigned.value
+            FROM (
+                SELECT product.id AS product_id, attribute_product.attribute_id
+                FROM product_product AS product
+                JOIN product_attributeproduct AS attribute_product
+                    ON attribute_product.product_type_id = product.product_type_id
+                UNION
+                SELECT assignment.product_id, attribute_product.attribute_id
+                FROM product_assignedproductattribute AS assignment
+                JOIN product_attributeproduct AS attribute_product
+                    ON attribute_product.id = assignment.assignment_id
+            ) AS pair, LATERAL (
+                SELECT CASE
+                    WHEN COUNT(assignment.id) = 0 THEN ''
+                    ELSE string_agg(
+                        value.name, ',' ORDER BY value.sort_order, value.id
+                    )
+                END
+                FROM product_assignedproductattribute AS assignment
+                JOIN product_attributeproduct AS attribute_product
+                    ON attribute_product.id = assignment.assignment_id
+                LEFT JOIN product_assignedproductattribute_values AS assigned_value
+                    ON assigned_value.assignedproductattribute_id = assignment.id
+                LEFT JOIN product_attributevalue AS value
+                    ON value.id = assigned_value.attributevalue_id
+                WHERE assignment.product_id = pair.product_id
+                    AND attribute_product.attribute_id = pair.attribute_id
+            ) AS assigned (value)
+            WHERE assigned.value IS NOT NULL;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
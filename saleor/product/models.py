@@ -3,11 +3,12 @@ from typing import TYPE_CHECKING, Iterable, Union
 from uuid import uuid4
 
 from django.conf import settings
-from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models import Case, Count, F, FilteredRelation, Q, When
+from django.db.models import Case, F, FilteredRelation, Q, When
 from django.urls import reverse
 from django.utils.encoding import smart_text
 from django.utils.html import strip_tags
@@ -143,15 +144,24 @@ class ProductsQueryset(PublishedQuerySet):
         """Insert each of the product instances into the database.
 
         Make sure every product has "minimal_variant_price" set. Otherwise
-        make it default to the "price".
+        make it default to the "price". After the creation update the search
+        documents and the attribute sort keys of the products.
         """
         for obj in objs:
             if obj.minimal_variant_price_amount is None:
                 obj.minimal_variant_price_amount = obj.price.amount
-        return super().bulk_create(
+        products = super().bulk_create(
             objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
         )
 
+        from .utils.attributes import update_products_attribute_sort_keys
+        from .utils.search import update_products_search_document
+
+        product_ids = [obj.pk for obj in products if obj.pk]
+        update_products_search_document(product_ids)
+        update_products_attribute_sort_keys(product_ids)
+        return products
+
     def collection_sorted(self, user: "User"):
         qs = self.visible_to_user(user).prefetch_related(
             "collections__products__collectionproduct"
@@ -165,80 +175,44 @@ class ProductsQueryset(PublishedQuerySet):
     def sort_by_attribute(self, attribute_pk: Union[int, str], ascending: bool = True):
         """Sort a query set by the values of the given product attribute.
 
+        Products are sorted by their precomputed sort keys of the attribute, see
+        `ProductAttributeSortKey`.
+
         :param attribute_pk: The database ID (must be a number) of the attribute
                              to sort by.
         :param ascending: The sorting direction.
         """
         qs: models.QuerySet = self
 
-        # Retrieve all the products' attribute data IDs (assignments) and
-        # product types that have the given attribute associated to them
-        associated_values = tuple(
-            AttributeProduct.objects.filter(attribute_id=attribute_pk).values_list(
-                "pk", "product_type_id"
-            )
-        )
-
-        if not associated_values:
+        if not AttributeProduct.objects.filter(attribute_id=attribute_pk).exists():
             if not ascending:
                 return qs.reverse()
             return qs
 
-        attribute_associations, product_types_associated_to_attribute = zip(
-            *associated_values
-        )
-
         qs = qs.annotate(
-            # Contains to retrieve the attribute data (singular) of each product
-            # Refer to `AttributeProduct`.
-            filtered_attribute=FilteredRelation(
-                relation_name="attributes",
-                condition=Q(attributes__assignment_id__in=attribute_associations),
-            ),
-            # Implicit `GROUP BY` required for the `StringAgg` aggregation
-            grouped_ids=Count("id"),
-            # String aggregation of the attribute's values to efficiently sort them
-            concatenated_values=Case(
-                # If the product has no association data but has the given attribute
-                # associated to its product type, then consider the concatenated values
-                # as empty (non-null).
-                When(
-                    Q(product_type_id__in=product_types_associated_to_attribute)
-                    & Q(filtered_attribute=None),
-                    then=models.Value(""),
-                ),
-                default=StringAgg(
-                    F("filtered_attribute__values__name"),
-                    delimiter=",",
-                    ordering=(
-                        [
-                            f"filtered_attribute__values__{field_name}"
-                            for field_name in AttributeValue._meta.ordering
-                        ]
-                    ),
-                ),
-                output_field=models.CharField(),
-            ),
+            # Sort key of the product for the given attribute, if there is any
+            attribute_sort_key=FilteredRelation(
+                relation_name="attribute_sort_keys",
+                condition=Q(attribute_sort_keys__attribute_id=attribute_pk),
+            )
         )
 
-        qs = qs.extra(
-            order_by=[
-                Case(
-                    # Make the products having no such attribute be last in the sorting
-                    When(concatenated_values=None, then=2),
-                    # Put the products having an empty attribute value at the bottom of
-                    # the other products.
-                    When(concatenated_values="", then=1),
-                    # Put the products having an attribute value to be always at the top
-                    default=0,
-                    output_field=models.IntegerField(),
-                ),
-                # Sort each group of products (0, 1, 2, ...) per attribute values
-                "concatenated_values",
-                # Sort each group of products by name,
-                # if they have the same values or not values
-                "name",
-            ]
+        qs = qs.order_by(
+            Case(
+                # Make the products having no such attribute be last in the sorting
+                When(attribute_sort_key__value=None, then=2),
+                # Put the products having an empty attribute value at the bottom of
+                # the other products.
+                When(attribute_sort_key__value="", then=1),
+                # Put the products having an attribute value to be always at the top
+                default=0,
+                output_field=models.IntegerField(),
+            ),
+            # Sort each group of products (0, 1, 2, ...) per attribute values
+            "attribute_sort_key__value",
+            # Sort each group of products by name,
+            # if they have the same values or not values
+            "name",
         )
 
         # Descending sorting
@@ -287,6 +261,12 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, blank=True, null=True
     )
+    # Maintained by "product.utils.search.update_products_search_document"
+    search_document = SearchVectorField(blank=True, null=True, editable=False)
+    # Maintained by "product.utils.stock.update_products_quantity_available"
+    quantity_available = models.IntegerField(
+        blank=True, null=True, editable=False, db_index=True
+    )
     objects = ProductsQueryset.as_manager()
     translated = TranslationProxy()
 
@@ -299,6 +279,14 @@ class Product(SeoModel, ModelWithMetadata, PublishableModel):
                 pgettext_lazy("Permission description", "Manage products."),
             ),
         )
+        indexes = [
+            GinIndex(fields=["search_document"], name="product_search_gin"),
+            GinIndex(
+                fields=["name"],
+                name="product_name_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __iter__(self):
         if not hasattr(self, "__variants"):
@@ -399,10 +387,13 @@ class ProductVariantQueryset(models.QuerySet):
         update_product_minimal_variant_price_task.delay(variant.product_id)
         return variant
 
+    STOCK_FIELDS = {"quantity", "quantity_allocated"}
+
     def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
         """Insert each of the product's variant instances into the database.
 
-        After the creation update the "minimal_variant_price" of all the products.
+        After the creation update the "minimal_variant_price", the search
+        documents and the available quantities of all the products.
         """
         variants = super().bulk_create(
             objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
@@ -412,13 +403,48 @@ class ProductVariantQueryset(models.QuerySet):
             product_ids.add(obj.product_id)
         product_ids = list(product_ids)
 
-        from .tasks import update_products_minimal_variant_prices_of_catalogues_task
+        from .tasks import (
+            update_products_minimal_variant_prices_of_catalogues_task,
+            update_products_search_document_task,
+        )
+        from .utils.stock import update_products_quantity_available
 
         update_products_minimal_variant_prices_of_catalogues_task.delay(
             product_ids=product_ids
         )
+        update_products_search_document_task.delay(product_ids=product_ids)
+        update_products_quantity_available(product_ids)
         return variants
 
+    def bulk_update(self, objs, fields, batch_size=None):
+        """Update the given fields of the variants.
+
+        Update the available quantities of the products if the stock changed.
+        """
+        super().bulk_update(objs, fields, batch_size=batch_size)
+        if self.STOCK_FIELDS.intersection(fields):
+            from .utils.stock import update_products_quantity_available
+
+            update_products_quantity_available(obj.product_id for obj in objs)
+
+    def update(self, **kwargs):
+        """Update the variants of the query set.
+
+        Update the available quantities of the products if the stock changed.
+        """
+        if not self.STOCK_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+
+        from .utils.stock import update_products_quantity_available
+
+        # Variants could stop matching the query set after the update
+        product_ids = list(
+            self.order_by().values_list("product_id", flat=True).distinct()
+        )
+        rows = super().update(**kwargs)
+        update_products_quantity_available(product_ids)
+        return rows
+
 
 class ProductVariant(ModelWithMetadata):
     sku = models.CharField(max_length=255, unique=True)
@@ -664,6 +690,34 @@ class AssignedVariantAttribute(BaseAssignedAttribute):
         unique_together = (("variant", "assignment"),)
 
 
+class ProductAttributeSortKey(models.Model):
+    """Key sorting a product by the values of an attribute.
+
+    The value is made of the names of the values assigned to the product,
+    ordered the same as the values of the attribute. It's empty when the
+    product's type has the attribute but no values were assigned to the
+    product. Products without the attribute or its values have no key.
+
+    Maintained by "product.utils.attributes.update_products_attribute_sort_keys".
+    """
+
+    product = models.ForeignKey(
+        Product, related_name="attribute_sort_keys", on_delete=models.CASCADE
+    )
+    attribute = models.ForeignKey(
+        "Attribute", related_name="+", on_delete=models.CASCADE
+    )
+    value = models.TextField()
+
+    class Meta:
+        unique_together = (("product", "attribute"),)
+        indexes = [
+            models.Index(
+                fields=["attribute", "value"], name="product_attr_sort_key_idx"
+            )
+        ]
+
+
 class AssociatedAttributeQuerySet(BaseAttributeQuerySet):
     def get_public_attributes(self):
         return self.filter(attribute__visible_in_storefront=True)
@@ -828,6 +882,22 @@ class AttributeTranslation(models.Model):
         return self.name
 
 
+class AttributeValueQueryset(models.QuerySet):
+    def bulk_update(self, objs, fields, batch_size=None):
+        """Update the given fields of the values.
+
+        Update the attribute sort keys of the products having the values
+        assigned, if the names or the order of the values changed.
+        """
+        super().bulk_update(objs, fields, batch_size=batch_size)
+        if {"name", "sort_order"}.intersection(fields):
+            from .tasks import update_products_attribute_sort_keys_of_catalogues_task
+
+            update_products_attribute_sort_keys_of_catalogues_task.delay(
+                attribute_value_ids=[obj.pk for obj in objs]
+            )
+
+
 class AttributeValue(SortableModel):
     name = models.CharField(max_length=100)
     value = models.CharField(max_length=100, blank=True, default="")
@@ -836,6 +906,7 @@ class AttributeValue(SortableModel):
         Attribute, related_name="values", on_delete=models.CASCADE
     )
 
+    objects = AttributeValueQueryset.as_manager()
     translated = TranslationProxy()
 
     class Meta:
@@ -0,0 +1,219 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from mptt.signals import node_moved
+
+from ..core.utils import are_fields_updated
+from .cache import attributes_index, categories_tree_cache
+from .models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    Attribute,
+    AttributeProduct,
+    AttributeValue,
+    AttributeValueTranslation,
+    Category,
+    Product,
+    ProductTranslation,
+    ProductVariant,
+    ProductVariantQueryset,
+)
+from .utils.attributes import update_products_attribute_sort_keys
+from .utils.search import (
+    SEARCH_DOCUMENT_BATCH_SIZE,
+    get_products_of_attribute_values,
+    update_products_search_document,
+)
+from .utils.stock import update_products_quantity_available
+
+
+def handle_product_saved(instance, update_fields=None, **_kwargs):
+    if are_fields_updated(update_fields, {"name", "description", "description_json"}):
+        update_products_search_document([instance.pk])
+    if are_fields_updated(update_fields, {"product_type"}):
+        update_products_attribute_sort_keys([instance.pk])
+
+
+def handle_product_translation_changed(instance, **_kwargs):
+    update_products_search_document([instance.product_id])
+
+
+def handle_variant_changed(instance, update_fields=None, **_kwargs):
+    # Stock and prices of variants are updated much more often than their SKUs
+    if are_fields_updated(update_fields, {"sku"}):
+        update_products_search_document([instance.product_id])
+
+
+def handle_variant_stock_changed(instance, update_fields=None, **_kwargs):
+    if are_fields_updated(update_fields, ProductVariantQueryset.STOCK_FIELDS):
+        update_products_quantity_available([instance.product_id])
+
+
+def handle_assigned_values_changed(instance, action, reverse, model, pk_set, **_kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Values were assigned from the side of the value, the set holds the
+        # assignments it was added to or removed from
+        assignment_model, assignment_ids = model, pk_set or []
+    else:
+        assignment_model, assignment_ids = type(instance), [instance.pk]
+    if assignment_model is AssignedProductAttribute:
+        product_ids = list(
+            AssignedProductAttribute.objects.filter(pk__in=assignment_ids).values_list(
+                "product_id", flat=True
+            )
+        )
+        update_products_attribute_sort_keys(product_ids)
+    else:
+        product_ids = list(
+            AssignedVariantAttribute.objects.filter(pk__in=assignment_ids).values_list(
+                "variant__product_id", flat=True
+            )
+        )
+    update_products_search_document(product_ids)
+
+
+def handle_product_assignment_saved(instance, **_kwargs):
+    update_products_attribute_sort_keys([instance.product_id])
+
+
+def handle_product_assignment_deleted(instance, **_kwargs):
+    # Assignments are deleted along with their products, which would get the
+    # keys back if they were updated before the whole deletion is done
+    transaction.on_commit(
+        lambda: update_products_attribute_sort_keys([instance.product_id])
+    )
+
+
+def _update_attribute_sort_keys_of_product_type(product_type_id: int):
+    from .tasks import update_products_attribute_sort_keys_of_catalogues_task
+
+    update_products_attribute_sort_keys_of_catalogues_task.delay(
+        product_type_ids=[product_type_id]
+    )
+
+
+def handle_attribute_product_saved(instance, **_kwargs):
+    _update_attribute_sort_keys_of_product_type(instance.product_type_id)
+
+
+def handle_attribute_product_deleted(instance, **_kwargs):
+    transaction.on_commit(
+        lambda: _update_attribute_sort_keys_of_product_type(instance.product_type_id)
+    )
+
+
+def handle_product_types_attributes_changed(
+    instance, action, reverse, pk_set, **_kwargs
+):
+    # Removed attributes are handled by the deletes of the assignments
+    if action != "post_add":
+        return
+    from .tasks import update_products_attribute_sort_keys_of_catalogues_task
+
+    product_type_ids = [instance.pk] if reverse else list(pk_set or [])
+    update_products_attribute_sort_keys_of_catalogues_task.delay(
+        product_type_ids=product_type_ids
+    )
+
+
+def handle_attribute_value_saved(instance, created, update_fields=None, **_kwargs):
+    # A new value isn't assigned to any product yet
+    if created:
+        return
+    from .tasks import (
+        update_products_attribute_sort_keys_of_catalogues_task,
+        update_products_search_document_of_attribute_values_task,
+    )
+
+    if are_fields_updated(update_fields, {"name"}):
+        update_products_search_document_of_attribute_values_task.delay(
+            attribute_value_ids=[instance.pk]
+        )
+    if are_fields_updated(update_fields, {"name", "sort_order"}):
+        update_products_attribute_sort_keys_of_catalogues_task.delay(
+            attribute_value_ids=[instance.pk]
+        )
+
+
+def handle_attribute_value_translation_changed(instance, **_kwargs):
+    from .tasks import update_products_search_document_of_attribute_values_task
+
+    update_products_search_document_of_attribute_values_task.delay(
+        attribute_value_ids=[instance.attribute_value_id]
+    )
+
+
+def handle_attribute_value_deleted(instance, **_kwargs):
+    # Assignments of the value are deleted with it, so the products have to be
+    # found before and updated once the value is gone
+    product_ids = list(
+        get_products_of_attribute_values([instance.pk])
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    def update_products():
+        from .tasks import (
+            update_products_attribute_sort_keys_task,
+            update_products_search_document_task,
+        )
+
+        for start in range(0, len(product_ids), SEARCH_DOCUMENT_BATCH_SIZE):
+            end = start + SEARCH_DOCUMENT_BATCH_SIZE
+            update_products_search_document_task.delay(
+                product_ids=product_ids[start:end]
+            )
+            update_products_attribute_sort_keys_task.delay(
+                product_ids=product_ids[start:end]
+            )
+
+    transaction.on_commit(update_products)
+
+
+def invalidate_attributes(**_kwargs):
+    attributes_index.invalidate()
+
+
+def invalidate_categories(**_kwargs):
+    categories_tree_cache.invalidate()
+
+
+def connect_signals():
+    """Keep search documents of products up to date with their content.
+
+    Documents of single products are updated right away, in the transaction of
+    the change. Changes of attribute values, which can be assigned to any
+    number of products, are propagated by Celery tasks.
+
+    Attribute sort keys and available quantities of products are updated with
+    the assigned attribute values and the stock of their variants. Changes of
+    attributes and their values also invalidate the shared index of their
+    slugs, and changes of categories the shared tree of their descendants.
+    """
+    for model in [Attribute, AttributeValue]:
+        post_save.connect(invalidate_attributes, sender=model)
+        post_delete.connect(invalidate_attributes, sender=model)
+    for signal in [post_save, post_delete, node_moved]:
+        signal.connect(invalidate_categories, sender=Category)
+    post_save.connect(handle_product_saved, sender=Product)
+    for signal in [post_save, post_delete]:
+        signal.connect(handle_product_translation_changed, sender=ProductTranslation)
+        signal.connect(handle_variant_changed, sender=ProductVariant)
+        signal.connect(handle_variant_stock_changed, sender=ProductVariant)
+        signal.connect(
+            handle_attribute_value_translation_changed, sender=AttributeValueTranslation
+        )
+    for relation in [AssignedProductAttribute.values, AssignedVariantAttribute.values]:
+        m2m_changed.connect(handle_assigned_values_changed, sender=relation.through)
+    post_save.connect(handle_attribute_value_saved, sender=AttributeValue)
+    post_save.connect(handle_product_assignment_saved, sender=AssignedProductAttribute)
+    post_delete.connect(
+        handle_product_assignment_deleted, sender=AssignedProductAttribute
+    )
+    post_save.connect(handle_attribute_product_saved, sender=AttributeProduct)
+    post_delete.connect(handle_attribute_product_deleted, sender=AttributeProduct)
+    m2m_changed.connect(
+        handle_product_types_attributes_changed, sender=Attribute.product_types.through
+    )
+    pre_delete.connect(handle_attribute_value_deleted, sender=AttributeValue)
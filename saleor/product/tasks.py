@@ -1,16 +1,32 @@
+import logging
 from typing import Iterable, List, Optional
 
+from django.db.models import QuerySet
+
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Attribute, Product, ProductType, ProductVariant
-from .utils.attributes import generate_name_for_variant
+from .utils.attributes import (
+    ATTRIBUTE_SORT_KEYS_BATCH_SIZE,
+    generate_name_for_variant,
+    get_products_of_attributes,
+    update_products_attribute_sort_keys,
+)
+from .utils.search import (
+    SEARCH_DOCUMENT_BATCH_SIZE,
+    get_products_of_attribute_values,
+    update_products_search_document,
+)
 from .utils.variant_prices import (
+    get_product_ids_batches,
+    get_products_of_catalogues,
+    get_products_of_discount,
     update_product_minimal_variant_price,
     update_products_minimal_variant_prices,
-    update_products_minimal_variant_prices_of_catalogues,
-    update_products_minimal_variant_prices_of_discount,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _update_variants_names(instance: ProductVariant, saved_attributes: Iterable):
     """Product variant names are created from names of assigned attributes.
@@ -47,24 +63,69 @@ def update_product_minimal_variant_price_task(product_pk: int):
     update_product_minimal_variant_price(product)
 
 
+def _schedule_minimal_variant_prices_update(products: QuerySet):
+    """Split the update into tasks updating a single batch of products each.
+
+    Batches are processed concurrently by the workers and a failed task is
+    retried without updating the products of other batches again.
+    """
+    for product_ids in get_product_ids_batches(products):
+        update_products_minimal_variant_prices_task.delay(product_ids=product_ids)
+
+
 @app.task
 def update_products_minimal_variant_prices_of_catalogues_task(
     product_ids: Optional[List[int]] = None,
     category_ids: Optional[List[int]] = None,
     collection_ids: Optional[List[int]] = None,
 ):
-    update_products_minimal_variant_prices_of_catalogues(
-        product_ids, category_ids, collection_ids
-    )
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    _schedule_minimal_variant_prices_update(products)
 
 
 @app.task
 def update_products_minimal_variant_prices_of_discount_task(discount_pk: int):
     discount = Sale.objects.get(pk=discount_pk)
-    update_products_minimal_variant_prices_of_discount(discount)
+    _schedule_minimal_variant_prices_update(get_products_of_discount(discount))
 
 
 @app.task
 def update_products_minimal_variant_prices_task(product_ids: List[int]):
     products = Product.objects.filter(pk__in=product_ids)
-    update_products_minimal_variant_prices(products)
+    updated_count = update_products_minimal_variant_prices(products)
+    logger.info(
+        "Updated minimal variant prices of %d out of %d products.",
+        updated_count,
+        len(product_ids),
+    )
+
+
+@app.task
+def update_products_search_document_task(product_ids: List[int]):
+    update_products_search_document(product_ids)
+
+
+@app.task
+def update_products_search_document_of_attribute_values_task(
+    attribute_value_ids: List[int],
+):
+    products = get_products_of_attribute_values(attribute_value_ids)
+    for product_ids in get_product_ids_batches(products, SEARCH_DOCUMENT_BATCH_SIZE):
+        update_products_search_document_task.delay(product_ids=product_ids)
+
+
+@app.task
+def update_products_attribute_sort_keys_task(product_ids: List[int]):
+    update_products_attribute_sort_keys(product_ids)
+
+
+@app.task
+def update_products_attribute_sort_keys_of_catalogues_task(
+    product_type_ids: Optional[List[int]] = None,
+    attribute_value_ids: Optional[List[int]] = None,
+):
+    products = get_products_of_attributes(product_type_ids, attribute_value_ids)
+    for product_ids in get_product_ids_batches(
+        products, ATTRIBUTE_SORT_KEYS_BATCH_SIZE
+    ):
+        update_products_attribute_sort_keys_task.delay(product_ids=product_ids)
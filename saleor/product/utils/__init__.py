@@ -1,16 +1,21 @@
-from typing import TYPE_CHECKING, List, Union
+from collections import defaultdict
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple, Union
 from urllib.parse import urlencode
 
 from django.conf import settings
-from django.db import transaction
-from django.db.models import F
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from prices import Money
 
+from ...core.exceptions import InsufficientStock
 from ...core.taxes import TaxedMoney, zero_taxed_money
 from ..tasks import update_products_minimal_variant_prices_task
+from .stock import update_products_quantity_available
 
 if TYPE_CHECKING:
     # flake8: noqa
-    from datetime import date, datetime
+    from datetime import date
 
     from django.db.models.query import QuerySet
 
@@ -27,6 +32,79 @@ def deallocate_stock(variant: "ProductVariant", quantity: int):
     variant.save(update_fields=["quantity_allocated"])
 
 
+def _add_quantities_allocated(quantities: Dict[int, int]) -> Set[int]:
+    """Add quantities to the allocated ones of the variants in a single query.
+
+    Only variants tracking inventory are updated. Their rows are locked in the
+    order of their IDs, so allocations competing for the same variants don't
+    deadlock. Return IDs of the updated variants which don't have enough
+    stock for the new allocated quantity. Available quantities of the products
+    of the updated variants are updated as well.
+    """
+    from ..models import ProductVariant
+
+    table = connection.ops.quote_name(ProductVariant._meta.db_table)
+    values = ", ".join(["(%s, %s)"] * len(quantities))
+    query = f"""
+        UPDATE {table} AS variant
+        SET quantity_allocated = variant.quantity_allocated + requested.quantity
+        FROM (VALUES {values}) AS requested (id, quantity), (
+            SELECT id FROM {table}
+            WHERE id = ANY(%s) AND track_inventory
+            ORDER BY id FOR UPDATE
+        ) AS locked
+        WHERE variant.id = requested.id AND variant.id = locked.id
+            AND variant.track_inventory
+        RETURNING
+            variant.id,
+            variant.product_id,
+            variant.quantity >= variant.quantity_allocated
+    """
+    params = [value for pk_quantity in quantities.items() for value in pk_quantity]
+    with connection.cursor() as cursor:
+        cursor.execute(query, params + [list(quantities)])
+        updated = cursor.fetchall()
+    update_products_quantity_available(product_id for _, product_id, _ in updated)
+    return {pk for pk, _, in_stock in updated if not in_stock}
+
+
+def allocate_stocks(variants_quantities: Iterable[Tuple["ProductVariant", int]]):
+    """Allocate the quantities of the variants at once.
+
+    Quantities of the variants tracking inventory are updated by a single
+    query, which also checks their stock. Nothing is allocated if any of the
+    variants doesn't have enough stock.
+
+    :raises InsufficientStock: when there is not enough items in stock for a variant.
+    """
+    variants = {}
+    quantities: Dict[int, int] = defaultdict(int)
+    for variant, quantity in variants_quantities:
+        variants[variant.pk] = variant
+        quantities[variant.pk] += quantity
+    if not quantities:
+        return
+
+    with transaction.atomic():
+        out_of_stock_ids = _add_quantities_allocated(quantities)
+        if out_of_stock_ids:
+            # Raising rolls back the allocations of all the variants
+            raise InsufficientStock(variants[min(out_of_stock_ids)])
+
+
+def deallocate_stocks(variants_quantities: Iterable[Tuple["ProductVariant", int]]):
+    """Release the quantities of the variants allocated by `allocate_stocks`.
+
+    Whether the variants track inventory is checked in the database, the same
+    as by the allocation.
+    """
+    quantities: Dict[int, int] = defaultdict(int)
+    for variant, quantity in variants_quantities:
+        quantities[variant.pk] -= quantity
+    if quantities:
+        _add_quantities_allocated(quantities)
+
+
 def decrease_stock(variant: "ProductVariant", quantity: int):
     variant.quantity = F("quantity") - quantity
     variant.quantity_allocated = F("quantity_allocated") - quantity
@@ -46,14 +124,24 @@ def increase_stock(variant: "ProductVariant", quantity, allocate: bool = False):
 def calculate_revenue_for_variant(
     variant: "ProductVariant", start_date: Union["date", "datetime"]
 ) -> TaxedMoney:
-    """Calculate total revenue generated by a product variant."""
-    revenue = zero_taxed_money()
-    for order_line in variant.order_lines.all():
-        if order_line.order.created >= start_date:
-            net = order_line.unit_price_net * order_line.quantity
-            gross = order_line.unit_price_gross * order_line.quantity
-            revenue += TaxedMoney(net, gross)
-    return revenue
+    """Calculate total revenue generated by a product variant.
+
+    Revenue is summed from the daily sales of the variant in the default
+    currency, from the day of the start date.
+    """
+    from ...order.sales import get_sales_date
+
+    if isinstance(start_date, datetime):
+        start_date = get_sales_date(start_date)
+    revenue = variant.daily_sales.filter(
+        date__gte=start_date, currency=settings.DEFAULT_CURRENCY
+    ).aggregate(net=Sum("revenue_net_amount"), gross=Sum("revenue_gross_amount"))
+    if revenue["gross"] is None:
+        return zero_taxed_money()
+    return TaxedMoney(
+        net=Money(revenue["net"], settings.DEFAULT_CURRENCY),
+        gross=Money(revenue["gross"], settings.DEFAULT_CURRENCY),
+    )
 
 
 @transaction.atomic
@@ -73,15 +161,15 @@ def delete_categories(categories_ids: List[str]):
         products = products | collect_categories_tree_products(category)
 
     products.update(is_published=False, publication_date=None)
-    product_ids = list(products.values_list("id", flat=True))
+    product_ids = list(products.order_by("pk").values_list("id", flat=True))
     categories.delete()
     update_products_minimal_variant_prices_task.delay(product_ids=product_ids)
 
 
 def collect_categories_tree_products(category: "Category") -> "QuerySet[Product]":
     """Collect products from all levels in category tree."""
-    products = category.products.all()
-    descendants = category.get_descendants()
-    for descendant in descendants:
-        products = products | descendant.products.all()
-    return products
+    from ..cache import categories_tree_cache
+    from ..models import Product
+
+    category_ids = categories_tree_cache.get_descendant_ids([category.pk])
+    return Product.objects.filter(category_id__in=category_ids)
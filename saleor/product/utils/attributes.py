@@ -1,16 +1,24 @@
-from typing import Set, Union
+from typing import Iterable, List, Optional, Set, Union
+
+from django.db import connection
+from django.db.models import Q, QuerySet
 
 from ..models import (
     AssignedProductAttribute,
     AssignedVariantAttribute,
     Attribute,
+    AttributeProduct,
     AttributeValue,
     Product,
+    ProductAttributeSortKey,
     ProductVariant,
 )
 
 AttributeAssignmentType = Union[AssignedProductAttribute, AssignedVariantAttribute]
 
+# Number of products which attribute sort keys are updated by a single query
+ATTRIBUTE_SORT_KEYS_BATCH_SIZE = 1000
+
 
 def generate_name_for_variant(variant: ProductVariant) -> str:
     """Generate ProductVariant's name based on its attributes."""
@@ -81,3 +89,96 @@ def associate_attribute_values_to_instance(
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
     return assignment
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _get_update_attribute_sort_keys_query() -> str:
+    assigned_values = AssignedProductAttribute.values.through
+    return f"""
+        WITH pair AS (
+            SELECT product.id AS product_id, attribute_product.attribute_id
+            FROM {_table(Product)} AS product
+            JOIN {_table(AttributeProduct)} AS attribute_product
+                ON attribute_product.product_type_id = product.product_type_id
+            WHERE product.id = ANY(%(product_ids)s)
+            UNION
+            SELECT assignment.product_id, attribute_product.attribute_id
+            FROM {_table(AssignedProductAttribute)} AS assignment
+            JOIN {_table(AttributeProduct)} AS attribute_product
+                ON attribute_product.id = assignment.assignment_id
+            WHERE assignment.product_id = ANY(%(product_ids)s)
+        ),
+        sort_key AS (
+            SELECT pair.product_id, pair.attribute_id, assigned.value
+            FROM pair, LATERAL (
+                SELECT CASE
+                    WHEN COUNT(assignment.id) = 0 THEN ''
+                    ELSE string_agg(
+                        value.name, ',' ORDER BY value.sort_order, value.id
+                    )
+                END
+                FROM {_table(AssignedProductAttribute)} AS assignment
+                JOIN {_table(AttributeProduct)} AS attribute_product
+                    ON attribute_product.id = assignment.assignment_id
+                LEFT JOIN {_table(assigned_values)} AS assigned_value
+                    ON assigned_value.assignedproductattribute_id = assignment.id
+                LEFT JOIN {_table(AttributeValue)} AS value
+                    ON value.id = assigned_value.attributevalue_id
+                WHERE assignment.product_id = pair.product_id
+                    AND attribute_product.attribute_id = pair.attribute_id
+            ) AS assigned (value)
+            WHERE assigned.value IS NOT NULL
+        ),
+        deleted AS (
+            DELETE FROM {_table(ProductAttributeSortKey)} AS stale
+            WHERE stale.product_id = ANY(%(product_ids)s) AND NOT EXISTS (
+                SELECT 1 FROM sort_key
+                WHERE sort_key.product_id = stale.product_id
+                    AND sort_key.attribute_id = stale.attribute_id
+            )
+        )
+        INSERT INTO {_table(ProductAttributeSortKey)} (product_id, attribute_id, value)
+        SELECT product_id, attribute_id, value FROM sort_key
+        ON CONFLICT (product_id, attribute_id) DO UPDATE SET value = EXCLUDED.value
+        WHERE {_table(ProductAttributeSortKey)}.value IS DISTINCT FROM EXCLUDED.value
+    """
+
+
+def update_products_attribute_sort_keys(product_ids: Iterable[int]):
+    """Update keys sorting the products by each of their attributes.
+
+    Keys are built by the database in a single query, the same way products
+    used to be sorted by attributes: from names of the assigned values,
+    ordered by the sort order of the values and joined with commas. The key is
+    empty when the product's type has the attribute but the product has no
+    values assigned. Products with an assignment but no values get no key, so
+    they're sorted with the products without the attribute.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _get_update_attribute_sort_keys_query(), {"product_ids": product_ids}
+        )
+
+
+def get_products_of_attributes(
+    product_type_ids: Optional[List[int]] = None,
+    attribute_value_ids: Optional[List[int]] = None,
+) -> QuerySet:
+    """Return products of the types or with any of the values assigned."""
+    lookup = Q()
+    if product_type_ids:
+        lookup |= Q(product_type_id__in=product_type_ids)
+    if attribute_value_ids:
+        assignments = AssignedProductAttribute.objects.filter(
+            values__in=attribute_value_ids
+        )
+        lookup |= Q(pk__in=assignments.values("product_id"))
+    if not lookup:
+        return Product.objects.none()
+    return Product.objects.filter(lookup)
@@ -0,0 +1,129 @@
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+from ..models import (
+    AssignedProductAttribute,
+    AssignedVariantAttribute,
+    AttributeValue,
+    AttributeValueTranslation,
+    Product,
+    ProductTranslation,
+    ProductVariant,
+)
+
+# Number of products which search documents are updated by a single query
+SEARCH_DOCUMENT_BATCH_SIZE = 1000
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _description_text(alias: str) -> str:
+    """Return SQL of the plain text of the description stored in the row."""
+    if settings.USE_JSON_CONTENT:
+        # Same as "json_content_to_raw_text", texts of the DraftJS blocks
+        return f"""(
+            SELECT string_agg(block->>'text', ' ')
+            FROM jsonb_array_elements(
+                CASE jsonb_typeof({alias}.description_json->'blocks')
+                WHEN 'array' THEN {alias}.description_json->'blocks' END
+            ) AS block
+        )"""
+    return f"regexp_replace({alias}.description, '<[^>]*>', ' ', 'g')"
+
+
+def _attribute_values_text(assignment_model) -> str:
+    """Return SQL of the names of values assigned by the row of `assignment`."""
+    relation = assignment_model.values.through
+    assignment_column = relation._meta.get_field(
+        assignment_model._meta.model_name
+    ).column
+    return f"""
+        SELECT concat_ws(' ', value.name, string_agg(value_translation.name, ' '))
+        FROM {_table(AttributeValue)} AS value
+        JOIN {_table(relation)} AS assigned_value
+            ON assigned_value.attributevalue_id = value.id
+        LEFT JOIN {_table(AttributeValueTranslation)} AS value_translation
+            ON value_translation.attribute_value_id = value.id
+        WHERE assigned_value.{assignment_column} = assignment.id
+        GROUP BY value.id
+    """
+
+
+def _get_update_search_document_query() -> str:
+    product_values_text = _attribute_values_text(AssignedProductAttribute)
+    variant_values_text = _attribute_values_text(AssignedVariantAttribute)
+    return f"""
+        UPDATE {_table(Product)} AS product
+        SET search_document =
+            setweight(to_tsvector(concat_ws(' ',
+                product.name,
+                (
+                    SELECT string_agg(translation.name, ' ')
+                    FROM {_table(ProductTranslation)} AS translation
+                    WHERE translation.product_id = product.id
+                )
+            )), 'A')
+            || setweight(to_tsvector(concat_ws(' ',
+                (
+                    SELECT string_agg(variant.sku, ' ')
+                    FROM {_table(ProductVariant)} AS variant
+                    WHERE variant.product_id = product.id
+                ),
+                (
+                    SELECT string_agg(values_text, ' ')
+                    FROM {_table(AssignedProductAttribute)} AS assignment,
+                    LATERAL ({product_values_text}) AS assigned (values_text)
+                    WHERE assignment.product_id = product.id
+                ),
+                (
+                    SELECT string_agg(values_text, ' ')
+                    FROM {_table(ProductVariant)} AS variant
+                    JOIN {_table(AssignedVariantAttribute)} AS assignment
+                        ON assignment.variant_id = variant.id,
+                    LATERAL ({variant_values_text}) AS assigned (values_text)
+                    WHERE variant.product_id = product.id
+                )
+            )), 'B')
+            || setweight(to_tsvector(concat_ws(' ',
+                {_description_text("product")},
+                (
+                    SELECT string_agg({_description_text("translation")}, ' ')
+                    FROM {_table(ProductTranslation)} AS translation
+                    WHERE translation.product_id = product.id
+                )
+            )), 'C')
+        WHERE product.id = ANY(%s)
+    """
+
+
+def update_products_search_document(product_ids: Iterable[int]):
+    """Update search documents of the products in a single query.
+
+    The document is a text search vector of the product's name and its
+    translations with the highest weight, SKUs of the variants and the
+    assigned attribute values with their translations, and descriptions with
+    the lowest weight. It's built by the database, without fetching any of the
+    related objects.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(_get_update_search_document_query(), [product_ids])
+
+
+def get_products_of_attribute_values(attribute_value_ids: List[int]) -> QuerySet:
+    """Return products which or which variants have any of the values assigned."""
+    product_assignments = AssignedProductAttribute.objects.filter(
+        values__in=attribute_value_ids
+    )
+    variants = ProductVariant.objects.filter(attributes__values__in=attribute_value_ids)
+    return Product.objects.filter(
+        Q(pk__in=product_assignments.values("product_id"))
+        | Q(pk__in=variants.values("product_id"))
+    )
@@ -0,0 +1,57 @@
+from typing import Iterable
+
+from django.db import connection, transaction
+
+from ..models import Product, ProductVariant
+
+# Number of products which available quantities are updated by a single query
+QUANTITY_AVAILABLE_BATCH_SIZE = 1000
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def update_products_quantity_available(product_ids: Iterable[int]) -> int:
+    """Update quantities of the products available in stock of their variants.
+
+    The quantity is the total quantity of the variants less the allocated one,
+    and is null for products without variants. Rows of the products are
+    locked in the order of their IDs before the quantities are summed, so
+    concurrent changes of the stock of different variants of a product don't
+    deadlock and the last of them sees all the others. The locks are held
+    until the quantities are updated, also when called in autocommit mode.
+
+    Return the number of products which quantity was changed.
+    """
+    product_ids = sorted(set(product_ids))
+    if not product_ids:
+        return 0
+    product_table = _table(Product)
+    with transaction.atomic(savepoint=False), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT id FROM {product_table}
+            WHERE id = ANY(%s) ORDER BY id FOR UPDATE
+            """,
+            [product_ids],
+        )
+        cursor.execute(
+            f"""
+            UPDATE {product_table} AS product
+            SET quantity_available = stock.quantity
+            FROM (
+                SELECT id, (
+                    SELECT SUM(variant.quantity) - SUM(variant.quantity_allocated)
+                    FROM {_table(ProductVariant)} AS variant
+                    WHERE variant.product_id = locked.id
+                )
+                FROM {product_table} AS locked
+                WHERE id = ANY(%s)
+            ) AS stock (product_id, quantity)
+            WHERE product.id = stock.product_id
+                AND product.quantity_available IS DISTINCT FROM stock.quantity
+            """,
+            [product_ids],
+        )
+        return cursor.rowcount
@@ -1,11 +1,18 @@
 import operator
 from functools import reduce
+from typing import Iterable, Iterator, List, Optional
 
+from django.db.models import Count, Min, Prefetch, QuerySet, prefetch_related_objects
 from django.db.models.query_utils import Q
 from prices import Money
 
-from ...discount.utils import fetch_active_discounts
-from ..models import Product
+from ...core.utils import get_ids_batches
+from ...discount.utils import calculate_discounted_price, fetch_active_discounts
+from ..models import Collection, Product
+
+# Number of products fetched and updated at once, it's also the number of
+# products updated by a single Celery task
+MINIMAL_VARIANT_PRICES_BATCH_SIZE = 1000
 
 
 def _get_product_minimal_variant_price(product, discounts) -> Money:
@@ -28,27 +35,85 @@ def update_product_minimal_variant_price(product, discounts=None, save=True):
     return product
 
 
-def update_products_minimal_variant_prices(products, discounts=None):
+def get_product_ids_batches(
+    products: QuerySet,
+    batch_size: int = MINIMAL_VARIANT_PRICES_BATCH_SIZE,
+    start_after: Optional[int] = None,
+) -> Iterator[List[int]]:
+    """Yield IDs of the products in batches ordered by ID."""
+    return get_ids_batches(products, batch_size, start_after)
+
+
+def _get_minimal_base_price(product) -> Optional[Money]:
+    """Return the lowest base price of variants annotated on the product."""
+    prices = []
+    if product.min_price_override_amount is not None:
+        prices.append(product.min_price_override_amount)
+    # Variants without the price override are sold for the product's price
+    if product.price_overrides_count < product.variants_count:
+        prices.append(product.price_amount)
+    return Money(min(prices), product.currency) if prices else None
+
+
+def update_products_minimal_variant_prices_batch(
+    product_ids: Iterable[int], discounts=None
+) -> int:
+    """Update minimal variant prices of the products and return the updated count.
+
+    Instead of fetching every variant, the lowest base price of the variants of
+    each product is computed by the database. As sales never change the order
+    of prices, applying discounts to it gives the minimal discounted price.
+    Only products with a changed price are saved.
+    """
     if discounts is None:
         discounts = fetch_active_discounts()
+    products = list(
+        Product.objects.filter(pk__in=product_ids)
+        .only("category_id", "price_amount", "currency", "minimal_variant_price_amount")
+        .annotate(
+            min_price_override_amount=Min("variants__price_override_amount"),
+            price_overrides_count=Count("variants__price_override_amount"),
+            variants_count=Count("variants"),
+        )
+    )
+    if discounts:
+        prefetch_related_objects(
+            products, Prefetch("collections", queryset=Collection.objects.only("pk"))
+        )
+
     changed_products_to_update = []
     for product in products:
-        old_minimal_variant_price = product.minimal_variant_price
-        updated_product = update_product_minimal_variant_price(
-            product, discounts, save=False
-        )
-        # Check if the "minimal_variant_price" has changed
-        if updated_product.minimal_variant_price != old_minimal_variant_price:
-            changed_products_to_update.append(updated_product)
-    # Bulk update the changed products
+        # Start with the product's price as the minimal one
+        minimal_variant_price = product.price
+        minimal_base_price = _get_minimal_base_price(product)
+        if minimal_base_price is not None:
+            variant_price = calculate_discounted_price(
+                product, minimal_base_price, discounts
+            )
+            minimal_variant_price = min(minimal_variant_price, variant_price)
+        if product.minimal_variant_price != minimal_variant_price:
+            product.minimal_variant_price_amount = minimal_variant_price.amount
+            changed_products_to_update.append(product)
     Product.objects.bulk_update(
         changed_products_to_update, ["minimal_variant_price_amount"]
     )
+    return len(changed_products_to_update)
 
 
-def update_products_minimal_variant_prices_of_catalogues(
+def update_products_minimal_variant_prices(products: QuerySet, discounts=None) -> int:
+    if discounts is None:
+        discounts = fetch_active_discounts()
+    updated_count = 0
+    for product_ids in get_product_ids_batches(products):
+        updated_count += update_products_minimal_variant_prices_batch(
+            product_ids, discounts
+        )
+    return updated_count
+
+
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
-):
+) -> QuerySet:
     # Building the matching products query
     q_list = []
     if product_ids:
@@ -67,14 +132,23 @@ def update_products_minimal_variant_prices_of_catalogues(
         )
     # Querying the products
     q_or = reduce(operator.or_, q_list)
-    products = Product.objects.filter(q_or).distinct()
-
-    update_products_minimal_variant_prices(products)
+    return Product.objects.filter(q_or).distinct()
 
 
-def update_products_minimal_variant_prices_of_discount(discount):
-    update_products_minimal_variant_prices_of_catalogues(
+def get_products_of_discount(discount) -> QuerySet:
+    return get_products_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def update_products_minimal_variant_prices_of_catalogues(
+    product_ids=None, category_ids=None, collection_ids=None
+):
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    update_products_minimal_variant_prices(products)
+
+
+def update_products_minimal_variant_prices_of_discount(discount):
+    update_products_minimal_variant_prices(get_products_of_discount(discount))
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchAppConfig(AppConfig):
+    name = "saleor.search"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
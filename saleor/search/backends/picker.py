@@ -8,3 +8,19 @@ def pick_backend():
     Returns a callable that accepts the search phrase.
     """
     return import_module(settings.SEARCH_BACKEND).search_storefront
+
+
+def pick_order_search_backend():
+    """Return the currently configured dashboard search function of orders.
+
+    Returns a callable that accepts a queryset of orders and the search phrase.
+    """
+    return import_module(settings.SEARCH_BACKEND).search_orders
+
+
+def pick_user_search_backend():
+    """Return the currently configured dashboard search function of users.
+
+    Returns a callable that accepts a queryset of users and the search phrase.
+    """
+    return import_module(settings.SEARCH_BACKEND).search_users
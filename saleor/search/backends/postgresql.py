@@ -1,5 +1,13 @@
-from . import postgresql_storefront
+from . import postgresql_dashboard, postgresql_storefront
 
 
 def search_storefront(phrase):
     return postgresql_storefront.search(phrase)
+
+
+def search_orders(qs, phrase):
+    return postgresql_dashboard.search_orders(qs, phrase)
+
+
+def search_users(qs, phrase):
+    return postgresql_dashboard.search_users(qs, phrase)
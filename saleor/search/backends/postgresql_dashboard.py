@@ -0,0 +1,91 @@
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models import Q
+from phonenumber_field.phonenumber import to_python
+
+from ...account.models import Address, User
+
+
+def _parse_email(phrase: str) -> Optional[str]:
+    try:
+        validate_email(phrase)
+    except ValidationError:
+        return None
+    return phrase
+
+
+def _parse_phone(phrase: str) -> Optional[str]:
+    # Only numbers with the country code can be matched exactly
+    if not phrase.startswith("+"):
+        return None
+    phone_number = to_python(phrase)
+    if not phone_number or not phone_number.is_valid():
+        return None
+    return phone_number.as_e164
+
+
+def _get_address_ids(phone: str):
+    return list(Address.objects.filter(phone=phone).values_list("pk", flat=True))
+
+
+def search_orders(qs, phrase):
+    """Return orders matching the phrase for dashboard views.
+
+    Order numbers, emails and phone numbers are matched exactly. Other
+    phrases are matched anywhere in the names, emails and phones of the
+    customer, the discount and the token of the order, which are kept in the
+    trigram-indexed search document.
+
+    Args:
+        qs (QuerySet): orders to search
+        phrase (str): searched phrase
+
+    """
+    phrase = phrase.strip()
+    if phrase.isdigit():
+        return qs.filter(pk=int(phrase))
+    email = _parse_email(phrase)
+    if email:
+        # Users are looked up first, as an OR of conditions on joined tables
+        # couldn't use their indexes
+        user_ids = list(
+            User.objects.filter(email__iexact=email).values_list("pk", flat=True)
+        )
+        return qs.filter(Q(user_email__iexact=email) | Q(user_id__in=user_ids))
+    phone = _parse_phone(phrase)
+    if phone:
+        address_ids = _get_address_ids(phone)
+        return qs.filter(
+            Q(billing_address_id__in=address_ids)
+            | Q(shipping_address_id__in=address_ids)
+        )
+    return qs.filter(search_document__contains=phrase.lower())
+
+
+def search_users(qs, phrase):
+    """Return users matching the phrase for dashboard views.
+
+    Emails and phone numbers are matched exactly. Other phrases are matched
+    anywhere in the names and the email of the user and in the names, city,
+    country and phone of the default addresses, which are kept in the
+    trigram-indexed search document.
+
+    Args:
+        qs (QuerySet): users to search
+        phrase (str): searched phrase
+
+    """
+    phrase = phrase.strip()
+    email = _parse_email(phrase)
+    if email:
+        return qs.filter(email__iexact=email)
+    phone = _parse_phone(phrase)
+    if phone:
+        address_ids = _get_address_ids(phone)
+        return qs.filter(
+            Q(default_shipping_address_id__in=address_ids)
+            | Q(default_billing_address_id__in=address_ids)
+        )
+    return qs.filter(search_document__contains=phrase.lower())
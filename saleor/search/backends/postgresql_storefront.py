@@ -1,24 +1,33 @@
-from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
 
 from ...product.models import Product
 
+# Minimal trigram similarity of a product's name to the phrase for the product
+# to be found, it's set as the threshold of the database connections
+TRIGRAM_SIMILARITY_THRESHOLD = 0.2
+
 
 def search(phrase):
     """Return matching products for storefront views.
 
     Fuzzy storefront search that is resistant to small typing errors made
-    by user. Name is matched using trigram similarity, description uses
-    standard postgres full text search.
+    by user. Name is matched using trigram similarity, the search document of
+    names, SKUs, attribute values and descriptions uses standard postgres full
+    text search. Both use the indexes of products.
+
+    Products are ordered by the rank of the full text match, then by the
+    similarity of the name.
 
     Args:
         phrase (str): searched phrase
 
     """
-    name_sim = TrigramSimilarity("name", phrase)
+    query = SearchQuery(phrase)
+    ft_in_document = Q(search_document=query)
+    name_similar = Q(name__trigram_similar=phrase)
     published = Q(is_published=True)
-    ft_in_description = Q(description__search=phrase)
-    name_similar = Q(name_sim__gt=0.2)
-    return Product.objects.annotate(name_sim=name_sim).filter(
-        (ft_in_description | name_similar) & published
+    return Product.objects.filter((ft_in_document | name_similar) & published).order_by(
+        SearchRank(F("search_document"), query).desc(nulls_last=True),
+        TrigramSimilarity("name", phrase).desc(),
     )
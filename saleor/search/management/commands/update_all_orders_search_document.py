@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....core.utils import get_ids_batches
+from ....order.models import Order
+from ....order.search import SEARCH_DOCUMENT_BATCH_SIZE, update_orders_search_document
+
+
+class Command(BaseCommand):
+    help = "Update search documents of all the orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume the update after the order with the given ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEARCH_DOCUMENT_BATCH_SIZE,
+            help="Number of orders updated by a single query.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "search_document" field of all the orders.')
+        start_after = options.get("start_after")
+        qs = Order.objects.all()
+        total = qs.filter(pk__gt=start_after).count() if start_after else qs.count()
+        # Every batch is committed on its own, so the rows aren't locked for the
+        # whole update
+        with tqdm(total=total) as progress:
+            for order_ids in get_ids_batches(qs, options["batch_size"], start_after):
+                update_orders_search_document(Order.objects.filter(pk__in=order_ids))
+                progress.update(len(order_ids))
+                progress.set_postfix(last_id=order_ids[-1])
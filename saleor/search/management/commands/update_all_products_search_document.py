@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....product.models import Product
+from ....product.utils.search import (
+    SEARCH_DOCUMENT_BATCH_SIZE,
+    update_products_search_document,
+)
+from ....product.utils.variant_prices import get_product_ids_batches
+
+
+class Command(BaseCommand):
+    help = "Update search documents of all the products."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume the update after the product with the given ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEARCH_DOCUMENT_BATCH_SIZE,
+            help="Number of products updated by a single query.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "search_document" field of all the products.')
+        start_after = options.get("start_after")
+        qs = Product.objects.all()
+        total = qs.filter(pk__gt=start_after).count() if start_after else qs.count()
+        # Every batch is committed on its own, so the rows aren't locked for the
+        # whole update
+        with tqdm(total=total) as progress:
+            for product_ids in get_product_ids_batches(
+                qs, options["batch_size"], start_after
+            ):
+                update_products_search_document(product_ids)
+                progress.update(len(product_ids))
+                progress.set_postfix(last_id=product_ids[-1])
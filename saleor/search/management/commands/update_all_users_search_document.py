@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from ....account.models import User
+from ....account.search import SEARCH_DOCUMENT_BATCH_SIZE, update_users_search_document
+from ....core.utils import get_ids_batches
+
+
+class Command(BaseCommand):
+    help = "Update search documents of all the users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            help="Resume the update after the user with the given ID.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEARCH_DOCUMENT_BATCH_SIZE,
+            help="Number of users updated by a single query.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "search_document" field of all the users.')
+        start_after = options.get("start_after")
+        qs = User.objects.all()
+        total = qs.filter(pk__gt=start_after).count() if start_after else qs.count()
+        # Every batch is committed on its own, so the rows aren't locked for the
+        # whole update
+        with tqdm(total=total) as progress:
+            for user_ids in get_ids_batches(qs, options["batch_size"], start_after):
+                update_users_search_document(User.objects.filter(pk__in=user_ids))
+                progress.update(len(user_ids))
+                progress.set_postfix(last_id=user_ids[-1])
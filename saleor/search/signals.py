@@ -0,0 +1,18 @@
+from django.db.backends.signals import connection_created
+
+from .backends.postgresql_storefront import TRIGRAM_SIMILARITY_THRESHOLD
+
+
+def set_trigram_similarity_threshold(connection, **_kwargs):
+    # The threshold of the "%" operator, which unlike comparing the similarity
+    # to a value can use the trigram index. Setting it doesn't require the
+    # pg_trgm extension to be loaded yet.
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET pg_trgm.similarity_threshold = %s", [TRIGRAM_SIMILARITY_THRESHOLD]
+            )
+
+
+def connect_signals():
+    connection_created.connect(set_trigram_similarity_threshold)
@@ -64,7 +64,7 @@ def get_order_confirmation_markup(order: "Order") -> str:
         "orderDate": order.created,
     }
 
-    lines = order.lines.prefetch_related("variant")
+    lines = order.lines.prefetch_related("variant__product__images")
     for line in lines:
         product_data = get_product_data(line=line, organization=organization)
         data["acceptedOffer"].append(product_data)
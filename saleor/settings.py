@@ -52,6 +52,20 @@ DATABASES = {
     )
 }
 
+# A cache shared by all the processes, e.g. redis://redis:6379/0, is required
+# when the shop runs more than one process (web workers and Celery), as cached
+# discounts, plugin configurations, webhooks, menus, sites and others are
+# invalidated through it. Without it each process caches data in its own memory
+# and keeps it for at most LOCAL_CACHE_TIMEOUT seconds.
+CACHE_URL = os.environ.get("CACHE_URL", os.environ.get("REDIS_URL"))
+if CACHE_URL:
+    CACHES = {
+        "default": {"BACKEND": "django_redis.cache.RedisCache", "LOCATION": CACHE_URL}
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+LOCAL_CACHE_TIMEOUT = int(os.environ.get("LOCAL_CACHE_TIMEOUT", 5))
+
 
 TIME_ZONE = "America/Chicago"
 LANGUAGE_CODE = "en"
@@ -458,7 +472,7 @@ LOGOUT_ON_PASSWORD_CHANGE = False
 SEARCH_BACKEND = "saleor.search.backends.postgresql"
 
 AUTHENTICATION_BACKENDS = [
-    "graphql_jwt.backends.JSONWebTokenBackend",
+    "saleor.core.auth_backend.JSONWebTokenBackend",
     "django.contrib.auth.backends.ModelBackend",
 ]
 
@@ -519,6 +533,25 @@ GRAPHENE = {
     "RELAY_CONNECTION_MAX_LIMIT": 100,
 }
 
+# Number of parsed and validated GraphQL documents kept in memory per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+# Number of threads executing read-only operations of batched requests
+# concurrently; each thread uses its own database connection (0 to disable)
+GRAPHQL_BATCH_MAX_WORKERS = int(os.environ.get("GRAPHQL_BATCH_MAX_WORKERS", 0))
+# How long (in seconds) automatic persisted queries are stored in the cache
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERY_TIMEOUT", 60 * 60 * 24)
+)
+
+# How long (in seconds) a snapshot of active discounts may be reused by requests;
+# it's invalidated earlier by changes of sales and when a sale starts or ends
+DISCOUNTS_CACHE_TIMEOUT = int(os.environ.get("DISCOUNTS_CACHE_TIMEOUT", 60))
+
+# Number of concurrent deliveries and kept-alive connections per target host
+WEBHOOK_MAX_CONNECTIONS_PER_HOST = int(
+    os.environ.get("WEBHOOK_MAX_CONNECTIONS_PER_HOST", 2)
+)
+
 EXTENSIONS_MANAGER = "saleor.extensions.manager.ExtensionsManager"
 
 PLUGINS = [
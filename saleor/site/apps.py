@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SiteAppConfig(AppConfig):
+    name = "saleor.site"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
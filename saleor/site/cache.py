@@ -0,0 +1,75 @@
+from time import monotonic
+from typing import Callable, Dict
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+from ..core.cache import (
+    VERSIONED_DATA_TIMEOUT,
+    CacheVersion,
+    copy_cached,
+    get_cache_timeout,
+)
+
+SITES_CACHE_KEY = "sites_"
+SITES_VERSION_CACHE_KEY = "sites_version"
+# Number of seconds after which processes see changes made by the others
+SITES_VERSION_CHECK_INTERVAL = 5
+
+
+class SitesCache:
+    """Sites with their settings shared by the processes.
+
+    Sites are kept in the process memory and in the Django cache, so getting
+    the current site doesn't query the database. Saving or deleting a site or
+    its settings changes the shared version. The process which made the change
+    drops its sites right away and the other processes check the version at
+    most every `SITES_VERSION_CHECK_INTERVAL` seconds.
+
+    Every call returns a separate copy of the site, so changes of one request,
+    e.g. made by a mutation rejected later, never leak into the others.
+    """
+
+    def __init__(self):
+        # The process making the change sees it right away
+        self.version = CacheVersion(SITES_VERSION_CACHE_KEY, on_change=self.clear)
+        self._sites: Dict[str, Site] = {}
+        self._version = None
+        self._checked_at = None
+
+    def _check_version(self):
+        now = monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < SITES_VERSION_CHECK_INTERVAL
+        ):
+            return
+        version = self.version.get()
+        if version != self._version:
+            self._sites = {}
+            self._version = version
+        self._checked_at = now
+
+    def get(self, lookup: str, fetch_site: Callable[[], Site]) -> Site:
+        """Return the site found by the lookup, fetching it on a miss."""
+        self._check_version()
+        site = self._sites.get(lookup)
+        if site is None:
+            key = SITES_CACHE_KEY + f"{self._version}_{lookup}"
+            site = cache.get(key)
+            if site is None:
+                site = fetch_site()
+                cache.set(key, site, get_cache_timeout(VERSIONED_DATA_TIMEOUT))
+            self._sites[lookup] = site
+        return copy_cached(site)
+
+    def invalidate(self):
+        self.version.invalidate()
+
+    def clear(self):
+        self._sites = {}
+        self._version = None
+        self._checked_at = None
+
+
+sites_cache = SitesCache()
@@ -2,17 +2,32 @@
 
 Since django.contrib.sites may not be thread-safe when there are
 multiple instances of the application server, we're patching it with
-a thread-safe structure and methods that use it underneath.
+methods that use the versioned cache of sites shared by the processes.
 """
-import threading
-
 from django.contrib.sites.models import Site, SiteManager
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Prefetch
 from django.http.request import split_domain_port
 
-lock = threading.Lock()
-with lock:
-    THREADED_SITE_CACHE = {}
+from .cache import sites_cache
+
+
+def _get_sites_with_settings(manager):
+    if manager.model is not Site:
+        # Models of migrations may not have all the fields of the settings
+        return manager.prefetch_related("settings")
+    from .models import SiteSettings
+
+    # The company address is kept with the cached settings as well
+    settings_qs = SiteSettings.objects.select_related("company_address")
+    return manager.prefetch_related(Prefetch("settings", queryset=settings_qs))
+
+
+def _get_cached_site(manager, lookup, fetch_site):
+    if manager.model is not Site:
+        # Models of migrations can't be shared by the processes
+        return fetch_site()
+    return sites_cache.get(lookup, fetch_site)
 
 
 def new_get_current(self, request=None):
@@ -20,32 +35,28 @@ def new_get_current(self, request=None):
 
     if getattr(settings, "SITE_ID", ""):
         site_id = settings.SITE_ID
-        if site_id not in THREADED_SITE_CACHE:
-            with lock:
-                site = self.prefetch_related("settings").filter(pk=site_id)[0]
-                THREADED_SITE_CACHE[site_id] = site
-        return THREADED_SITE_CACHE[site_id]
+        return _get_cached_site(
+            self,
+            f"id:{site_id}",
+            lambda: _get_sites_with_settings(self).filter(pk=site_id)[0],
+        )
     elif request:
         host = request.get_host()
         try:
             # First attempt to look up the site by host with or without port.
-            if host not in THREADED_SITE_CACHE:
-                with lock:
-                    site = self.prefetch_related("settings").filter(
-                        domain__iexact=host
-                    )[0]
-                    THREADED_SITE_CACHE[host] = site
-            return THREADED_SITE_CACHE[host]
+            return _get_cached_site(
+                self,
+                f"host:{host}",
+                lambda: _get_sites_with_settings(self).filter(domain__iexact=host)[0],
+            )
         except Site.DoesNotExist:
             # Fallback to looking up site after stripping port from the host.
             domain, dummy_port = split_domain_port(host)
-            if domain not in THREADED_SITE_CACHE:
-                with lock:
-                    site = self.prefetch_related("settings").filter(
-                        domain__iexact=domain
-                    )[0]
-                    THREADED_SITE_CACHE[domain] = site
-        return THREADED_SITE_CACHE[domain]
+            return _get_cached_site(
+                self,
+                f"host:{domain}",
+                lambda: _get_sites_with_settings(self).filter(domain__iexact=domain)[0],
+            )
 
     raise ImproperlyConfigured(
         "You're using the Django sites framework without having"
@@ -56,9 +67,7 @@ def new_get_current(self, request=None):
 
 
 def new_clear_cache(self):
-    global THREADED_SITE_CACHE
-    with lock:
-        THREADED_SITE_CACHE = {}
+    sites_cache.clear()
 
 
 def new_get_by_natural_key(self, domain):
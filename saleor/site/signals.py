@@ -0,0 +1,25 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save
+
+from ..account.models import Address
+from .cache import sites_cache
+from .models import SiteSettings
+
+
+def invalidate_sites(**_kwargs):
+    sites_cache.invalidate()
+
+
+def handle_address_changed(instance, **kwargs):
+    # Addresses of customers are saved much more often than the company's one
+    if Site.objects.get_current().settings.company_address_id == instance.pk:
+        invalidate_sites(**kwargs)
+
+
+def connect_signals():
+    """Keep the cached sites up to date with their settings."""
+    for model in [Site, SiteSettings]:
+        post_save.connect(invalidate_sites, sender=model)
+        post_delete.connect(invalidate_sites, sender=model)
+    post_save.connect(handle_address_changed, sender=Address)
+    post_delete.connect(handle_address_changed, sender=Address)
@@ -1,5 +1,7 @@
 from django.utils.translation import pgettext_lazy
 
+default_app_config = "saleor.webhook.apps.WebhookAppConfig"
+
 
 class WebhookEventType:
     ANY = "any_events"
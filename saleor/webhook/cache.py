@@ -0,0 +1,50 @@
+from collections import defaultdict, namedtuple
+from typing import Dict, List
+
+from ..core.cache import VersionedCache
+from . import WebhookEventType
+from .models import Webhook
+
+WEBHOOKS_INDEX_CACHE_KEY = "webhooks_index_"
+WEBHOOKS_VERSION_CACHE_KEY = "webhooks_version"
+
+# Secret keys aren't kept in the shared cache, deliveries read them instead
+WebhookInfo = namedtuple("WebhookInfo", ["pk", "target_url"])
+
+
+def build_webhooks_index() -> Dict[str, List[WebhookInfo]]:
+    """Return active webhooks permitted to receive each of the event types."""
+    webhooks = Webhook.objects.filter(
+        is_active=True, service_account__is_active=True
+    ).prefetch_related("events", "service_account__permissions__content_type")
+    index = defaultdict(list)
+    for webhook in webhooks.order_by("pk"):
+        event_types = {event.event_type for event in webhook.events.all()}
+        permissions = {
+            f"{permission.content_type.app_label}.{permission.codename}"
+            for permission in webhook.service_account.permissions.all()
+        }
+        info = WebhookInfo(webhook.pk, webhook.target_url)
+        for event_type, required_permission in WebhookEventType.PERMISSIONS.items():
+            if required_permission and required_permission not in permissions:
+                continue
+            if event_type in event_types or WebhookEventType.ANY in event_types:
+                index[event_type].append(info)
+    return dict(index)
+
+
+class WebhooksIndexCache(VersionedCache[Dict[str, List[WebhookInfo]]]):
+    """Index of webhooks subscribed to event types shared by the processes.
+
+    Dispatching an event doesn't query the database. Any change of webhooks,
+    their events, service accounts or their permissions invalidates the index
+    of all the processes.
+    """
+
+    def get(self, event_type: str) -> List[WebhookInfo]:
+        return self.get_all().get(event_type, [])
+
+
+webhooks_index = WebhooksIndexCache(
+    WEBHOOKS_INDEX_CACHE_KEY, WEBHOOKS_VERSION_CACHE_KEY, build_webhooks_index
+)
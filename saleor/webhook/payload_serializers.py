@@ -1,52 +1,103 @@
-from collections import OrderedDict
-from collections.abc import Iterable
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import graphene
-from django.core.serializers.json import Serializer as JSONSerializer
-from django.core.serializers.python import Serializer as PythonBaseSerializer
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, QuerySet
+from django.utils.encoding import is_protected_type
 
 
-class PythonSerializer(PythonBaseSerializer):
-    def get_dump_object(self, obj):
-        obj_id = graphene.Node.to_global_id(obj._meta.object_name, obj.id)
-        data = OrderedDict([("type", str(obj._meta.object_name)), ("id", obj_id)])
-        data.update(self._current)
-        return data
+def _get_field_getter(field) -> Callable[[Model], Any]:
+    attname = field.attname
+
+    def get_value(obj):
+        # Values are the same as the ones dumped by Django's Python serializer
+        value = getattr(obj, attname)
+        if is_protected_type(value):
+            return value
+        return field.value_to_string(obj)
+
+    return get_value
+
+
+class _CompiledSerializer:
+    def __init__(self, model, field_names, related_serializers):
+        opts = model._meta
+        for field_name in field_names:
+            # Fail early on the fields which don't exist
+            opts.get_field(field_name)
+        self.fields: List[Tuple[str, Callable[[Model], Any]]] = [
+            (field.name, _get_field_getter(field))
+            for field in opts.concrete_model._meta.local_fields
+            if field.serialize and field.name in field_names
+        ]
+        self.related: List[Tuple[str, "PayloadSerializer", bool]] = []
+        self.select_related: List[str] = []
+        self.prefetch_related: List[str] = []
+        for field_name, serializer in related_serializers.items():
+            field = opts.get_field(field_name)
+            many = field.one_to_many or field.many_to_many
+            self.related.append((field_name, serializer, many))
+            if many:
+                self.prefetch_related.append(field_name)
+            else:
+                self.select_related.append(field_name)
 
 
-class PayloadSerializer(JSONSerializer):
-    def __init__(self):
-        super().__init__()
-        self.additional_fields = {}
-
-    def serialize(self, queryset, **options):
-        self.additional_fields = options.pop("additional_fields", {})
-        return super().serialize(
-            queryset,
-            stream=options.pop("stream", None),
-            fields=options.pop("fields", None),
-            use_natural_foreign_keys=options.pop("use_natural_foreign_keys", False),
-            use_natural_primary_keys=options.pop("use_natural_primary_keys", False),
-            progress_output=options.pop("progress_output", None),
-            object_count=options.pop("object_count", 0),
-            **options,
-        )
-
-    def get_dump_object(self, obj):
-        obj_id = graphene.Node.to_global_id(obj._meta.object_name, obj.id)
-        data = OrderedDict([("type", str(obj._meta.object_name)), ("id", obj_id)])
-        python_serializer = PythonSerializer()
-        for field_name, (qs, fields) in self.additional_fields.items():
-            data_to_serialize = qs(obj)
-            if not data_to_serialize:
-                data[field_name] = None
-            elif isinstance(data_to_serialize, Iterable):
-                data[field_name] = python_serializer.serialize(
-                    data_to_serialize, fields=fields
+class PayloadSerializer:
+    """Serialize model instances to the JSON of webhook payloads.
+
+    Fields to serialize and their getters are resolved once, on the first use
+    of the serializer, instead of for every serialized instance. Related
+    objects are serialized by serializers of their models and are fetched for
+    all the instances at once, with `select_related` for single objects and
+    `prefetch_related` for lists.
+    """
+
+    def __init__(
+        self,
+        model,
+        fields: Iterable[str],
+        related: Optional[Dict[str, "PayloadSerializer"]] = None,
+    ):
+        self.model = model
+        self.field_names = set(fields)
+        self.related_serializers = related or {}
+        self._compiled: Optional[_CompiledSerializer] = None
+
+    def _compile(self) -> _CompiledSerializer:
+        # Reverse relations can't be looked up until all the models are loaded
+        if self._compiled is None:
+            self._compiled = _CompiledSerializer(
+                self.model, self.field_names, self.related_serializers
+            )
+        return self._compiled
+
+    def dump(self, obj: Model) -> Dict[str, Any]:
+        compiled = self._compile()
+        data = {
+            "type": obj._meta.object_name,
+            "id": graphene.Node.to_global_id(obj._meta.object_name, obj.pk),
+        }
+        for field_name, serializer, many in compiled.related:
+            if many:
+                related_objects = getattr(obj, field_name).all()
+                data[field_name] = (
+                    [serializer.dump(related) for related in related_objects]
+                    if related_objects
+                    else None
                 )
             else:
-                data[field_name] = python_serializer.serialize(
-                    [data_to_serialize], fields=fields
-                )[0]
-        data.update(self._current)
+                related = getattr(obj, field_name)
+                data[field_name] = serializer.dump(related) if related else None
+        for field_name, get_value in compiled.fields:
+            data[field_name] = get_value(obj)
         return data
+
+    def serialize(self, queryset: QuerySet) -> str:
+        compiled = self._compile()
+        if compiled.select_related:
+            queryset = queryset.select_related(*compiled.select_related)
+        if compiled.prefetch_related:
+            queryset = queryset.prefetch_related(*compiled.prefetch_related)
+        return json.dumps([self.dump(obj) for obj in queryset], cls=DjangoJSONEncoder)
@@ -3,11 +3,13 @@ from typing import Optional
 
 from django.db.models import Model, QuerySet
 
-from ..account.models import User
+from ..account.models import Address, User
 from ..order import FulfillmentStatus, OrderStatus
-from ..order.models import Order
+from ..order.models import Fulfillment, Order, OrderLine
 from ..payment import ChargeStatus
-from ..product.models import Product
+from ..payment.models import Payment
+from ..product.models import Category, Collection, Product, ProductVariant
+from ..shipping.models import ShippingMethod
 from . import WebhookEventType
 from .payload_serializers import PayloadSerializer
 
@@ -26,44 +28,11 @@ ADDRESS_FIELDS = (
 )
 
 
-def generate_order_payload(order: "Order"):
-    serializer = PayloadSerializer()
-    fulfillment_fields = ("status", "tracking_number", "created")
-    payment_fields = (
-        "gateway"
-        "is_active"
-        "created"
-        "modified"
-        "charge_status"
-        "total"
-        "captured_amount"
-        "currency"
-        "billing_email"
-        "billing_first_name"
-        "billing_last_name"
-        "billing_company_name"
-        "billing_address_1"
-        "billing_address_2"
-        "billing_city"
-        "billing_city_area"
-        "billing_postal_code"
-        "billing_country_code"
-        "billing_country_area"
-    )
-    line_fields = (
-        "product_name",
-        "variant_name",
-        "translated_product_name",
-        "translated_variant_name",
-        "product_sku",
-        "quantity",
-        "currency",
-        "unit_price_net_amount",
-        "unit_price_gross_amount",
-        "tax_rate",
-    )
-    shipping_method_fields = ("name", "type", "currency", "price_amount")
-    order_fields = (
+ADDRESS_SERIALIZER = PayloadSerializer(Address, ADDRESS_FIELDS)
+
+ORDER_SERIALIZER = PayloadSerializer(
+    Order,
+    (
         "created",
         "status",
         "user_email",
@@ -72,61 +41,84 @@ def generate_order_payload(order: "Order"):
         "shipping_price_gross_amount",
         "total_net_amount",
         "total_gross_amount",
-        "shipping_price_net_amount",
-        "shipping_price_gross_amount",
         "discount_amount",
         "discount_name",
         "translated_discount_name",
         "weight",
         "private_meta",
         "meta",
-    )
-    order_data = serializer.serialize(
-        [order],
-        fields=order_fields,
-        additional_fields={
-            "shipping_method": (lambda o: o.shipping_method, shipping_method_fields),
-            "lines": (lambda o: o.lines.all(), line_fields),
-            "payments": (lambda o: o.payments.all(), payment_fields),
-            "shipping_address": (lambda o: o.shipping_address, ADDRESS_FIELDS),
-            "billing_address": (lambda o: o.billing_address, ADDRESS_FIELDS),
-            "fulfillments": (lambda o: o.fulfillments.all(), fulfillment_fields),
-        },
-    )
-    return order_data
-
-
-def generate_customer_payload(customer: "User"):
-    serializer = PayloadSerializer()
-    data = serializer.serialize(
-        [customer],
-        fields=[
-            "email",
-            "first_name",
-            "last_name",
-            "is_active",
-            "date_joined",
-            "private_meta",
-            "meta",
-        ],
-        additional_fields={
-            "default_shipping_address": (
-                lambda c: c.default_billing_address,
-                ADDRESS_FIELDS,
+    ),
+    related={
+        "shipping_method": PayloadSerializer(
+            ShippingMethod, ("name", "type", "currency", "price_amount")
+        ),
+        "lines": PayloadSerializer(
+            OrderLine,
+            (
+                "product_name",
+                "variant_name",
+                "translated_product_name",
+                "translated_variant_name",
+                "product_sku",
+                "quantity",
+                "currency",
+                "unit_price_net_amount",
+                "unit_price_gross_amount",
+                "tax_rate",
             ),
-            "default_billing_address": (
-                lambda c: c.default_shipping_address,
-                ADDRESS_FIELDS,
+        ),
+        "payments": PayloadSerializer(
+            Payment,
+            (
+                "gateway",
+                "is_active",
+                "created",
+                "modified",
+                "charge_status",
+                "total",
+                "captured_amount",
+                "currency",
+                "billing_email",
+                "billing_first_name",
+                "billing_last_name",
+                "billing_company_name",
+                "billing_address_1",
+                "billing_address_2",
+                "billing_city",
+                "billing_city_area",
+                "billing_postal_code",
+                "billing_country_code",
+                "billing_country_area",
             ),
-        },
-    )
-    return data
-
+        ),
+        "shipping_address": ADDRESS_SERIALIZER,
+        "billing_address": ADDRESS_SERIALIZER,
+        "fulfillments": PayloadSerializer(
+            Fulfillment, ("status", "tracking_number", "created")
+        ),
+    },
+)
 
-def generate_product_payload(product: "Product"):
-    serializer = PayloadSerializer()
+CUSTOMER_SERIALIZER = PayloadSerializer(
+    User,
+    (
+        "email",
+        "first_name",
+        "last_name",
+        "is_active",
+        "date_joined",
+        "private_meta",
+        "meta",
+    ),
+    related={
+        "default_shipping_address": ADDRESS_SERIALIZER,
+        "default_billing_address": ADDRESS_SERIALIZER,
+    },
+)
 
-    product_fields = (
+PRODUCT_SERIALIZER = PayloadSerializer(
+    Product,
+    (
         "name",
         "description_json",
         "currency",
@@ -140,29 +132,41 @@ def generate_product_payload(product: "Product"):
         "is_published",
         "private_meta",
         "meta",
-    )
-    product_variant_fields = (
-        "sku",
-        "name",
-        "currency",
-        "price_override_amount",
-        "track_inventory",
-        "quantity",
-        "quantity_allocated",
-        "cost_price_amount",
-        "private_meta",
-        "meta",
-    )
-    product_payload = serializer.serialize(
-        [product],
-        fields=product_fields,
-        additional_fields={
-            "category": (lambda p: p.category, ("name", "slug")),
-            "collections": (lambda p: p.collections.all(), ("name", "slug")),
-            "variants": (lambda p: p.variants.all(), product_variant_fields),
-        },
-    )
-    return product_payload
+    ),
+    related={
+        "category": PayloadSerializer(Category, ("name", "slug")),
+        "collections": PayloadSerializer(Collection, ("name", "slug")),
+        "variants": PayloadSerializer(
+            ProductVariant,
+            (
+                "sku",
+                "name",
+                "currency",
+                "price_override_amount",
+                "track_inventory",
+                "quantity",
+                "quantity_allocated",
+                "cost_price_amount",
+                "private_meta",
+                "meta",
+            ),
+        ),
+    },
+)
+
+
+# Instances are fetched again with all the related objects, so the ones passed
+# in don't keep the fetched relations, which would become stale
+def generate_order_payload(order: "Order"):
+    return ORDER_SERIALIZER.serialize(Order.objects.filter(pk=order.pk))
+
+
+def generate_customer_payload(customer: "User"):
+    return CUSTOMER_SERIALIZER.serialize(User.objects.filter(pk=customer.pk))
+
+
+def generate_product_payload(product: "Product"):
+    return PRODUCT_SERIALIZER.serialize(Product.objects.filter(pk=product.pk))
 
 
 def _get_sample_object(qs: QuerySet) -> Optional[Model]:
@@ -172,14 +176,7 @@ def _get_sample_object(qs: QuerySet) -> Optional[Model]:
 
 
 def _generate_sample_order_payload(event_name):
-    order_qs = Order.objects.prefetch_related(
-        "payments",
-        "lines",
-        "shipping_method",
-        "shipping_address",
-        "billing_address",
-        "fulfillments",
-    )
+    order_qs = Order.objects.all()
     order = None
     if event_name == WebhookEventType.ORDER_CREATED:
         order = _get_sample_object(order_qs.filter(status=OrderStatus.UNFULFILLED))
@@ -204,9 +201,7 @@ def generate_sample_payload(event_name: str) -> Optional[dict]:
         user = _get_sample_object(User.objects.filter(is_staff=False, is_active=True))
         payload = generate_customer_payload(user) if user else None
     elif event_name == WebhookEventType.PRODUCT_CREATED:
-        product = _get_sample_object(
-            Product.objects.prefetch_related("category", "collections", "variants")
-        )
+        product = _get_sample_object(Product.objects.all())
         payload = generate_product_payload(product) if product else None
     else:
         payload = _generate_sample_order_payload(event_name)
@@ -0,0 +1,17 @@
+from django.contrib.auth.models import Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from ..account.models import ServiceAccount
+from .cache import webhooks_index
+from .models import Webhook, WebhookEvent
+
+
+def invalidate_webhooks(**_kwargs):
+    webhooks_index.invalidate()
+
+
+def connect_signals():
+    for model in [Webhook, WebhookEvent, ServiceAccount, Permission]:
+        post_save.connect(invalidate_webhooks, sender=model)
+        post_delete.connect(invalidate_webhooks, sender=model)
+    m2m_changed.connect(invalidate_webhooks, sender=ServiceAccount.permissions.through)
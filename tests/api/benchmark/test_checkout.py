@@ -1,10 +1,15 @@
+from unittest.mock import patch
+
 import pytest
 from graphene import Node
 
 from saleor.checkout import calculations
+from saleor.checkout.models import CheckoutLine
 from saleor.checkout.utils import add_variant_to_checkout
+from saleor.extensions.manager import get_extensions_manager
 from saleor.payment import ChargeStatus, TransactionKind
 from saleor.payment.models import Payment
+from saleor.product.models import ProductVariant
 from tests.api.utils import get_graphql_content
 
 
@@ -512,3 +517,110 @@ def test_complete_checkout(api_client, checkout_with_charged_payment, count_quer
     }
 
     get_graphql_content(api_client.post_graphql(query, variables))
+
+
+@pytest.fixture()
+def checkout_with_many_lines(checkout, product):
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"SKU_{i}", quantity=10)
+            for i in range(50)
+        ]
+    )
+    CheckoutLine.objects.bulk_create(
+        [
+            CheckoutLine(checkout=checkout, variant=variant, quantity=1)
+            for variant in variants
+        ]
+    )
+    return checkout
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_calculate_checkout_total_with_many_lines(
+    checkout_with_many_lines, shipping_method, discount_info, count_queries
+):
+    checkout = checkout_with_many_lines
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    manager = get_extensions_manager()
+
+    manager.calculate_checkout_total(checkout, [discount_info])
+
+
+# Queries made by completing a checkout, regardless of the number of its lines
+CHECKOUT_COMPLETE_QUERY_BUDGET = 59
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("lines_count", [1, 50])
+@patch("saleor.order.emails.send_templated_mail")
+def test_complete_checkout_query_budget(
+    _mocked_send_mail,
+    lines_count,
+    api_client,
+    checkout,
+    product,
+    address,
+    shipping_method,
+    django_assert_max_num_queries,
+):
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"SKU_{i}", quantity=10)
+            for i in range(lines_count)
+        ]
+    )
+    CheckoutLine.objects.bulk_create(
+        [
+            CheckoutLine(checkout=checkout, variant=variant, quantity=1)
+            for variant in variants
+        ]
+    )
+    checkout.shipping_address = address
+    checkout.billing_address = address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    total = calculations.checkout_total(checkout)
+    payment = Payment.objects.create(
+        gateway="Dummy",
+        is_active=True,
+        total=total.gross.amount,
+        currency="USD",
+        charge_status=ChargeStatus.FULLY_CHARGED,
+        captured_amount=total.gross.amount,
+        checkout=checkout,
+    )
+    payment.transactions.create(
+        amount=payment.total,
+        kind=TransactionKind.CAPTURE,
+        gateway_response={},
+        is_success=True,
+    )
+    query = """
+        mutation completeCheckout($checkoutId: ID!, $redirectUrl: String) {
+          checkoutComplete(checkoutId: $checkoutId, redirectUrl: $redirectUrl) {
+            errors {
+              field
+              message
+            }
+            order {
+              lines {
+                id
+              }
+            }
+          }
+        }
+    """
+    variables = {
+        "checkoutId": Node.to_global_id("Checkout", checkout.pk),
+        "redirectUrl": "https://www.example.com",
+    }
+
+    with django_assert_max_num_queries(CHECKOUT_COMPLETE_QUERY_BUDGET):
+        response = api_client.post_graphql(query, variables)
+
+    data = get_graphql_content(response)["data"]["checkoutComplete"]
+    assert not data["errors"]
+    assert len(data["order"]["lines"]) == lines_count
@@ -1,6 +1,9 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from graphene import Node
 
+from saleor.product.models import Product
 from tests.api.utils import get_graphql_content
 
 
@@ -115,3 +118,101 @@ def test_retrieve_product_attributes(product_list, api_client, count_queries):
 
     variables = {}
     get_graphql_content(api_client.post_graphql(query, variables))
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_retrieve_product_list_with_relations(
+    product_list, collection, api_client, count_queries
+):
+    query = """
+        query {
+          products(first: 10) {
+            edges {
+              node {
+                id
+                translation(languageCode: PL) {
+                  name
+                }
+                images {
+                  url
+                }
+                collections {
+                  name
+                }
+                variants {
+                  id
+                  images {
+                    url
+                  }
+                  attributes {
+                    attribute {
+                      slug
+                    }
+                    values {
+                      slug
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+
+    collection.products.add(*product_list)
+    get_graphql_content(api_client.post_graphql(query))
+
+
+@pytest.mark.django_db
+def test_product_list_query_count_does_not_depend_on_products_count(
+    product_list, collection, api_client
+):
+    query = """
+        fragment Variant on ProductVariant {
+          id
+          images {
+            url
+          }
+          attributes {
+            values {
+              slug
+            }
+          }
+        }
+
+        query {
+          products(first: 10) {
+            edges {
+              node {
+                id
+                collections {
+                  name
+                }
+                attributes {
+                  values {
+                    slug
+                  }
+                }
+                variants {
+                  ...Variant
+                }
+              }
+            }
+          }
+        }
+    """
+
+    collection.products.add(*product_list)
+    Product.objects.update(is_published=True)
+
+    with CaptureQueriesContext(connection) as all_products_queries:
+        content = get_graphql_content(api_client.post_graphql(query))
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
+
+    Product.objects.exclude(pk=product_list[0].pk).update(is_published=False)
+    with CaptureQueriesContext(connection) as single_product_queries:
+        content = get_graphql_content(api_client.post_graphql(query))
+    assert len(content["data"]["products"]["edges"]) == 1
+
+    assert len(all_products_queries) == len(single_product_queries)
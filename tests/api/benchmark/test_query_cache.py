@@ -0,0 +1,49 @@
+import pytest
+
+from saleor.graphql.query_cache import document_cache, get_query_hash
+from tests.api.utils import get_graphql_content
+
+QUERY_SHOP = """
+    query ShopDetails {
+      shop {
+        name
+        description
+        domain {
+          host
+          url
+        }
+        defaultCountry {
+          code
+          country
+        }
+      }
+    }
+"""
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_repeated_query_uses_document_cache(api_client, count_queries):
+    get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+    get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+    get_graphql_content(api_client.post_graphql(QUERY_SHOP))
+
+    cache_info = document_cache.info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_persisted_query_by_hash(api_client, count_queries):
+    extensions = {
+        "persistedQuery": {"version": 1, "sha256Hash": get_query_hash(QUERY_SHOP)}
+    }
+    get_graphql_content(
+        api_client.post({"query": QUERY_SHOP, "extensions": extensions})
+    )
+
+    get_graphql_content(api_client.post({"extensions": extensions}))
+    get_graphql_content(api_client.post({"extensions": extensions}))
+
+    assert document_cache.info().hits == 2
@@ -1367,6 +1367,43 @@ def test_checkout_complete_insufficient_stock(
     assert orders_count == Order.objects.count()
 
 
+@mock.patch("saleor.graphql.checkout.mutations.create_order")
+def test_checkout_complete_releases_stock_when_order_not_created(
+    mock_create_order,
+    user_api_client,
+    checkout_with_item,
+    address,
+    payment_dummy,
+    shipping_method,
+):
+    mock_create_order.side_effect = Exception("Oops! Something went wrong.")
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.shipping_method = shipping_method
+    checkout.billing_address = address
+    checkout.save()
+    variant = checkout.lines.first().variant
+    quantity_allocated = variant.quantity_allocated
+    total = calculations.checkout_total(checkout)
+    payment = payment_dummy
+    payment.is_active = True
+    payment.order = None
+    payment.total = total.gross.amount
+    payment.currency = total.gross.currency
+    payment.checkout = checkout
+    payment.save()
+    checkout_id = graphene.Node.to_global_id("Checkout", checkout.pk)
+    variables = {"checkoutId": checkout_id, "redirectUrl": "https://www.example.com"}
+
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_COMPLETE, variables)
+
+    content = get_graphql_content(response, ignore_errors=True)
+    assert content["errors"][0]["message"] == "Oops! Something went wrong."
+    mock_create_order.assert_called_once()
+    variant.refresh_from_db()
+    assert variant.quantity_allocated == quantity_allocated
+
+
 def test_checkout_complete_without_redirect_url(
     user_api_client,
     checkout_with_gift_card,
@@ -1511,6 +1548,94 @@ def test_checkout_prices(user_api_client, checkout_with_item):
     assert data["subtotalPrice"]["gross"]["amount"] == (subtotal.gross.amount)
 
 
+def test_checkout_prices_calculated_once_per_request(
+    user_api_client, checkout_with_items, mocker
+):
+    query = """
+    query getCheckout($token: UUID!) {
+        checkout(token: $token) {
+            totalPrice {
+                gross {
+                    amount
+                }
+            }
+            subtotalPrice {
+                gross {
+                    amount
+                }
+            }
+            shippingPrice {
+                gross {
+                    amount
+                }
+            }
+            lines {
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+    }
+    """
+    spy = mocker.spy(ExtensionsManager, "calculate_checkout_line_total")
+    variables = {"token": str(checkout_with_items.token)}
+
+    response = user_api_client.post_graphql(query, variables)
+
+    content = get_graphql_content(response)
+    data = content["data"]["checkout"]
+    lines_count = checkout_with_items.lines.count()
+    assert spy.call_count == lines_count
+    line_totals = [line["totalPrice"]["gross"]["amount"] for line in data["lines"]]
+    assert len(line_totals) == lines_count
+    assert data["subtotalPrice"]["gross"]["amount"] == pytest.approx(sum(line_totals))
+
+
+def test_checkout_prices_recalculated_after_lines_change(
+    user_api_client, checkout_with_item
+):
+    query = """
+    mutation updateLines($checkoutId: ID!, $variantId: ID!) {
+        first: checkoutLinesUpdate(
+                checkoutId: $checkoutId,
+                lines: [{variantId: $variantId, quantity: 1}]) {
+            checkout {
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+        second: checkoutLinesUpdate(
+                checkoutId: $checkoutId,
+                lines: [{variantId: $variantId, quantity: 2}]) {
+            checkout {
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+        }
+    }
+    """
+    line = checkout_with_item.lines.get()
+    variables = {
+        "checkoutId": graphene.Node.to_global_id("Checkout", checkout_with_item.pk),
+        "variantId": graphene.Node.to_global_id("ProductVariant", line.variant_id),
+    }
+
+    response = user_api_client.post_graphql(query, variables)
+
+    content = get_graphql_content(response)
+    first_total = content["data"]["first"]["checkout"]["totalPrice"]["gross"]
+    second_total = content["data"]["second"]["checkout"]["totalPrice"]["gross"]
+    assert second_total["amount"] == pytest.approx(2 * first_total["amount"])
+
+
 MUTATION_UPDATE_SHIPPING_METHOD = """
     mutation checkoutShippingMethodUpdate(
             $checkoutId:ID!, $shippingMethodId:ID!){
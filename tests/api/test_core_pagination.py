@@ -0,0 +1,289 @@
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from graphql_relay.utils import base64
+from prices import Money
+
+from saleor.account.models import User
+from saleor.graphql.core.pagination import get_keyset_ordering
+from saleor.order.models import Order
+from saleor.product.models import Product
+
+from .utils import get_graphql_content
+
+QUERY_PRODUCTS_PAGE = """
+    query ($first: Int, $last: Int, $after: String, $before: String,
+           $sortBy: ProductOrder) {
+        products(first: $first, last: $last, after: $after, before: $before,
+                 sortBy: $sortBy) {
+            edges {
+                cursor
+                node {
+                    name
+                }
+            }
+            pageInfo {
+                hasNextPage
+                hasPreviousPage
+                startCursor
+                endCursor
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def products_for_pagination(product_type, category):
+    return Product.objects.bulk_create(
+        [
+            Product(
+                name=name,
+                price=Money(price, "USD"),
+                category=category,
+                product_type=product_type,
+                is_published=True,
+            )
+            for name, price in [
+                ("Product A", 10),
+                ("Product B", 5),
+                ("Product A", 10),
+                ("Product C", 20),
+                ("Product B", 15),
+            ]
+        ]
+    )
+
+
+def _get_names(content):
+    return [edge["node"]["name"] for edge in content["data"]["products"]["edges"]]
+
+
+def _get_page_info(content):
+    return content["data"]["products"]["pageInfo"]
+
+
+def test_keyset_ordering_ends_with_primary_key():
+    keys = get_keyset_ordering(Product.objects.order_by("-name"))
+
+    assert [(key.lookup, key.descending) for key in keys] == [
+        ("name", True),
+        ("pk", False),
+    ]
+
+
+def test_keyset_ordering_uses_default_ordering():
+    keys = get_keyset_ordering(Order.objects.all())
+
+    assert [(key.lookup, key.descending) for key in keys] == [("pk", True)]
+
+
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        Product.objects.order_by("?"),
+        Product.objects.order_by("category"),
+        Product.objects.order_by("variants__sku"),
+        Product.objects.order_by(F("name").asc(nulls_first=True)),
+        Product.objects.extra(order_by=["product_product.name"]),
+    ],
+)
+def test_keyset_ordering_not_supported(queryset):
+    assert get_keyset_ordering(queryset) is None
+
+
+@pytest.mark.parametrize(
+    "sort_by, expected_names",
+    [
+        (
+            {"field": "NAME", "direction": "ASC"},
+            ["Product A", "Product A", "Product B", "Product B", "Product C"],
+        ),
+        (
+            {"field": "NAME", "direction": "DESC"},
+            ["Product C", "Product B", "Product B", "Product A", "Product A"],
+        ),
+        (
+            {"field": "PRICE", "direction": "ASC"},
+            ["Product B", "Product A", "Product A", "Product B", "Product C"],
+        ),
+    ],
+)
+def test_paginate_products_forward(
+    sort_by, expected_names, staff_api_client, products_for_pagination
+):
+    names = []
+    variables = {"first": 2, "sortBy": sort_by}
+    while True:
+        content = get_graphql_content(
+            staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+        )
+        names += _get_names(content)
+        page_info = _get_page_info(content)
+        if not page_info["hasNextPage"]:
+            break
+        variables["after"] = page_info["endCursor"]
+
+    assert names == expected_names
+
+
+def test_paginate_products_backward(staff_api_client, products_for_pagination):
+    names = []
+    variables = {"last": 2, "sortBy": {"field": "NAME", "direction": "ASC"}}
+    while True:
+        content = get_graphql_content(
+            staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+        )
+        names = _get_names(content) + names
+        page_info = _get_page_info(content)
+        if not page_info["hasPreviousPage"]:
+            break
+        variables["before"] = page_info["startCursor"]
+
+    assert names == ["Product A", "Product A", "Product B", "Product B", "Product C"]
+
+
+def test_paginate_products_between_cursors(staff_api_client, products_for_pagination):
+    variables = {"first": 5, "sortBy": {"field": "NAME", "direction": "ASC"}}
+    content = get_graphql_content(
+        staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    )
+    cursors = [edge["cursor"] for edge in content["data"]["products"]["edges"]]
+
+    variables.update({"after": cursors[0], "before": cursors[4]})
+    content = get_graphql_content(
+        staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    )
+
+    assert _get_names(content) == ["Product A", "Product B", "Product B"]
+
+
+def test_paginate_products_with_offset_cursor(
+    staff_api_client, products_for_pagination
+):
+    variables = {
+        "first": 2,
+        "after": base64("arrayconnection:1"),
+        "sortBy": {"field": "NAME", "direction": "ASC"},
+    }
+    content = get_graphql_content(
+        staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    )
+
+    assert _get_names(content) == ["Product B", "Product B"]
+    assert _get_page_info(content)["hasNextPage"]
+
+
+def test_paginate_products_with_invalid_cursor(
+    staff_api_client, products_for_pagination
+):
+    variables = {"first": 2, "after": "invalid"}
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS_PAGE, variables)
+    content = get_graphql_content(response, ignore_errors=True)
+
+    assert content["errors"][0]["message"] == "Invalid cursor: invalid."
+
+
+def test_products_total_count_is_counted_only_when_requested(
+    staff_api_client, products_for_pagination
+):
+    query = """
+        query ($first: Int) {
+            products(first: $first) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+                %s
+            }
+        }
+    """
+    variables = {"first": 2}
+
+    with CaptureQueriesContext(connection) as queries:
+        get_graphql_content(staff_api_client.post_graphql(query % "", variables))
+    assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+    content = get_graphql_content(
+        staff_api_client.post_graphql(query % "totalCount", variables)
+    )
+    assert content["data"]["products"]["totalCount"] == len(products_for_pagination)
+
+
+def test_paginate_customers_by_order_count(
+    staff_api_client, permission_manage_users, order
+):
+    query = """
+        query ($after: String) {
+            customers(first: 1, after: $after,
+                      sortBy: {field: ORDER_COUNT, direction: DESC}) {
+                edges {
+                    node {
+                        email
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """
+    User.objects.create_user(email="first@example.com")
+    User.objects.create_user(email="second@example.com")
+    Order.objects.create(user=User.objects.get(email="second@example.com"))
+    staff_api_client.user.user_permissions.add(permission_manage_users)
+
+    emails = []
+    variables = {}
+    while True:
+        content = get_graphql_content(staff_api_client.post_graphql(query, variables))
+        data = content["data"]["customers"]
+        emails += [edge["node"]["email"] for edge in data["edges"]]
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        variables["after"] = data["pageInfo"]["endCursor"]
+
+    customers = User.objects.customers()
+    assert len(emails) == len(set(emails)) == customers.count()
+    assert emails[-1] == "first@example.com"
+
+
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_paginate_orders_by_nullable_field(
+    direction, staff_api_client, permission_manage_orders, order, address
+):
+    query = """
+        query ($after: String, $direction: OrderDirection!) {
+            orders(first: 1, after: $after,
+                   sortBy: {field: CUSTOMER, direction: $direction}) {
+                edges {
+                    node {
+                        id
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """
+    Order.objects.create(billing_address=None)
+    Order.objects.create(billing_address=address.get_copy())
+    Order.objects.create(billing_address=None)
+    staff_api_client.user.user_permissions.add(permission_manage_orders)
+
+    order_ids = []
+    variables = {"direction": direction}
+    while True:
+        content = get_graphql_content(staff_api_client.post_graphql(query, variables))
+        data = content["data"]["orders"]
+        order_ids += [edge["node"]["id"] for edge in data["edges"]]
+        if not data["pageInfo"]["hasNextPage"]:
+            break
+        variables["after"] = data["pageInfo"]["endCursor"]
+
+    assert len(order_ids) == len(set(order_ids)) == Order.objects.count()
@@ -5,7 +5,7 @@ import pytest
 from django.core.exceptions import ValidationError
 
 from saleor.graphql.menu.mutations import NavigationType, _validate_menu_item_instance
-from saleor.menu.models import Menu, MenuItem
+from saleor.menu.models import Menu, MenuItem, MenuItemTranslation
 from saleor.product.models import Category
 from tests.api.utils import get_graphql_content
 
@@ -51,6 +51,40 @@ def test_menu_query(user_api_client, menu):
     assert not content["data"]["menu"]
 
 
+def test_menu_query_reads_cached_menu(
+    user_api_client, menu, menu_item, django_assert_max_num_queries
+):
+    query = """
+    query menu($menu_name: String){
+        menu(name: $menu_name) {
+            name
+            items {
+                name
+                translation(languageCode: PL) {
+                    name
+                }
+                children {
+                    name
+                }
+            }
+        }
+    }
+    """
+    MenuItemTranslation.objects.create(
+        menu_item=menu_item, name="Polish Name", language_code="pl"
+    )
+    variables = {"menu_name": menu.name}
+    user_api_client.post_graphql(query, variables)
+
+    with django_assert_max_num_queries(10) as captured:
+        response = user_api_client.post_graphql(query, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["menu"]
+    assert data["items"][0]["translation"]["name"] == "Polish Name"
+    assert data["items"][0]["children"] == []
+    assert not any("menu_" in query["sql"] for query in captured.captured_queries)
+
+
 def test_menus_query(user_api_client, menu, menu_item):
     query = """
     query menus($menu_name: String){
@@ -1,8 +1,14 @@
 from unittest.mock import Mock
 
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
 from django.urls import reverse
+from graphql_jwt.shortcuts import get_token
 
-from saleor.graphql.middleware import service_account_middleware
+from saleor.account.cache import USER_PRINCIPAL, _get_lookup_key
+from saleor.account.models import User
+from saleor.core.auth_backend import JSONWebTokenBackend
+from saleor.graphql.middleware import get_service_account, service_account_middleware
 
 
 def test_service_account_middleware_accepts_api_requests(service_account, rf):
@@ -16,3 +22,90 @@ def test_service_account_middleware_accepts_api_requests(service_account, rf):
     middleware(request)
 
     assert request.service_account == service_account
+
+
+def test_get_service_account_caches_account_with_permissions(
+    service_account, permission_manage_products, django_assert_num_queries
+):
+    service_account.permissions.add(permission_manage_products)
+    token = service_account.tokens.first().auth_token
+    get_service_account(token)
+
+    with django_assert_num_queries(0):
+        cached_account = get_service_account(token)
+        assert cached_account == service_account
+        assert cached_account.has_perm("product.manage_products")
+
+
+def test_get_service_account_permissions_change_invalidates_cache(
+    service_account, permission_manage_products
+):
+    token = service_account.tokens.first().auth_token
+    assert not get_service_account(token).has_perm("product.manage_products")
+
+    service_account.permissions.add(permission_manage_products)
+
+    assert get_service_account(token).has_perm("product.manage_products")
+
+
+def test_get_service_account_revoked_token_invalidates_cache(service_account):
+    token = service_account.tokens.first()
+    assert get_service_account(token.auth_token) == service_account
+
+    token.delete()
+
+    assert get_service_account(token.auth_token) is None
+
+
+def test_jwt_backend_caches_user_with_permissions(
+    staff_user, permission_manage_orders, rf, django_assert_num_queries
+):
+    staff_user.user_permissions.add(permission_manage_orders)
+    request = rf.get(reverse("api"), HTTP_AUTHORIZATION=f"JWT {get_token(staff_user)}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    with django_assert_num_queries(0):
+        user = backend.authenticate(request)
+        assert user == staff_user
+        assert user.has_perm("order.manage_orders")
+
+
+def test_jwt_backend_permissions_change_invalidates_cache(
+    staff_user, permission_manage_orders, rf
+):
+    request = rf.get(reverse("api"), HTTP_AUTHORIZATION=f"JWT {get_token(staff_user)}")
+    backend = JSONWebTokenBackend()
+    assert not backend.authenticate(request).has_perm("order.manage_orders")
+
+    permission_manage_orders.user_set.add(staff_user)
+
+    assert backend.authenticate(request).has_perm("order.manage_orders")
+
+    Permission.objects.get(pk=permission_manage_orders.pk).user_set.clear()
+
+    assert not backend.authenticate(request).has_perm("order.manage_orders")
+
+
+def test_jwt_backend_caches_only_auth_data_of_user(
+    staff_user, permission_manage_orders, rf, django_assert_num_queries
+):
+    staff_user.user_permissions.add(permission_manage_orders)
+    request = rf.get(reverse("api"), HTTP_AUTHORIZATION=f"JWT {get_token(staff_user)}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    key = _get_lookup_key(USER_PRINCIPAL, staff_user.email)
+    pk, is_active, permissions, _ = cache.get(key)
+    assert (pk, is_active, permissions) == (
+        staff_user.pk,
+        True,
+        frozenset({"order.manage_orders"}),
+    )
+
+    user = backend.authenticate(request)
+    with django_assert_num_queries(1):
+        assert user.email == staff_user.email
+        assert user.first_name == staff_user.first_name
+    assert isinstance(user, User)
+    assert user.has_perm("order.manage_orders")
@@ -1897,6 +1897,7 @@ def test_draft_order_clear_shipping_method(
     assert draft_order.shipping_method_name is None
 
 
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
 def test_orders_total(staff_api_client, permission_manage_orders, order_with_lines):
     query = """
     query Orders($period: ReportingPeriod) {
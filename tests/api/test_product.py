@@ -2394,6 +2394,7 @@ def test_stock_availability_filter(user_api_client, product):
     assert content["data"]["products"]["totalCount"] == 0
 
 
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
 def test_report_product_sales(
     staff_api_client,
     order_with_lines,
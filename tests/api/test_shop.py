@@ -394,6 +394,31 @@ def test_shop_settings_mutation(
     assert site_settings.charge_taxes_on_shipping == new_charge_taxes_on_shipping
 
 
+def test_shop_settings_mutation_invalid_value_not_cached(
+    staff_api_client, site_settings, permission_manage_settings
+):
+    query = """
+        mutation updateSettings($input: ShopSettingsInput!) {
+            shopSettingsUpdate(input: $input) {
+                shopErrors {
+                    field
+                    code
+                }
+            }
+        }
+    """
+    header_text = site_settings.header_text
+    variables = {"input": {"headerText": "x" * 300}}
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_settings]
+    )
+    content = get_graphql_content(response)
+    errors = content["data"]["shopSettingsUpdate"]["shopErrors"]
+    assert errors[0]["field"] == "headerText"
+    assert errors[0]["code"] == ShopErrorCode.INVALID.name
+    assert Site.objects.get_current().settings.header_text == header_text
+
+
 MUTATION_UPDATE_DEFAULT_MAIL_SENDER_SETTINGS = """
     mutation updateDefaultSenderSettings($input: ShopSettingsInput!) {
       shopSettingsUpdate(input: $input) {
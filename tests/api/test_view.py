@@ -1,12 +1,21 @@
 import logging
+import threading
+import time
 from unittest import mock
 
 import graphene
 import pytest
 from django.test import override_settings
 
+from saleor.graphql.api import schema
+from saleor.graphql.batch import shutdown_batch_executor
 from saleor.graphql.product.types import Product
-from saleor.graphql.views import handled_errors_logger, unhandled_errors_logger
+from saleor.graphql.query_cache import DocumentCache, document_cache, get_query_hash
+from saleor.graphql.views import (
+    GraphQLView,
+    handled_errors_logger,
+    unhandled_errors_logger,
+)
 
 from .conftest import API_PATH
 from .utils import _get_graphql_content_from_response, get_graphql_content
@@ -52,6 +61,129 @@ def test_batch_queries(category, product, api_client):
     assert data["category"]["name"] == category.name
 
 
+@pytest.fixture
+def batch_executor(settings):
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 4
+    yield
+    shutdown_batch_executor()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_queries_executed_concurrently(
+    batch_executor, category, product, api_client
+):
+    query_product = """
+        query GetProduct($id: ID!) {
+            product(id: $id) {
+                name
+            }
+        }
+    """
+    query_category = """
+        query GetCategory($id: ID!) {
+            category(id: $id) {
+                name
+            }
+        }
+    """
+    data = [
+        {
+            "query": query_category,
+            "variables": {"id": graphene.Node.to_global_id("Category", category.pk)},
+        },
+        {
+            "query": query_product,
+            "variables": {"id": graphene.Node.to_global_id("Product", product.pk)},
+        },
+    ]
+    response = api_client.post(data)
+    batch_content = get_graphql_content(response)
+    assert batch_content[0]["data"]["category"]["name"] == category.name
+    assert batch_content[1]["data"]["product"]["name"] == product.name
+
+
+@mock.patch.object(GraphQLView, "get_response")
+def test_batch_mutations_keep_order(mocked_get_response, batch_executor, api_client):
+    events = []
+    lock = threading.Lock()
+
+    def get_response(request, data, document=None):
+        name = data["operationName"]
+        with lock:
+            events.append(("start", name))
+        time.sleep(0.05)
+        with lock:
+            events.append(("end", name))
+        return {"data": name}, 200
+
+    mocked_get_response.side_effect = get_response
+    query = "query %s { shop { name } }"
+    mutation = 'mutation %s { tokenVerify(token: "") { isValid } }'
+    data = [
+        {"query": query % "first", "operationName": "first"},
+        {"query": query % "second", "operationName": "second"},
+        {"query": mutation % "third", "operationName": "third"},
+        {"query": query % "fourth", "operationName": "fourth"},
+    ]
+
+    response = api_client.post(data)
+
+    content = _get_graphql_content_from_response(response)
+    assert content == [
+        {"data": name} for name in ("first", "second", "third", "fourth")
+    ]
+    # queries preceding the mutation run concurrently
+    assert {events[0], events[1]} == {("start", "first"), ("start", "second")}
+    # the mutation runs alone, after preceding operations and before next ones
+    assert events[4:] == [
+        ("start", "third"),
+        ("end", "third"),
+        ("start", "fourth"),
+        ("end", "fourth"),
+    ]
+
+
+@mock.patch.object(GraphQLView, "get_response")
+def test_batch_operations_get_separate_contexts(
+    mocked_get_response, batch_executor, api_client
+):
+    contexts = []
+
+    def get_response(request, data, document=None):
+        # Loaders of the other operation aren't visible
+        assert not hasattr(request, "dataloaders")
+        request.dataloaders = {}
+        contexts.append(request)
+        return {"data": data["operationName"]}, 200
+
+    mocked_get_response.side_effect = get_response
+    query = "query %s { shop { name } }"
+    data = [
+        {"query": query % "first", "operationName": "first"},
+        {"query": query % "second", "operationName": "second"},
+    ]
+
+    content = _get_graphql_content_from_response(api_client.post(data))
+
+    assert content == [{"data": "first"}, {"data": "second"}]
+    assert contexts[0] is not contexts[1]
+
+
+@mock.patch("saleor.graphql.batch.connections")
+def test_batch_worker_closes_database_connections(
+    mocked_connections, batch_executor, api_client
+):
+    query = "query %s { shop { name } }"
+    data = [
+        {"query": query % "first", "operationName": "first"},
+        {"query": query % "second", "operationName": "second"},
+    ]
+
+    get_graphql_content(api_client.post(data))
+
+    assert mocked_connections.close_all.call_count == 2
+
+
 def test_graphql_view_get_in_non_debug_mode(client):
     response = client.get(API_PATH)
     assert response.status_code == 405
@@ -232,3 +364,82 @@ def test_unexpected_exceptions_are_logged_in_their_own_logger(
     assert graphql_log_handler.messages == [
         "saleor.graphql.errors.unhandled[ERROR].NotImplementedError"
     ]
+
+
+def test_query_document_is_cached(api_client):
+    query = "{ shop { name } }"
+    cache_key = (schema, get_query_hash(query))
+
+    get_graphql_content(api_client.post_graphql(query))
+    get_graphql_content(api_client.post_graphql(query))
+
+    assert document_cache.get(cache_key) is not None
+    assert document_cache.info().currsize == 1
+
+
+def test_invalid_query_document_is_not_cached(api_client):
+    response = api_client.post_graphql("{ shop }")
+    assert response.status_code == 400
+    assert document_cache.info().currsize == 0
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(maxsize=2)
+    cache.set("a", mock.sentinel.a)
+    cache.set("b", mock.sentinel.b)
+    assert cache.get("a") is mock.sentinel.a
+
+    cache.set("c", mock.sentinel.c)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is mock.sentinel.a
+    assert cache.get("c") is mock.sentinel.c
+    assert cache.info() == (3, 1, 2, 2)
+
+
+def _get_persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_persisted_query_not_found(api_client):
+    query_hash = get_query_hash("{ shop { name } }")
+    response = api_client.post(
+        {"extensions": _get_persisted_query_extensions(query_hash)}
+    )
+    assert response.status_code == 200
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    query = "{ shop { name } }"
+    extensions = _get_persisted_query_extensions(get_query_hash(query))
+
+    response = api_client.post({"query": query, "extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+    response = api_client.post({"extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    extensions = _get_persisted_query_extensions(get_query_hash("{ shop { name } }"))
+    response = api_client.post(
+        {"query": "{ shop { domain { host } } }", "extensions": extensions}
+    )
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256 hash does not match the query."
+    )
+
+
+def test_persisted_query_unsupported_version(api_client):
+    query = "{ shop { name } }"
+    extensions = {"persistedQuery": {"version": 2, "sha256Hash": "abc"}}
+    response = api_client.post({"query": query, "extensions": extensions})
+    assert response.status_code == 400
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
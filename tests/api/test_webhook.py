@@ -6,6 +6,7 @@ import pytest
 from saleor.account.models import ServiceAccount
 from saleor.graphql.webhook.enums import WebhookEventTypeEnum
 from saleor.webhook import WebhookEventType
+from saleor.webhook.cache import webhooks_index
 from saleor.webhook.models import Webhook
 
 from .utils import assert_no_permission, get_graphql_content
@@ -307,6 +308,26 @@ def test_webhook_update_by_staff(
     assert events[0].event_type == WebhookEventTypeEnum.CUSTOMER_CREATED.value
 
 
+def test_webhook_update_invalidates_webhooks_index(
+    staff_api_client, webhook, permission_manage_webhooks, permission_manage_orders
+):
+    webhook.service_account.permissions.add(permission_manage_orders)
+    assert webhooks_index.get(WebhookEventType.ORDER_UPDATED) == []
+    variables = {
+        "id": graphene.Node.to_global_id("Webhook", webhook.pk),
+        "events": [WebhookEventTypeEnum.ORDER_UPDATED.name],
+    }
+    staff_api_client.user.user_permissions.add(permission_manage_webhooks)
+
+    response = staff_api_client.post_graphql(WEBHOOK_UPDATE, variables=variables)
+
+    get_graphql_content(response)
+    assert [info.pk for info in webhooks_index.get(WebhookEventType.ORDER_UPDATED)] == [
+        webhook.pk
+    ]
+    assert webhooks_index.get(WebhookEventType.ORDER_CREATED) == []
+
+
 def test_webhook_update_by_staff_without_permission(
     staff_api_client, service_account, webhook
 ):
@@ -439,11 +460,11 @@ QUERY_WEBHOOKS_WITH_SORT = """
         ({"field": "NAME", "direction": "DESC"}, ["hook2", "hook1", "backup"]),
         (
             {"field": "SERVICE_ACCOUNT", "direction": "ASC"},
-            ["hook2", "backup", "hook1"],
+            ["hook2", "hook1", "backup"],
         ),
         (
             {"field": "SERVICE_ACCOUNT", "direction": "DESC"},
-            ["backup", "hook1", "hook2"],
+            ["hook1", "backup", "hook2"],
         ),
         ({"field": "TARGET_URL", "direction": "ASC"}, ["hook2", "hook1", "backup"]),
         ({"field": "TARGET_URL", "direction": "DESC"}, ["backup", "hook1", "hook2"]),
@@ -11,6 +11,7 @@ import pytest
 from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -30,8 +31,10 @@ from saleor.account.models import (
 from saleor.checkout import utils
 from saleor.checkout.models import Checkout
 from saleor.checkout.utils import add_variant_to_checkout
+from saleor.core.cache import CacheVersion
 from saleor.core.payments import PaymentInterface
 from saleor.discount import DiscountInfo, DiscountValueType, VoucherType
+from saleor.discount.cache import discounts_cache
 from saleor.discount.models import (
     Sale,
     SaleTranslation,
@@ -39,7 +42,10 @@ from saleor.discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from saleor.extensions.cache import plugin_configurations_cache
 from saleor.giftcard.models import GiftCard
+from saleor.graphql.query_cache import document_cache
+from saleor.menu.cache import menus_cache
 from saleor.menu.models import Menu, MenuItem, MenuItemTranslation
 from saleor.menu.utils import update_menu
 from saleor.order import OrderStatus
@@ -51,6 +57,7 @@ from saleor.page.models import Page, PageTranslation
 from saleor.payment import ChargeStatus, TransactionKind
 from saleor.payment.models import Payment
 from saleor.product import AttributeInputType
+from saleor.product.cache import attributes_index, categories_tree_cache
 from saleor.product.models import (
     Attribute,
     AttributeTranslation,
@@ -77,8 +84,10 @@ from saleor.shipping.models import (
     ShippingZone,
 )
 from saleor.site import AuthenticationBackends
+from saleor.site.cache import sites_cache
 from saleor.site.models import AuthorizationKey, SiteSettings
 from saleor.webhook import WebhookEventType
+from saleor.webhook.cache import webhooks_index
 from saleor.webhook.models import Webhook
 from tests.utils import create_image
 
@@ -174,6 +183,39 @@ def setup_dummy_gateway(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Drop shared and process-level caches so tests don't leak state."""
+    cache.clear()
+    discounts_cache.clear()
+    document_cache.clear()
+    plugin_configurations_cache.clear()
+    webhooks_index.clear()
+    attributes_index.clear()
+    categories_tree_cache.clear()
+    menus_cache.clear()
+    sites_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def change_cache_versions_right_away(monkeypatch):
+    """Invalidate cached data as if the changes were committed.
+
+    Tests run in transactions which are never committed, so the versions of
+    cached data wouldn't be changed otherwise.
+    """
+    monkeypatch.setattr(CacheVersion, "invalidate", CacheVersion.change)
+
+
+@pytest.fixture
+def daily_sales_updated_right_away(monkeypatch):
+    """Update daily sales of changed orders as if the changes were committed.
+
+    Every function run on commit of the test's transaction is run right away.
+    """
+    monkeypatch.setattr("saleor.order.sales.transaction.on_commit", lambda func: func())
+
+
 @pytest.fixture(autouse=True)
 def site_settings(db, settings) -> SiteSettings:
     """Create a site and matching site settings.
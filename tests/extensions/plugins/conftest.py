@@ -1,7 +1,13 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from django_prices_vatlayer.models import VAT
 from django_prices_vatlayer.utils import get_tax_for_rate
 
+from saleor.extensions.plugins.webhook.delivery import close_sessions
+
 
 @pytest.fixture
 def tax_rates():
@@ -64,3 +70,51 @@ def vatlayer(db, settings, tax_rates, taxes):
     }
     VAT.objects.create(country_code="DE", data=tax_rates_2)
     return taxes
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.client_ports.add(self.client_address[1])
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            server.received.append((self.path, body.decode(), time.monotonic()))
+        self.send_response(500 if self.path.startswith("/fail") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_stub_server_factory(settings):
+    """Return a factory of local HTTP servers recording received webhooks."""
+    servers = []
+
+    def create_server(delay=0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookStubHandler)
+        server.daemon_threads = True
+        server.delay = delay
+        server.lock = threading.Lock()
+        server.active = 0
+        server.max_active = 0
+        server.client_ports = set()
+        server.received = []
+        server.url = "http://127.0.0.1:%d" % server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield create_server
+    close_sessions()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
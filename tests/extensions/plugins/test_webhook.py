@@ -1,3 +1,4 @@
+import time
 from unittest import mock
 
 import pytest
@@ -7,8 +8,13 @@ from django.core.serializers import serialize
 from saleor.account.models import ServiceAccount
 from saleor.extensions.manager import get_extensions_manager
 from saleor.extensions.plugins.webhook import create_hmac_signature
-from saleor.extensions.plugins.webhook.tasks import trigger_webhooks_for_event
+from saleor.extensions.plugins.webhook.delivery import WebhookDelivery, deliver_webhooks
+from saleor.extensions.plugins.webhook.tasks import (
+    send_webhooks_to_endpoint,
+    trigger_webhooks_for_event,
+)
 from saleor.webhook import WebhookEventType
+from saleor.webhook.cache import WebhookInfo, webhooks_index
 from saleor.webhook.payloads import (
     generate_customer_payload,
     generate_order_payload,
@@ -17,8 +23,8 @@ from saleor.webhook.payloads import (
 
 
 @pytest.mark.vcr
-@mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
+@mock.patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
 )
 def test_trigger_webhooks_for_event(
     mock_request,
@@ -42,7 +48,11 @@ def test_trigger_webhooks_for_event(
     }
 
     mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
+        mock.ANY,
+        webhook.target_url,
+        data=expected_data,
+        headers=expected_headers,
+        timeout=10,
     )
 
 
@@ -62,9 +72,9 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhooks_to_endpoint.delay")
 def test_trigger_webhooks_for_event_calls_expected_events(
-    mock_request,
+    mock_send_webhooks_to_endpoint,
     event_name,
     total_webhook_calls,
     expected_target_urls,
@@ -102,15 +112,20 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
-
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
+    deliveries = [
+        delivery
+        for (endpoint_deliveries,), _ in mock_send_webhooks_to_endpoint.call_args_list
+        for delivery in endpoint_deliveries
+    ]
+    assert len(deliveries) == total_webhook_calls
+
+    target_url_calls = {delivery.target_url for delivery in deliveries}
     assert target_url_calls == expected_target_urls
 
 
 @pytest.mark.vcr
-@mock.patch(
-    "saleor.extensions.plugins.webhook.tasks.requests.post", wraps=requests.post
+@mock.patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
 )
 def test_trigger_webhooks_for_event_with_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
@@ -133,12 +148,32 @@ def test_trigger_webhooks_for_event_with_secret_key(
     }
 
     mock_request.assert_called_once_with(
-        webhook.target_url, data=expected_data, headers=expected_headers, timeout=10
+        mock.ANY,
+        webhook.target_url,
+        data=expected_data,
+        headers=expected_headers,
+        timeout=10,
     )
 
 
+@pytest.fixture
+def subscribed_webhook(
+    webhook,
+    permission_manage_orders,
+    permission_manage_users,
+    permission_manage_products,
+):
+    webhook.service_account.permissions.add(
+        permission_manage_orders, permission_manage_users, permission_manage_products
+    )
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_created(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_created(order_with_lines)
@@ -150,7 +185,9 @@ def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+def test_customer_created(
+    mocked_webhook_trigger, settings, subscribed_webhook, customer_user
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.customer_created(customer_user)
@@ -162,7 +199,9 @@ def test_customer_created(mocked_webhook_trigger, settings, customer_user):
 
 
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_fully_paid(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_fully_paid(order_with_lines)
@@ -174,7 +213,7 @@ def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+def test_product_created(mocked_webhook_trigger, settings, subscribed_webhook, product):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.product_created(product)
@@ -186,7 +225,9 @@ def test_product_created(mocked_webhook_trigger, settings, product):
 
 
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_updated(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_updated(order_with_lines)
@@ -198,7 +239,9 @@ def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_cancelled(
+    mocked_webhook_trigger, settings, subscribed_webhook, order_with_lines
+):
     settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_extensions_manager()
     manager.order_cancelled(order_with_lines)
@@ -207,3 +250,177 @@ def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
     mocked_webhook_trigger.assert_called_once_with(
         WebhookEventType.ORDER_CANCELLED, expected_data
     )
+
+
+@mock.patch("saleor.extensions.plugins.webhook.plugin.generate_order_payload")
+@mock.patch("saleor.extensions.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+def test_order_created_without_subscribers(
+    mocked_webhook_trigger,
+    mocked_generate_order_payload,
+    settings,
+    webhook,
+    permission_manage_users,
+    order_with_lines,
+):
+    # The webhook's service account isn't allowed to receive order events
+    webhook.service_account.permissions.add(permission_manage_users)
+    settings.PLUGINS = ["saleor.extensions.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_extensions_manager()
+    manager.order_created(order_with_lines)
+
+    mocked_generate_order_payload.assert_not_called()
+    mocked_webhook_trigger.assert_not_called()
+
+
+def _create_deliveries(url, count, event_type=WebhookEventType.ORDER_CREATED):
+    return [
+        WebhookDelivery(index, url, None, event_type, "payload-%d" % index)
+        for index in range(count)
+    ]
+
+
+def test_deliver_webhooks_reuses_connections(
+    webhook_stub_server_factory, site_settings, settings
+):
+    settings.WEBHOOK_MAX_CONNECTIONS_PER_HOST = 2
+    server = webhook_stub_server_factory()
+    deliveries = _create_deliveries(server.url + "/hook/", 20)
+
+    failed = deliver_webhooks(deliveries)
+
+    assert failed == []
+    assert sorted(body for _, body, _ in server.received) == sorted(
+        delivery.data for delivery in deliveries
+    )
+    assert len(server.client_ports) <= 2
+    assert server.max_active <= 2
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("deliveries_count", [1000])
+def test_deliver_webhooks_benchmark(
+    deliveries_count, webhook_stub_server_factory, site_settings, record_property
+):
+    server = webhook_stub_server_factory()
+    deliveries = _create_deliveries(server.url + "/hook/", deliveries_count)
+
+    started_at = time.monotonic()
+    for delivery in deliveries:
+        with requests.Session() as session:
+            session.post(delivery.target_url, data=delivery.data, timeout=10)
+    seconds_without_pool = time.monotonic() - started_at
+
+    started_at = time.monotonic()
+    assert deliver_webhooks(deliveries) == []
+    seconds_with_pool = time.monotonic() - started_at
+
+    # Deliveries per second to a local endpoint, reported in the JUnit XML
+    record_property(
+        "deliveries_per_second_without_pool", len(deliveries) / seconds_without_pool
+    )
+    record_property(
+        "deliveries_per_second_with_pool", len(deliveries) / seconds_with_pool
+    )
+    assert len(server.received) == 2 * len(deliveries)
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhooks_to_endpoint.delay")
+def test_trigger_webhooks_for_event_queues_task_per_endpoint(
+    mock_send_webhooks_to_endpoint, service_account, permission_manage_orders
+):
+    service_account.permissions.add(permission_manage_orders)
+    target_urls = [
+        "http://www.example.com/first/",
+        "http://www.example.com/second/",
+        "https://slow.example.com/",
+    ]
+    for target_url in target_urls:
+        webhook = service_account.webhooks.create(target_url=target_url)
+        webhook.events.create(event_type=WebhookEventType.ORDER_CREATED)
+
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "payload")
+
+    queued_target_urls = [
+        [delivery.target_url for delivery in deliveries]
+        for (deliveries,), _ in mock_send_webhooks_to_endpoint.call_args_list
+    ]
+    assert sorted(queued_target_urls) == [target_urls[:2], target_urls[2:]]
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.send_webhook_request")
+def test_trigger_webhooks_for_event_retries_failed_deliveries(
+    mock_send_webhook_request,
+    webhook_stub_server_factory,
+    webhook,
+    permission_manage_orders,
+):
+    server = webhook_stub_server_factory()
+    webhook.service_account.permissions.add(permission_manage_orders)
+    webhook.target_url = server.url + "/fail/"
+    webhook.save()
+
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "payload")
+
+    mock_send_webhook_request.apply_async.assert_called_once_with(
+        args=WebhookDelivery(
+            webhook.pk,
+            webhook.target_url,
+            webhook.secret_key,
+            WebhookEventType.ORDER_CREATED,
+            "payload",
+        ),
+        countdown=60,
+    )
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.deliver_webhooks")
+def test_trigger_webhooks_for_event_uses_cached_index(
+    mock_deliver_webhooks, webhook, permission_manage_orders, django_assert_num_queries
+):
+    webhook.service_account.permissions.add(permission_manage_orders)
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "payload")
+
+    # Only secret keys of the webhooks are read by the delivery task
+    with django_assert_num_queries(1):
+        trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "payload")
+
+    (deliveries,), _ = mock_deliver_webhooks.call_args
+    assert [delivery.webhook_id for delivery in deliveries] == [webhook.pk]
+
+
+@mock.patch("saleor.extensions.plugins.webhook.tasks.deliver_webhooks", return_value=[])
+def test_send_webhooks_to_endpoint_reads_secret_keys(mock_deliver_webhooks, webhook):
+    webhook.secret_key = "secret_key"
+    webhook.save()
+    delivery = WebhookDelivery(
+        webhook.pk, webhook.target_url, None, WebhookEventType.ORDER_CREATED, "data"
+    )
+    deleted_webhook_delivery = delivery._replace(webhook_id=webhook.pk + 1)
+
+    send_webhooks_to_endpoint([delivery, deleted_webhook_delivery])
+
+    mock_deliver_webhooks.assert_called_once_with(
+        [delivery._replace(secret="secret_key")]
+    )
+
+
+def test_webhooks_index_invalidated_on_subscription_changes(
+    webhook, permission_manage_orders
+):
+    service_account = webhook.service_account
+    service_account.permissions.add(permission_manage_orders)
+    assert webhooks_index.get(WebhookEventType.ORDER_CREATED) == [
+        WebhookInfo(webhook.pk, webhook.target_url)
+    ]
+    assert webhooks_index.get(WebhookEventType.ORDER_UPDATED) == []
+
+    webhook.events.create(event_type=WebhookEventType.ORDER_UPDATED)
+    assert len(webhooks_index.get(WebhookEventType.ORDER_UPDATED)) == 1
+
+    service_account.permissions.remove(permission_manage_orders)
+    assert webhooks_index.get(WebhookEventType.ORDER_UPDATED) == []
+
+    service_account.permissions.add(permission_manage_orders)
+    service_account.is_active = False
+    service_account.save()
+    assert webhooks_index.get(WebhookEventType.ORDER_CREATED) == []
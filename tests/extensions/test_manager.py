@@ -301,3 +301,70 @@ def test_manager_serve_list_all_payment_gateways():
     ]
     manager = ExtensionsManager(plugins=plugins)
     assert manager.list_payment_gateways(active_only=False) == expected_gateways
+
+
+def test_manager_hooks_include_only_overriding_plugins():
+    plugins = [
+        "tests.extensions.sample_plugins.PluginSample",
+        "tests.extensions.sample_plugins.PluginInactive",
+    ]
+    manager = ExtensionsManager(plugins=plugins)
+    plugin_sample = manager.get_plugin(PluginSample.PLUGIN_NAME)
+
+    assert manager.hooks["calculate_checkout_total"] == [
+        plugin_sample.calculate_checkout_total
+    ]
+    assert manager.hooks["order_created"] == []
+
+
+def test_manager_returns_default_value_for_hook_without_plugins(mocker):
+    manager = ExtensionsManager(
+        plugins=["tests.extensions.sample_plugins.PluginInactive"]
+    )
+    spy = mocker.spy(PluginInactive, "show_taxes_on_storefront")
+
+    assert manager.show_taxes_on_storefront() is False
+    spy.assert_not_called()
+
+
+def test_plugin_configurations_are_fetched_once_for_all_managers(
+    plugin_configuration, inactive_plugin_configuration, django_assert_num_queries
+):
+    plugins = [
+        "tests.extensions.sample_plugins.PluginSample",
+        "tests.extensions.sample_plugins.PluginInactive",
+    ]
+    with django_assert_num_queries(1):
+        for _ in range(3):
+            manager = ExtensionsManager(plugins=plugins)
+            for plugin in manager.plugins:
+                plugin._initialize_plugin_configuration()
+
+    assert manager.get_plugin(PluginSample.PLUGIN_NAME).active
+    assert not manager.get_plugin(PluginInactive.PLUGIN_NAME).active
+
+
+def test_plugin_configurations_cache_invalidated_on_save(plugin_configuration):
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    manager = ExtensionsManager(plugins=plugins)
+    plugin = manager.get_plugin(PluginSample.PLUGIN_NAME)
+    plugin._initialize_plugin_configuration()
+    assert plugin.active
+
+    manager.save_plugin_configuration(PluginSample.PLUGIN_NAME, {"active": False})
+
+    manager = ExtensionsManager(plugins=plugins)
+    plugin = manager.get_plugin(PluginSample.PLUGIN_NAME)
+    plugin._initialize_plugin_configuration()
+    assert not plugin.active
+
+
+def test_managers_dont_share_plugin_instances(plugin_configuration):
+    plugins = ["tests.extensions.sample_plugins.PluginSample"]
+    first_plugin = ExtensionsManager(plugins=plugins).plugins[0]
+    second_plugin = ExtensionsManager(plugins=plugins).plugins[0]
+    first_plugin._initialize_plugin_configuration()
+    second_plugin._initialize_plugin_configuration()
+
+    assert first_plugin is not second_plugin
+    assert first_plugin._cached_config is not second_plugin._cached_config
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from saleor.product.cache import categories_tree_cache
 from saleor.product.models import Category
 from saleor.product.utils import collect_categories_tree_products, delete_categories
 
@@ -41,3 +42,41 @@ def test_delete_categories(
         assert not product.category
         assert not product.is_published
         assert not product.publication_date
+
+
+def test_categories_tree_cache_descendant_ids(categories_tree):
+    parent = categories_tree
+    child = parent.children.first()
+    grandchild = child.children.create(name="Grandchild", slug="grandchild")
+
+    assert categories_tree_cache.get_descendant_ids([parent.pk]) == {
+        parent.pk,
+        child.pk,
+        grandchild.pk,
+    }
+    assert categories_tree_cache.get_descendant_ids([child.pk], include_self=False) == {
+        grandchild.pk
+    }
+    assert categories_tree_cache.get_descendant_ids([grandchild.pk + 1]) == set()
+
+
+def test_categories_tree_cache_kept_in_process_memory(
+    categories_tree, django_assert_num_queries
+):
+    categories_tree_cache.get_descendant_ids([categories_tree.pk])
+
+    with django_assert_num_queries(0):
+        categories_tree_cache.get_descendant_ids([categories_tree.pk])
+
+
+def test_categories_tree_cache_invalidated_on_tree_changes(categories_tree):
+    parent = categories_tree
+    child = parent.children.first()
+    other = Category.objects.create(name="Other", slug="other")
+    assert categories_tree_cache.get_descendant_ids([other.pk]) == {other.pk}
+
+    child.move_to(other)
+    assert categories_tree_cache.get_descendant_ids([other.pk]) == {other.pk, child.pk}
+
+    child.delete()
+    assert categories_tree_cache.get_descendant_ids([other.pk]) == {other.pk}
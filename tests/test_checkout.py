@@ -13,6 +13,7 @@ from saleor.account.utils import store_user_address
 from saleor.checkout import AddressType, calculations
 from saleor.checkout.models import Checkout
 from saleor.checkout.utils import (
+    abort_order_data,
     add_variant_to_checkout,
     add_voucher_to_checkout,
     change_billing_address_in_checkout,
@@ -142,6 +143,30 @@ def test_create_order_insufficient_stock(
         )
 
 
+def test_prepare_order_data_allocates_stock(
+    checkout_with_item, customer_user, shipping_method
+):
+    checkout = checkout_with_item
+    checkout.user = customer_user
+    checkout.billing_address = customer_user.default_billing_address
+    checkout.shipping_address = customer_user.default_billing_address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+    line = checkout.lines.get()
+    variant = line.variant
+    quantity_allocated = variant.quantity_allocated
+
+    order_data = prepare_order_data(checkout=checkout, tracking_code="", discounts=None)
+
+    variant.refresh_from_db()
+    assert variant.quantity_allocated == quantity_allocated + line.quantity
+
+    abort_order_data(order_data)
+
+    variant.refresh_from_db()
+    assert variant.quantity_allocated == quantity_allocated
+
+
 def test_create_order_doesnt_duplicate_order(
     checkout_with_item, customer_user, shipping_method
 ):
@@ -986,3 +1011,27 @@ def test_store_user_address_create_new_address_if_not_associated(address):
 
     assert user.addresses.count() == expected_user_addresses_count
     assert user.default_billing_address_id != address.pk
+
+
+def test_checkout_prices_match_separate_calculations(
+    checkout_with_items, address, shipping_method, mocker
+):
+    checkout = checkout_with_items
+    checkout.shipping_address = address
+    checkout.shipping_method = shipping_method
+    checkout.discount = Money(5, "USD")
+    checkout.save()
+    manager = get_extensions_manager()
+    spy = mocker.spy(manager, "calculate_checkout_line_total")
+
+    prices = calculations.checkout_prices(
+        checkout, checkout.lines.all(), manager=manager
+    )
+
+    assert spy.call_count == checkout.lines.count()
+    assert prices.line_totals == {
+        line.pk: calculations.checkout_line_total(line) for line in checkout
+    }
+    assert prices.subtotal == calculations.checkout_subtotal(checkout)
+    assert prices.shipping_price == calculations.checkout_shipping_price(checkout)
+    assert prices.total == calculations.checkout_total(checkout)
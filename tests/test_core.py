@@ -10,6 +10,7 @@ from measurement.measures import Weight
 
 from saleor.account.models import Address, User
 from saleor.account.utils import create_superuser
+from saleor.core.cache import CacheVersion, get_cache_timeout
 from saleor.core.storages import S3MediaStorage
 from saleor.core.templatetags.placeholder import placeholder
 from saleor.core.utils import (
@@ -248,3 +249,45 @@ def test_placeholder(settings):
     size = 60
     result = placeholder(size)
     assert result == "/static/" + settings.PLACEHOLDER_IMAGES[size]
+
+
+# Tests change versions right away, the original method waits for the commit
+invalidate_on_commit = CacheVersion.invalidate
+
+
+def test_cache_version_changed_on_commit(monkeypatch, mocker):
+    monkeypatch.setattr(CacheVersion, "invalidate", invalidate_on_commit)
+    callbacks = []
+    mocker.patch(
+        "saleor.core.cache.transaction.on_commit", side_effect=callbacks.append
+    )
+    version = CacheVersion("test_version")
+    initial_version = version.get()
+
+    version.invalidate()
+
+    assert version.get() == initial_version
+    for callback in callbacks:
+        callback()
+    assert version.get() != initial_version
+
+
+def test_cache_timeout_shortened_without_shared_cache(settings):
+    settings.LOCAL_CACHE_TIMEOUT = 5
+
+    assert get_cache_timeout(None) == 5
+    assert get_cache_timeout(60) == 5
+    assert get_cache_timeout(1) == 1
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        }
+    }
+)
+def test_cache_timeout_kept_with_shared_cache():
+    assert get_cache_timeout(None) is None
+    assert get_cache_timeout(60) == 60
@@ -1,23 +1,29 @@
 import csv
+import gzip
 from io import StringIO
 from unittest.mock import Mock, patch
 
+from django.core.files.storage import default_storage
 from django.utils.encoding import smart_text
 
 from saleor.data_feeds.google_merchant import (
+    FEED_CHUNK_SIZE,
+    get_category_paths,
     get_feed_items,
     item_attributes,
     item_google_product_category,
+    iterate_feed_items,
+    update_feed,
     write_feed,
 )
-from saleor.product.models import AttributeValue, Category
+from saleor.product.models import AttributeValue, Category, ProductVariant
+from saleor.product.utils.attributes import associate_attribute_values_to_instance
 
 
 def test_saleor_feed_items(product, site_settings):
     valid_variant = product.variants.first()
     items = get_feed_items()
     assert len(items) == 1
-    categories = Category.objects.all()
     discounts = []
     category_paths = {}
     attributes_dict = {}
@@ -27,7 +33,6 @@ def test_saleor_feed_items(product, site_settings):
     }
     attributes = item_attributes(
         items[0],
-        categories,
         category_paths,
         current_site,
         discounts,
@@ -80,3 +85,95 @@ def test_feed_contains_site_settings_domain(mocked_item_link, product, site_sett
     mocked_item_link.assert_called_once_with(
         product.variants.first(), site_settings.site
     )
+
+
+def test_category_paths(db):
+    main_category = Category.objects.create(name="Main", slug="main")
+    sub_category = Category.objects.create(name="Sub", slug="sub", parent=main_category)
+
+    assert get_category_paths() == {
+        main_category.pk: "Main",
+        sub_category.pk: "Main > Sub",
+    }
+
+
+@patch("saleor.data_feeds.google_merchant.FEED_CHUNK_SIZE", 1)
+def test_iterate_feed_items_in_chunks(product_list):
+    variants = ProductVariant.objects.order_by("pk")
+
+    assert list(iterate_feed_items()) == list(variants)
+
+
+def _read_feed(file_path):
+    with default_storage.open(file_path) as feed_file:
+        content = gzip.decompress(feed_file.read()).decode()
+    return list(csv.DictReader(StringIO(content), dialect=csv.excel_tab))
+
+
+def test_update_feed(product_list, media_root):
+    updated_chunks = update_feed("feed.csv.gz")
+
+    rows = _read_feed("feed.csv.gz")
+    variants = ProductVariant.objects.order_by("pk")
+    assert [row["id"] for row in rows] == [variant.sku for variant in variants]
+    assert updated_chunks == sorted(
+        {variant.pk // FEED_CHUNK_SIZE for variant in variants}
+    )
+
+
+@patch("saleor.data_feeds.google_merchant.FEED_CHUNK_SIZE", 1)
+def test_update_feed_incremental(product_list, media_root):
+    update_feed("feed.csv.gz")
+    variant = ProductVariant.objects.order_by("pk").last()
+    variant.sku = "NEW-SKU"
+    variant.save()
+
+    updated_chunks = update_feed("feed.csv.gz", incremental=True)
+
+    assert updated_chunks == [variant.pk]
+    rows = _read_feed("feed.csv.gz")
+    assert [row["id"] for row in rows][-1] == "NEW-SKU"
+    assert len(rows) == len(product_list)
+
+
+@patch("saleor.data_feeds.google_merchant.FEED_CHUNK_SIZE", 1)
+def test_update_feed_incremental_removes_deleted_variants(product_list, media_root):
+    update_feed("feed.csv.gz")
+    variant = ProductVariant.objects.order_by("pk").last()
+    variant.delete()
+
+    assert update_feed("feed.csv.gz", incremental=True) == []
+
+    rows = _read_feed("feed.csv.gz")
+    assert variant.sku not in [row["id"] for row in rows]
+    assert len(rows) == len(product_list) - 1
+
+
+@patch("saleor.data_feeds.google_merchant.FEED_CHUNK_SIZE", 1)
+def test_update_feed_incremental_after_shared_data_change(product_list, media_root):
+    update_feed("feed.csv.gz")
+    Category.objects.update(name="Renamed")
+
+    updated_chunks = update_feed("feed.csv.gz", incremental=True)
+
+    assert len(updated_chunks) == len(product_list)
+    rows = _read_feed("feed.csv.gz")
+    assert {row["google_product_category"] for row in rows} == {"Renamed"}
+
+
+@patch("saleor.data_feeds.google_merchant.FEED_CHUNK_SIZE", 1)
+def test_update_feed_incremental_after_brand_change(product, media_root):
+    attribute = product.product_type.product_attributes.get()
+    attribute.slug = "brand"
+    attribute.save()
+    update_feed("feed.csv.gz")
+    other_value = attribute.values.exclude(
+        pk__in=product.attributes.values("values")
+    ).first()
+
+    associate_attribute_values_to_instance(product, attribute, other_value)
+
+    variant = product.variants.get()
+    assert update_feed("feed.csv.gz", incremental=True) == [variant.pk]
+    rows = _read_feed("feed.csv.gz")
+    assert rows[0]["brand"] == other_value.name
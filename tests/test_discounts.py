@@ -2,10 +2,12 @@ from datetime import timedelta
 
 import pytest
 from django.utils import timezone
+from freezegun import freeze_time
 from prices import Money
 
 from saleor.checkout.utils import get_voucher_discount_for_checkout
 from saleor.discount import DiscountInfo, DiscountValueType, VoucherType
+from saleor.discount.cache import discounts_cache, fetch_cached_discounts
 from saleor.discount.models import NotApplicable, Sale, Voucher, VoucherCustomer
 from saleor.discount.templatetags.voucher import discount_as_negative
 from saleor.discount.utils import (
@@ -326,3 +328,76 @@ def test_discount_as_negative_for_html():
     discount = Money(10, "USD")
     result = discount_as_negative(discount, True)
     assert result == '-<span class="currency">$</span>10.00'
+
+
+def test_fetch_cached_discounts_reuses_snapshot(sale, django_assert_num_queries):
+    discounts = fetch_cached_discounts()
+
+    with django_assert_num_queries(0):
+        assert fetch_cached_discounts() == discounts
+    assert [discount.sale for discount in discounts] == [sale]
+    assert discounts_cache.info().hits == 1
+
+
+def test_fetch_cached_discounts_uses_shared_snapshot(sale, django_assert_num_queries):
+    discounts = fetch_cached_discounts()
+    # Drop the snapshot kept by the process
+    discounts_cache.clear()
+
+    with django_assert_num_queries(0):
+        assert fetch_cached_discounts() == discounts
+
+
+def test_fetch_cached_discounts_invalidated_by_sale_change(sale, product_list):
+    fetch_cached_discounts()
+
+    sale.products.add(product_list[0])
+    discounts = fetch_cached_discounts()
+    assert product_list[0].pk in discounts[0].product_ids
+
+    sale.delete()
+    assert fetch_cached_discounts() == []
+
+
+def test_fetch_cached_discounts_invalidated_by_category_change(sale, category):
+    fetch_cached_discounts()
+
+    child = category.children.create(name="Child", slug="child")
+    discounts = fetch_cached_discounts()
+
+    assert child.pk in discounts[0].category_ids
+
+
+def test_fetch_cached_discounts_rolls_over_at_sale_dates(sale, settings):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 60 * 60 * 24
+    # The version of the snapshots would expire with the frozen time otherwise
+    settings.LOCAL_CACHE_TIMEOUT = 60 * 60 * 24
+    now = timezone.now()
+    sale.end_date = now + timedelta(hours=1)
+    sale.save()
+    upcoming_sale = Sale.objects.create(
+        name="Upcoming", value=5, start_date=now + timedelta(minutes=30)
+    )
+
+    with freeze_time(now):
+        assert [discount.sale for discount in fetch_cached_discounts()] == [sale]
+    with freeze_time(now + timedelta(minutes=29)):
+        assert [discount.sale for discount in fetch_cached_discounts()] == [sale]
+    with freeze_time(now + timedelta(minutes=30)):
+        discounts = fetch_cached_discounts()
+        assert {discount.sale for discount in discounts} == {sale, upcoming_sale}
+    with freeze_time(now + timedelta(hours=1, seconds=1)):
+        discounts = fetch_cached_discounts()
+        assert [discount.sale for discount in discounts] == [upcoming_sale]
+    assert discounts_cache.info().misses == 3
+    assert discounts_cache.info().hits == 1
+
+
+def test_discounts_cache_info_reports_snapshot_age(sale):
+    now = timezone.now()
+    assert discounts_cache.info().age is None
+
+    with freeze_time(now):
+        fetch_cached_discounts()
+    with freeze_time(now + timedelta(seconds=10)):
+        assert discounts_cache.info().age == 10
@@ -1,6 +1,10 @@
 from unittest import mock
 
+from django.core.cache import cache
+
+from saleor.menu.cache import MENUS_CACHE_KEY, menus_cache
 from saleor.menu.models import MenuItem, MenuItemTranslation
+from saleor.menu.tasks import update_menus_cache_task
 from saleor.menu.utils import (
     get_menu_as_json,
     get_menu_item_as_dict,
@@ -94,3 +98,55 @@ def test_menu_item_status(menu, category, collection, page):
     page.save()
     item.refresh_from_db()
     assert not item.is_public()
+
+
+def test_menus_cache_returns_tree_without_queries(
+    menu, category, collection, django_assert_num_queries
+):
+    top_item = MenuItem.objects.create(menu=menu, name="top item", category=category)
+    child_item = MenuItem.objects.create(
+        menu=menu, parent=top_item, name="child item", collection=collection
+    )
+    MenuItemTranslation.objects.create(
+        menu_item=child_item, name="Polish Name", language_code="pl"
+    )
+    menus_cache.get(menu.pk)
+
+    with django_assert_num_queries(0):
+        cached_menu = menus_cache.get_by_name(menu.name)
+        (cached_top_item,) = cached_menu.prefetched_items
+        (cached_child_item,) = cached_top_item.children.all()
+        assert cached_top_item.category == category
+        assert cached_child_item.parent == cached_top_item
+        assert cached_child_item.menu == menu
+        assert cached_child_item.collection == collection
+        assert cached_child_item.translations.all()[0].name == "Polish Name"
+        assert not cached_child_item.children.all()
+
+
+def test_menus_cache_invalidated_with_items(menu, menu_item):
+    assert menus_cache.get(menu.pk).prefetched_items[0].name == menu_item.name
+
+    menu_item.name = "New name"
+    menu_item.save()
+
+    assert menus_cache.get(menu.pk).prefetched_items[0].name == "New name"
+
+
+def test_menus_cache_invalidated_with_linked_objects(menu, category):
+    MenuItem.objects.create(menu=menu, name="Link", category=category)
+    menus_cache.get(menu.pk)
+
+    category.name = "New name"
+    category.save()
+
+    assert menus_cache.get(menu.pk).prefetched_items[0].category.name == "New name"
+
+
+def test_update_menus_cache_task(menu, menu_item, django_assert_num_queries):
+    update_menus_cache_task()
+    menus_cache.clear()
+
+    assert cache.get(MENUS_CACHE_KEY + menus_cache.version.get())
+    with django_assert_num_queries(0):
+        assert menus_cache.get(menu.pk).prefetched_items[0].pk == menu_item.pk
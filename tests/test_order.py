@@ -2,6 +2,7 @@ from decimal import Decimal
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from django.core.management import call_command
 from prices import Money, TaxedMoney
 
 from saleor.core.exceptions import InsufficientStock
@@ -13,12 +14,15 @@ from saleor.discount.models import (
     VoucherType,
 )
 from saleor.discount.utils import validate_voucher_in_order
+from saleor.giftcard.models import GiftCard
 from saleor.order import OrderStatus, models
 from saleor.order.emails import send_fulfillment_confirmation_to_customer
 from saleor.order.events import OrderEvent, OrderEventsEmails
-from saleor.order.models import Order
+from saleor.order.models import DailySales, Order, VariantDailySales
+from saleor.order.sales import get_sales_date
 from saleor.order.templatetags.order_lines import display_translated_order_line_name
 from saleor.order.utils import (
+    add_gift_cards_to_order,
     add_variant_to_order,
     change_order_line_quantity,
     delete_order_line,
@@ -645,3 +649,103 @@ def test_send_fulfillment_order_lines_mails(
         }
     else:
         assert len(events) == 1
+
+
+def test_add_gift_cards_to_order(order, gift_card, django_assert_num_queries):
+    second_gift_card = GiftCard.objects.create(
+        code="second_giftcard",
+        initial_balance=Money(10, "USD"),
+        current_balance=Money(10, "USD"),
+    )
+    third_gift_card = GiftCard.objects.create(
+        code="third_giftcard",
+        initial_balance=Money(10, "USD"),
+        current_balance=Money(10, "USD"),
+    )
+    gift_cards = [gift_card, second_gift_card, third_gift_card]
+
+    # Adding the links and updating the used gift cards
+    with django_assert_num_queries(3):
+        total_price_left = add_gift_cards_to_order(order, gift_cards, Money(15, "USD"))
+
+    assert total_price_left == Money(0, "USD")
+    assert set(order.gift_cards.all()) == {gift_card, second_gift_card}
+    for card in gift_cards:
+        card.refresh_from_db()
+    assert gift_card.current_balance == Money(0, "USD")
+    assert second_gift_card.current_balance == Money(5, "USD")
+    assert second_gift_card.last_used_on
+    assert third_gift_card.current_balance == Money(10, "USD")
+    assert not third_gift_card.last_used_on
+
+
+def get_variant_daily_sales(line):
+    return VariantDailySales.objects.filter(
+        variant=line.variant, date=get_sales_date(line.order.created)
+    ).first()
+
+
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
+def test_daily_sales_of_order_with_lines(order_with_lines):
+    sales = DailySales.objects.get(date=get_sales_date(order_with_lines.created))
+    assert sales.orders_count == 1
+    assert sales.total == order_with_lines.total
+    for line in order_with_lines:
+        variant_sales = get_variant_daily_sales(line)
+        assert variant_sales.quantity == line.quantity
+        assert variant_sales.revenue == line.get_total()
+
+
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
+def test_daily_sales_exclude_canceled_orders(order_with_lines):
+    order_with_lines.status = OrderStatus.CANCELED
+    order_with_lines.save(update_fields=["status"])
+
+    assert not DailySales.objects.exists()
+    assert not VariantDailySales.objects.exists()
+
+
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
+def test_variant_daily_sales_updated_with_lines(order_with_lines):
+    line, deleted_line = order_with_lines.lines.all()
+
+    change_order_line_quantity(None, line, line.quantity, line.quantity + 1)
+    delete_order_line(deleted_line)
+
+    assert get_variant_daily_sales(line).quantity == line.quantity
+    assert get_variant_daily_sales(deleted_line) is None
+
+
+@pytest.mark.usefixtures("daily_sales_updated_right_away")
+def test_daily_sales_of_deleted_order(order_with_lines):
+    order_with_lines.delete()
+
+    assert not DailySales.objects.exists()
+    assert not VariantDailySales.objects.exists()
+
+
+def test_update_all_daily_sales_command(order_with_lines):
+    assert not DailySales.objects.exists()
+
+    call_command("update_all_daily_sales")
+
+    assert DailySales.objects.get().total == order_with_lines.total
+    for line in order_with_lines:
+        assert get_variant_daily_sales(line).quantity == line.quantity
+
+
+def test_daily_sales_updated_on_commit(order_with_lines, mocker):
+    callbacks = []
+    mocker.patch(
+        "saleor.order.sales.transaction.on_commit", side_effect=callbacks.append
+    )
+    order_with_lines.save(update_fields=["status"])
+    assert not DailySales.objects.exists()
+
+    # Sales are updated by a task run once the change is committed
+    (callback,) = callbacks
+    callback()
+
+    assert DailySales.objects.get().total == order_with_lines.total
+    for line in order_with_lines:
+        assert get_variant_daily_sales(line).quantity == line.quantity
@@ -1,11 +1,19 @@
+import timeit
 from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
 from prices import Money
 
-from saleor.account.models import Address
-from saleor.product.models import Product
-from saleor.search.backends.postgresql import search_storefront
+from saleor.account.models import Address, User
+from saleor.order.models import Order
+from saleor.product.models import AttributeValueTranslation, Product
+from saleor.search.backends.postgresql import (
+    search_orders,
+    search_storefront,
+    search_users,
+)
 
 PRODUCTS = [
     ("Arabica Coffee", "The best grains in galactic"),
@@ -68,6 +76,163 @@ def test_storefront_filter_published_products(named_products):
     assert not execute_search("Coffee")
 
 
+@pytest.mark.integration
+@pytest.mark.django_db
+def test_storefront_search_ranks_name_matches_first(named_products):
+    named_products[1].description = "Stains of coffee washed out easily."
+    named_products[1].save()
+
+    results = list(execute_search("coffee"))
+
+    assert results == [named_products[0], named_products[1]]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "phrase", ["123", "Red", "Small", "French name", "French description"]
+)
+def test_storefront_search_by_search_document(product, product_translation_fr, phrase):
+    # Variant's SKU, product's and variant's attribute values and translations
+    assert list(execute_search(phrase)) == [product]
+
+
+@pytest.mark.integration
+def test_search_document_updated_with_variant_sku(product):
+    variant = product.variants.get()
+    variant.sku = "ESPRESSO-250"
+    variant.save()
+
+    assert list(execute_search("ESPRESSO-250")) == [product]
+
+
+@pytest.mark.integration
+def test_search_document_not_updated_with_variant_stock(
+    product, django_assert_num_queries
+):
+    variant = product.variants.get()
+    variant.quantity = 5
+
+    # Saving the variant and updating the available quantity of the product
+    with django_assert_num_queries(3) as captured:
+        variant.save(update_fields=["quantity"])
+
+    assert not any("search_document" in query["sql"] for query in captured)
+
+
+@pytest.mark.integration
+def test_search_document_updated_with_attribute_value_name(product):
+    value = product.attributes.get().values.get()
+    value.name = "Crimson"
+    value.save()
+
+    assert list(execute_search("Crimson")) == [product]
+
+
+@pytest.mark.integration
+def test_search_document_updated_with_attribute_value_translation(
+    product, color_attribute
+):
+    value = product.attributes.get().values.get()
+    AttributeValueTranslation.objects.create(
+        language_code="fr", attribute_value=value, name="Rouge"
+    )
+
+    assert list(execute_search("Rouge")) == [product]
+
+
+@pytest.mark.integration
+def test_search_document_updated_with_removed_attribute_values(product):
+    product.attributes.get().values.clear()
+
+    assert not execute_search("Red")
+
+
+@pytest.mark.integration
+def test_search_document_updated_with_deleted_attribute_value(product, mocker):
+    on_commit_callbacks = []
+    mocker.patch(
+        "saleor.product.signals.transaction.on_commit",
+        side_effect=on_commit_callbacks.append,
+    )
+    value = product.attributes.get().values.get()
+
+    value.delete()
+    for callback in on_commit_callbacks:
+        callback()
+
+    assert not execute_search("Red")
+
+
+@pytest.mark.integration
+def test_search_document_uses_json_description(product, settings):
+    settings.USE_JSON_CONTENT = True
+    product.description_json = {"blocks": [{"text": "Freshly roasted beans"}]}
+    product.save()
+
+    assert list(execute_search("beans")) == [product]
+
+
+@pytest.mark.integration
+def test_management_command_update_all_products_search_document(product_list):
+    Product.objects.update(search_document=None)
+
+    call_command("update_all_products_search_document", batch_size=2)
+
+    assert not Product.objects.filter(search_document=None).exists()
+
+
+@pytest.mark.integration
+def test_management_command_resumes_update_after_given_product(product_list):
+    Product.objects.update(search_document=None)
+
+    call_command("update_all_products_search_document", start_after=product_list[0].pk)
+
+    not_updated = Product.objects.filter(search_document=None)
+    assert list(not_updated) == [product_list[0]]
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+@pytest.mark.parametrize("products_count", [100000])
+def test_storefront_search_benchmark(products_count, product, record_property):
+    # Copies of the product are inserted by the database, as creating the
+    # instances would take most of the time of the test
+    table = connection.ops.quote_name(Product._meta.db_table)
+    columns = [
+        field.column for field in Product._meta.concrete_fields if not field.primary_key
+    ]
+    values = {
+        "name": "'Product ' || number",
+        "description": "'Description of the product number ' || number || '.'",
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({", ".join(columns)})
+            SELECT {", ".join(values.get(column, column) for column in columns)}
+            FROM {table}, generate_series(1, %s) AS number
+            WHERE id = %s
+            """,
+            [products_count - 1, product.pk],
+        )
+    call_command("update_all_products_search_document")
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {table}")
+
+    queryset = execute_search("31337")
+    # Both the full text and the trigram conditions use the indexes
+    plan = queryset.explain()
+    assert "product_search_gin" in plan
+    assert "product_name_trgm_gin" in plan
+
+    repeat = 5
+    seconds = timeit.timeit(lambda: list(queryset.all()[:20]), number=repeat)
+
+    # Search time in the catalog, reported in the JUnit XML
+    record_property("seconds_per_search", seconds / repeat)
+    assert queryset.first().name == "Product 31337"
+
+
 USERS = [
     ("Andreas", "Knop", "adreas.knop@example.com"),
     ("Euzebiusz", "Ziemniak", "euzeb.potato@cebula.pl"),
@@ -87,3 +252,143 @@ def gen_address_for_user(first_name, last_name):
         postal_code="53-601",
         country="PL",
     )
+
+
+@pytest.fixture
+def named_users():
+    users = []
+    for first_name, last_name, email in USERS:
+        address = gen_address_for_user(first_name, last_name)
+        users.append(
+            User.objects.create(
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                default_shipping_address=address,
+            )
+        )
+    return users
+
+
+@pytest.fixture
+def named_orders(named_users):
+    orders = []
+    for pk, user in zip(ORDER_IDS, named_users):
+        address = user.default_shipping_address.get_copy()
+        orders.append(
+            Order.objects.create(
+                pk=pk, user=user, user_email=user.email, billing_address=address
+            )
+        )
+    return orders
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "phrase, user_num",
+    [
+        ("knop", 0),
+        ("ZIEMNIAK", 1),
+        ("euzeb.potato", 1),
+        ("johndoe@example.com", 2),
+        ("JohnDoe@Example.com", 2),
+    ],
+)
+def test_dashboard_search_users(named_users, phrase, user_num):
+    assert list(search_users(User.objects.all(), phrase)) == [named_users[user_num]]
+
+
+@pytest.mark.integration
+def test_dashboard_search_users_by_address(named_users):
+    found = search_users(User.objects.all(), "wrocław")
+
+    assert set(found) == set(named_users)
+
+
+@pytest.mark.integration
+def test_dashboard_search_users_by_phone(named_users):
+    address = named_users[1].default_shipping_address
+    address.phone = "+48713988102"
+    address.save()
+
+    found = search_users(User.objects.all(), "+48713988102")
+
+    assert list(found) == [named_users[1]]
+
+
+@pytest.mark.integration
+def test_user_search_document_updated_with_default_address(named_users):
+    address = named_users[0].default_shipping_address
+    address.city = "Gdańsk"
+    address.save()
+
+    assert list(search_users(User.objects.all(), "gdańsk")) == [named_users[0]]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "phrase, order_num",
+    [("45", 1), ("Andreas", 0), ("doe", 2), ("euzeb.potato@cebula.pl", 1)],
+)
+def test_dashboard_search_orders(named_orders, phrase, order_num):
+    found = search_orders(Order.objects.all(), phrase)
+
+    assert list(found) == [named_orders[order_num]]
+
+
+@pytest.mark.integration
+def test_dashboard_search_orders_by_phone(named_orders):
+    address = named_orders[2].billing_address
+    address.phone = "+48713988102"
+    address.save()
+
+    found = search_orders(Order.objects.all(), "+48713988102")
+
+    assert list(found) == [named_orders[2]]
+
+
+@pytest.mark.integration
+def test_order_search_document_updated_with_customer_name(named_orders):
+    user = named_orders[0].user
+    user.last_name = "Kowalski"
+    user.save()
+
+    found = search_orders(Order.objects.all(), "kowalski")
+
+    assert list(found) == [named_orders[0]]
+
+
+@pytest.mark.integration
+def test_dashboard_search_uses_trigram_indexes(named_orders):
+    # Tables of the test are too small for the index to be cheaper than a scan,
+    # and without the default ordering any other index can't be used instead
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+    orders_plan = search_orders(Order.objects.order_by(), "andreas").explain()
+    users_plan = search_users(User.objects.order_by(), "andreas").explain()
+
+    assert "order_search_gin" in orders_plan
+    assert "user_search_gin" in users_plan
+
+
+@pytest.mark.integration
+def test_management_command_update_all_orders_search_document(named_orders):
+    Order.objects.update(search_document="")
+
+    call_command("update_all_orders_search_document", batch_size=2)
+
+    assert list(search_orders(Order.objects.order_by("pk"), "andreas")) == [
+        named_orders[0]
+    ]
+    assert not Order.objects.filter(search_document="").exists()
+
+
+@pytest.mark.integration
+def test_management_command_update_all_users_search_document(named_users):
+    User.objects.update(search_document="")
+
+    call_command("update_all_users_search_document", start_after=named_users[0].pk)
+
+    not_updated = User.objects.filter(search_document="")
+    assert list(not_updated) == [named_users[0]]
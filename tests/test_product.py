@@ -1,25 +1,33 @@
 import os
+import threading
+import time
 from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
 from freezegun import freeze_time
 from prices import Money, MoneyRange
 
 from saleor.account import events as account_events
+from saleor.core.exceptions import InsufficientStock
 from saleor.product import models
 from saleor.product.filters import filter_products_by_attributes_values
 from saleor.product.models import DigitalContentUrl
 from saleor.product.thumbnails import create_product_thumbnails
 from saleor.product.utils import (
     allocate_stock,
+    allocate_stocks,
     deallocate_stock,
+    deallocate_stocks,
     decrease_stock,
     increase_stock,
 )
 from saleor.product.utils.attributes import associate_attribute_values_to_instance
 from saleor.product.utils.costs import get_margin_for_variant
 from saleor.product.utils.digital_products import increment_download_count
+from saleor.product.utils.stock import update_products_quantity_available
 
 
 @pytest.mark.parametrize(
@@ -40,6 +48,199 @@ def test_stock_utils(product, func, expected_quantity, expected_quantity_allocat
     variant.refresh_from_db()
     assert variant.quantity == expected_quantity
     assert variant.quantity_allocated == expected_quantity_allocated
+    product.refresh_from_db()
+    assert product.quantity_available == (
+        expected_quantity - expected_quantity_allocated
+    )
+
+
+@pytest.fixture
+def variants(product):
+    variant = product.variants.get()
+    second_variant = models.ProductVariant.objects.create(
+        product=product, sku="456", quantity=10, quantity_allocated=1
+    )
+    return variant, second_variant
+
+
+def test_allocate_stocks(variants, django_assert_max_num_queries):
+    variant_1, variant_2 = variants
+    allocated_1 = variant_1.quantity_allocated
+    allocated_2 = variant_2.quantity_allocated
+
+    # Savepoint, locking the variants and updating them, then locking and
+    # updating their product
+    with django_assert_max_num_queries(6):
+        allocate_stocks([(variant_1, 2), (variant_2, 3), (variant_1, 1)])
+
+    variant_1.refresh_from_db()
+    variant_2.refresh_from_db()
+    assert variant_1.quantity_allocated == allocated_1 + 3
+    assert variant_2.quantity_allocated == allocated_2 + 3
+    variant_1.product.refresh_from_db()
+    assert variant_1.product.quantity_available == (
+        variant_1.quantity_available + variant_2.quantity_available
+    )
+
+
+def test_allocate_stocks_insufficient_stock(variants):
+    variant_1, variant_2 = variants
+    allocated_1 = variant_1.quantity_allocated
+    allocated_2 = variant_2.quantity_allocated
+    quantity_2 = variant_2.quantity - variant_2.quantity_allocated + 1
+
+    with pytest.raises(InsufficientStock) as exc:
+        allocate_stocks([(variant_1, 1), (variant_2, quantity_2)])
+
+    assert exc.value.item == variant_2
+    variant_1.refresh_from_db()
+    variant_2.refresh_from_db()
+    assert variant_1.quantity_allocated == allocated_1
+    assert variant_2.quantity_allocated == allocated_2
+
+
+def test_allocate_stocks_without_tracking_inventory(variant):
+    variant.track_inventory = False
+    variant.save(update_fields=["track_inventory"])
+
+    allocate_stocks([(variant, variant.quantity + 1)])
+
+    quantity_allocated = variant.quantity_allocated
+    variant.refresh_from_db()
+    assert variant.quantity_allocated == quantity_allocated
+
+
+def test_deallocate_stocks(variants):
+    variant_1, variant_2 = variants
+    allocated_1 = variant_1.quantity_allocated
+    allocated_2 = variant_2.quantity_allocated
+    allocate_stocks([(variant_1, 2), (variant_2, 3)])
+
+    deallocate_stocks([(variant_1, 2), (variant_2, 3)])
+
+    variant_1.refresh_from_db()
+    variant_2.refresh_from_db()
+    assert variant_1.quantity_allocated == allocated_1
+    assert variant_2.quantity_allocated == allocated_2
+
+
+def test_deallocate_stocks_reads_tracking_inventory_from_database(variant):
+    quantity_allocated = variant.quantity_allocated
+    models.ProductVariant.objects.filter(pk=variant.pk).update(track_inventory=False)
+
+    deallocate_stocks([(variant, 1)])
+
+    variant.refresh_from_db()
+    assert variant.quantity_allocated == quantity_allocated
+
+
+def test_product_quantity_available_updated_with_variants(product):
+    variant = product.variants.get()
+    product.refresh_from_db()
+    assert product.quantity_available == variant.quantity_available
+
+    second_variant = models.ProductVariant.objects.create(
+        product=product, sku="456", quantity=10, quantity_allocated=1
+    )
+    product.refresh_from_db()
+    assert product.quantity_available == variant.quantity_available + 9
+
+    product.variants.update(quantity=0, quantity_allocated=0)
+    product.refresh_from_db()
+    assert product.quantity_available == 0
+
+    variant.delete()
+    second_variant.delete()
+    product.refresh_from_db()
+    assert product.quantity_available is None
+
+
+def test_product_quantity_available_not_updated_without_stock_changes(
+    product, django_assert_num_queries
+):
+    variant = product.variants.get()
+
+    with django_assert_num_queries(1):
+        variant.save(update_fields=["track_inventory"])
+
+
+def test_management_command_update_all_products_quantity_available(product_list):
+    models.Product.objects.update(quantity_available=None)
+
+    call_command("update_all_products_quantity_available", batch_size=2)
+
+    for product in product_list:
+        product.refresh_from_db()
+        variant = product.variants.get()
+        assert product.quantity_available == variant.quantity_available
+
+
+@pytest.mark.django_db(transaction=True)
+def test_update_products_quantity_available_locks_products_until_updated(product):
+    variant = product.variants.get()
+    models.ProductVariant.objects.filter(pk=variant.pk).update(
+        quantity=10, quantity_allocated=3
+    )
+    in_atomic_block = []
+
+    def record_atomic_block(execute, sql, params, many, context):
+        in_atomic_block.append(connection.in_atomic_block)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record_atomic_block):
+        update_products_quantity_available([product.pk])
+
+    # The lock and the update are run in the same transaction
+    assert in_atomic_block == [True, True]
+    product.refresh_from_db()
+    assert product.quantity_available == 7
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+def test_allocate_stocks_concurrent_checkouts_benchmark(variants, record_property):
+    variant_1, variant_2 = variants
+    for variant in (variant_1, variant_2):
+        variant.quantity = 20
+        variant.quantity_allocated = 0
+        variant.save(update_fields=["quantity", "quantity_allocated"])
+    checkouts_count = 50
+    barrier = threading.Barrier(checkouts_count)
+    results = []
+
+    def checkout(index):
+        # Half of the checkouts lock the variants in the reversed order
+        lines = [(variant_1, 1), (variant_2, 1)]
+        if index % 2:
+            lines.reverse()
+        barrier.wait()
+        try:
+            allocate_stocks(lines)
+        except InsufficientStock:
+            results.append(False)
+        else:
+            results.append(True)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=checkout, args=(index,))
+        for index in range(checkouts_count)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Time of all the competing checkouts, reported in the JUnit XML
+    record_property("seconds", time.perf_counter() - start)
+    assert results.count(True) == 20
+    assert results.count(False) == checkouts_count - 20
+    variant_1.refresh_from_db()
+    variant_2.refresh_from_db()
+    assert variant_1.quantity_allocated == 20
+    assert variant_2.quantity_allocated == 20
 
 
 def test_filtering_by_attribute(db, color_attribute, category, settings):
@@ -5,10 +5,12 @@ from django.utils.text import slugify
 from prices import Money
 
 from saleor.product import AttributeInputType
+from saleor.product.cache import attributes_index
 from saleor.product.models import (
     Attribute,
     AttributeValue,
     Product,
+    ProductAttributeSortKey,
     ProductType,
     ProductVariant,
 )
@@ -156,3 +158,133 @@ def test_get_formfield_name_with_unicode_characters(db):
     assert text_attribute.get_formfield_name() == "attribute-ąęαβδηθλμπ-{}".format(
         text_attribute.pk
     )
+
+
+def test_attributes_index(color_attribute):
+    value = color_attribute.values.get(slug="red")
+
+    attribute = attributes_index.get(color_attribute.slug)
+
+    assert attribute.pk == color_attribute.pk
+    assert attribute.values["red"] == value.pk
+    assert attributes_index.get("unknown") is None
+
+
+def test_attributes_index_kept_in_process_memory(
+    color_attribute, django_assert_num_queries
+):
+    attributes_index.get(color_attribute.slug)
+
+    with django_assert_num_queries(0):
+        attributes_index.get(color_attribute.slug)
+
+
+def test_attributes_index_invalidated_on_attribute_value_changes(color_attribute):
+    value = color_attribute.values.get(slug="red")
+    assert "red" in attributes_index.get(color_attribute.slug).values
+
+    value.slug = "crimson"
+    value.save()
+    assert attributes_index.get(color_attribute.slug).values["crimson"] == value.pk
+
+    value.delete()
+    assert "crimson" not in attributes_index.get(color_attribute.slug).values
+
+
+def test_attributes_index_invalidated_on_attribute_changes(color_attribute):
+    assert attributes_index.get(color_attribute.slug)
+
+    color_attribute.slug = "colour"
+    color_attribute.save()
+    assert attributes_index.get("color") is None
+    assert attributes_index.get("colour").pk == color_attribute.pk
+
+    color_attribute.delete()
+    assert attributes_index.get("colour") is None
+
+
+def get_attribute_sort_key(product, attribute):
+    sort_key = ProductAttributeSortKey.objects.filter(
+        product=product, attribute=attribute
+    ).first()
+    return sort_key.value if sort_key else None
+
+
+def test_attribute_sort_key_of_assigned_values(product, color_attribute):
+    red, blue = color_attribute.values.all()
+    assert get_attribute_sort_key(product, color_attribute) == "Red"
+
+    associate_attribute_values_to_instance(product, color_attribute, blue, red)
+
+    # Values are ordered by their sort order, not by the order of assigning
+    assert get_attribute_sort_key(product, color_attribute) == "Red,Blue"
+
+
+@pytest.fixture
+def on_commit_callbacks(mocker):
+    callbacks = []
+    mocker.patch(
+        "saleor.product.signals.transaction.on_commit", side_effect=callbacks.append
+    )
+    return callbacks
+
+
+def test_attribute_sort_key_updated_with_value_changes(
+    product, color_attribute, on_commit_callbacks
+):
+    red, blue = color_attribute.values.all()
+    associate_attribute_values_to_instance(product, color_attribute, red, blue)
+
+    red.name = "Crimson"
+    red.save()
+    assert get_attribute_sort_key(product, color_attribute) == "Crimson,Blue"
+
+    red.sort_order, blue.sort_order = blue.sort_order, red.sort_order
+    AttributeValue.objects.bulk_update([red, blue], ["sort_order"])
+    assert get_attribute_sort_key(product, color_attribute) == "Blue,Crimson"
+
+    red.delete()
+    for callback in on_commit_callbacks:
+        callback()
+    assert get_attribute_sort_key(product, color_attribute) == "Blue"
+
+
+def test_attribute_sort_key_of_product_without_values(
+    product, color_attribute, on_commit_callbacks
+):
+    product.attributes.get().delete()
+    for callback in on_commit_callbacks:
+        callback()
+
+    # The product's type has the attribute, but the product has no values
+    assert get_attribute_sort_key(product, color_attribute) == ""
+
+
+def test_attribute_sort_key_updated_with_product_type_attributes(
+    product, size_attribute, on_commit_callbacks
+):
+    product_type = product.product_type
+    assert get_attribute_sort_key(product, size_attribute) is None
+
+    product_type.product_attributes.add(size_attribute)
+    assert get_attribute_sort_key(product, size_attribute) == ""
+
+    product_type.product_attributes.remove(size_attribute)
+    for callback in on_commit_callbacks:
+        callback()
+    assert get_attribute_sort_key(product, size_attribute) is None
+
+
+def test_attribute_sort_key_updated_with_product_type(
+    product, color_attribute, product_type_without_variant, on_commit_callbacks
+):
+    product.product_type = product_type_without_variant
+    product.save()
+
+    # Values assigned for the previous type are still used for sorting
+    assert get_attribute_sort_key(product, color_attribute) == "Red"
+
+    product.attributes.get().delete()
+    for callback in on_commit_callbacks:
+        callback()
+    assert get_attribute_sort_key(product, color_attribute) is None
@@ -1,14 +1,20 @@
-from unittest.mock import patch
+from decimal import Decimal
+from unittest.mock import call, patch
 
 from django.core.management import call_command
 from prices import Money
 
 from saleor.product.models import Product, ProductVariant
 from saleor.product.tasks import (
-    update_products_minimal_variant_prices_of_catalogues,
+    update_products_minimal_variant_prices_of_discount_task,
     update_products_minimal_variant_prices_task,
 )
-from saleor.product.utils.variant_prices import update_product_minimal_variant_price
+from saleor.product.utils.variant_prices import (
+    get_product_ids_batches,
+    update_product_minimal_variant_price,
+    update_products_minimal_variant_prices,
+    update_products_minimal_variant_prices_of_catalogues,
+)
 
 
 def test_update_product_minimal_variant_price(product):
@@ -179,12 +185,101 @@ def test_product_variant_objects_bulk_create_updates_minimal_variant_price(produ
 @patch(
     "saleor.product.management.commands"
     ".update_all_products_minimal_variant_prices"
-    ".update_product_minimal_variant_price"
+    ".update_products_minimal_variant_prices_batch"
 )
 def test_management_commmand_update_all_products_minimal_variant_price(
-    mock_update_product_minimal_variant_price, product_list
+    mock_update_products_minimal_variant_prices_batch, product_list
 ):
     call_command("update_all_products_minimal_variant_prices")
-    call_args_list = mock_update_product_minimal_variant_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+    (args, kwargs), = mock_update_products_minimal_variant_prices_batch.call_args_list
+    assert args[0] == [product.pk for product in product_list]
+
+
+def test_management_commmand_resumes_update_after_given_product(product_list):
+    for product in product_list:
+        product.variants.update(price_override_amount="0.01")
+
+    call_command(
+        "update_all_products_minimal_variant_prices", start_after=product_list[0].pk
+    )
+
+    minimal_prices = [
+        product.minimal_variant_price.amount
+        for product in Product.objects.order_by("pk")
+    ]
+    assert minimal_prices[0] == product_list[0].price.amount
+    assert all(price == Decimal("0.01") for price in minimal_prices[1:])
+
+
+def test_update_products_minimal_variant_prices_applies_discounts(
+    product_list, discount_info
+):
+    product = product_list[0]
+    product.variants.update(price_override_amount="8.00")
+
+    update_products_minimal_variant_prices(
+        Product.objects.filter(pk=product.pk), discounts=[discount_info]
+    )
+
+    product.refresh_from_db()
+    expected_price = product.variants.first().get_price(discounts=[discount_info])
+    assert product.minimal_variant_price == expected_price
+
+
+def test_update_products_minimal_variant_prices_ignores_products_without_variants(
+    product, discount_info
+):
+    product.variants.all().delete()
+    discount_info.product_ids.add(product.pk)
+
+    updated_count = update_products_minimal_variant_prices(
+        Product.objects.filter(pk=product.pk), discounts=[discount_info]
+    )
+
+    product.refresh_from_db()
+    assert updated_count == 0
+    assert product.minimal_variant_price == product.price
+
+
+def test_update_products_minimal_variant_prices_updates_in_batches(
+    product_list, django_assert_num_queries
+):
+    for product in product_list:
+        product.variants.update(price_override_amount="0.01")
+    products = Product.objects.filter(pk__in=[product.pk for product in product_list])
+
+    # Fetching IDs, prices of the batch, an update of the changed products and
+    # fetching the next batch of IDs
+    with django_assert_num_queries(4):
+        updated_count = update_products_minimal_variant_prices(products, discounts=[])
+
+    assert updated_count == len(product_list)
+    with django_assert_num_queries(3):
+        assert update_products_minimal_variant_prices(products, discounts=[]) == 0
+
+
+def test_get_product_ids_batches(product_list):
+    product_ids = sorted(product.pk for product in product_list)
+    products = Product.objects.all()
+
+    assert list(get_product_ids_batches(products, batch_size=2)) == [
+        product_ids[:2],
+        product_ids[2:],
+    ]
+    assert list(
+        get_product_ids_batches(products, batch_size=2, start_after=product_ids[1])
+    ) == [product_ids[2:]]
+
+
+@patch("saleor.product.tasks.update_products_minimal_variant_prices_task.delay")
+@patch("saleor.product.tasks.get_product_ids_batches")
+def test_update_products_minimal_variant_prices_of_discount_task_splits_work(
+    mock_get_product_ids_batches, mock_delay, sale
+):
+    mock_get_product_ids_batches.return_value = iter([[1, 2], [3]])
+
+    update_products_minimal_variant_prices_of_discount_task(sale.pk)
+
+    mock_delay.assert_has_calls(
+        [call(product_ids=[1, 2]), call(product_ids=[3])], any_order=False
+    )
@@ -1,8 +1,10 @@
 import pytest
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 
 from saleor.site import utils
+from saleor.site.cache import SITES_VERSION_CACHE_KEY, SITES_VERSION_CHECK_INTERVAL
 from saleor.site.models import AuthorizationKey, SiteSettings
 
 
@@ -51,3 +53,44 @@ def test_new_get_current():
     assert result.domain == "mirumee.com"
     assert type(result.settings) == SiteSettings
     assert str(result.settings) == "mirumee.com"
+
+
+def test_get_current_reads_cached_site(site_settings, django_assert_num_queries):
+    Site.objects.get_current()
+
+    with django_assert_num_queries(0):
+        site = Site.objects.get_current()
+        assert site.settings.company_address == site_settings.company_address
+
+
+def test_cached_site_invalidated_with_settings(site_settings):
+    Site.objects.get_current()
+
+    site_settings.header_text = "New header"
+    site_settings.save()
+
+    assert Site.objects.get_current().settings.header_text == "New header"
+
+
+def test_cached_site_invalidated_with_company_address(site_settings, address):
+    site_settings.company_address = address
+    site_settings.save()
+    Site.objects.get_current()
+
+    address.city = "New city"
+    address.save()
+
+    assert Site.objects.get_current().settings.company_address.city == "New city"
+
+
+def test_cached_site_refreshed_after_version_check_interval(site_settings, mocker):
+    mocked_monotonic = mocker.patch("saleor.site.cache.monotonic", return_value=0)
+    Site.objects.get_current()
+    # Made by another process, which doesn't clear the site of this one
+    SiteSettings.objects.filter(pk=site_settings.pk).update(header_text="New header")
+    cache.set(SITES_VERSION_CACHE_KEY, "changed", None)
+
+    assert Site.objects.get_current().settings.header_text != "New header"
+
+    mocked_monotonic.return_value = SITES_VERSION_CHECK_INTERVAL
+    assert Site.objects.get_current().settings.header_text == "New header"
@@ -1,9 +1,13 @@
 import json
+import timeit
 
 import pytest
+from django.core.exceptions import FieldDoesNotExist
 
 from saleor.order import OrderStatus
+from saleor.order.models import Order, OrderLine
 from saleor.webhook import WebhookEventType
+from saleor.webhook.payload_serializers import PayloadSerializer
 from saleor.webhook.payloads import (
     generate_customer_payload,
     generate_order_payload,
@@ -58,3 +62,84 @@ def test_generate_sample_customer_payload(customer_user):
 def test_generate_sample_product_payload(variant):
     payload = generate_sample_payload(WebhookEventType.PRODUCT_CREATED)
     assert payload == json.loads(generate_product_payload(variant.product))
+
+
+def test_generate_order_payload(fulfilled_order, payment_txn_captured):
+    payload = json.loads(generate_order_payload(fulfilled_order))
+
+    assert len(payload) == 1
+    data = payload[0]
+    assert data["type"] == "Order"
+    assert data["status"] == fulfilled_order.status
+    assert data["total_gross_amount"] == str(fulfilled_order.total_gross_amount)
+    assert [line["product_sku"] for line in data["lines"]] == [
+        line.product_sku for line in fulfilled_order.lines.all()
+    ]
+    assert data["payments"][0]["charge_status"] == payment_txn_captured.charge_status
+    assert data["payments"][0]["total"] == str(payment_txn_captured.total)
+    assert data["shipping_address"]["city"] == fulfilled_order.shipping_address.city
+    assert (
+        data["fulfillments"][0]["status"] == fulfilled_order.fulfillments.get().status
+    )
+
+
+def test_generate_order_payload_doesnt_keep_relations_on_order(order_with_lines):
+    generate_order_payload(order_with_lines)
+
+    line = order_with_lines.lines.first()
+    line.pk = None
+    line.save()
+
+    # Lines fetched for the payload aren't kept on the order
+    assert len(order_with_lines.lines.all()) == 3
+
+
+def test_generate_customer_payload_addresses(customer_user, address, address_usa):
+    customer_user.default_billing_address = address
+    customer_user.default_shipping_address = address_usa
+    customer_user.save()
+
+    data = json.loads(generate_customer_payload(customer_user))[0]
+
+    assert data["default_billing_address"]["country"] == address.country.code
+    assert data["default_shipping_address"]["country"] == address_usa.country.code
+
+
+def test_payload_serializer_with_not_existing_field(order):
+    serializer = PayloadSerializer(Order, ("status", "not_existing_field"))
+
+    with pytest.raises(FieldDoesNotExist):
+        serializer.serialize(Order.objects.all())
+
+
+@pytest.mark.parametrize("lines_count", [1, 50, 500])
+@pytest.mark.count_queries(autouse=False)
+def test_generate_order_payload_benchmark(
+    lines_count, order_with_lines, payment_txn_captured, count_queries, record_property
+):
+    line = order_with_lines.lines.first()
+    order_with_lines.lines.exclude(pk=line.pk).delete()
+    OrderLine.objects.bulk_create(
+        OrderLine(
+            order=order_with_lines,
+            variant=line.variant,
+            product_name=line.product_name,
+            product_sku=line.product_sku,
+            is_shipping_required=line.is_shipping_required,
+            quantity=1,
+            unit_price_net_amount=line.unit_price_net_amount,
+            unit_price_gross_amount=line.unit_price_gross_amount,
+            tax_rate=line.tax_rate,
+        )
+        for _ in range(lines_count - 1)
+    )
+
+    repeat = 5
+    seconds = timeit.timeit(
+        lambda: generate_order_payload(order_with_lines), number=repeat
+    )
+
+    # Serialization time of an order, reported in the JUnit XML
+    record_property("seconds_per_order", seconds / repeat)
+    data = json.loads(generate_order_payload(order_with_lines))[0]
+    assert len(data["lines"]) == lines_count